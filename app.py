@@ -10,6 +10,8 @@ from werkzeug.exceptions import HTTPException
 from config import get_config, print_config_info
 from app.services import init_auth_service
 from app.api import api_bp, init_api_services
+from app.compression import CompressionMiddleware, precompress_static
+from app.json_provider import FastJSONProvider
 
 
 def create_app(config_name=None):
@@ -37,6 +39,9 @@ def create_app(config_name=None):
         if not app.config.get('DEBUG', False):
             raise RuntimeError("生产环境配置错误，应用启动失败")
 
+    # JSON 响应：按可用性使用 orjson/simplejson，直接编码为字节
+    init_json_provider(app)
+
     # 初始化服务
     init_services(app)
 
@@ -49,6 +54,10 @@ def create_app(config_name=None):
     # 注册请求处理器
     register_request_handlers(app)
 
+    # 响应压缩
+    if app.config.get('COMPRESSION_ENABLED', True):
+        init_compression(app)
+
     return app
 
 
@@ -61,7 +70,57 @@ def init_services(app):
 
         # 初始化API服务
         data_path = app.config.get('DATA_PATH', './data/cards.json')
-        init_api_services(data_path, auth_service)
+        storage_options = {
+            'journal': app.config.get('DATA_JOURNAL', False),
+            'journal_max_bytes': app.config.get('DATA_JOURNAL_MAX_BYTES', 1024 * 1024),
+            'journal_max_records': app.config.get('DATA_JOURNAL_MAX_RECORDS', 1000),
+            'index_sidecar': app.config.get('DATA_INDEX_SIDECAR', True),
+            'validation': app.config.get('DATA_VALIDATION', 'lenient'),
+            'columnar': app.config.get('DATA_COLUMNAR', True),
+            'pretty': app.config.get('DATA_JSON_PRETTY', True),
+            'backup': {
+                'compression': app.config.get('BACKUP_COMPRESSION', 'gzip'),
+                'keep_last': app.config.get('BACKUP_KEEP_LAST', 20),
+                'keep_hourly': app.config.get('BACKUP_KEEP_HOURLY', 24),
+                'keep_daily': app.config.get('BACKUP_KEEP_DAILY', 30)
+            }
+        }
+        cache_options = {
+            'max_entries': app.config.get('RESPONSE_CACHE_SIZE', 256),
+            'max_bytes': app.config.get('RESPONSE_CACHE_MAX_BYTES', 16 * 1024 * 1024)
+        }
+        init_api_services(data_path, auth_service, storage_options, cache_options,
+                          health_interval=app.config.get('HEALTH_CHECK_INTERVAL', 5.0))
+
+
+def init_json_provider(app):
+    """安装 JSON 提供者，按配置决定是否排序键和转义非 ASCII 字符"""
+    provider = FastJSONProvider(app, backend=app.config.get('JSON_BACKEND', 'auto'))
+    provider.sort_keys = app.config.get('JSON_SORT_KEYS', True)
+    provider.ensure_ascii = app.config.get('JSON_AS_ASCII', True)
+    app.json = provider
+
+
+def init_compression(app):
+    """预压缩静态文件并安装响应压缩中间件"""
+    min_size = app.config.get('COMPRESSION_MIN_SIZE', 1024)
+    precompressed = {'created': 0, 'errors': 0}
+    if app.static_folder and os.path.isdir(app.static_folder):
+        precompressed = precompress_static(app.static_folder, min_size)
+        if precompressed['errors']:
+            print(f"有 {precompressed['errors']} 个静态文件预压缩失败，将按请求实时压缩")
+
+    middleware = CompressionMiddleware(
+        app.wsgi_app,
+        min_size=min_size,
+        level=app.config.get('COMPRESSION_LEVEL', 6),
+        cache_entries=app.config.get('COMPRESSION_CACHE_SIZE', 128),
+        static_folder=app.static_folder,
+        static_url_path=app.static_url_path
+    )
+    middleware.stats['precompress_errors'] = precompressed['errors']
+    app.wsgi_app = middleware
+    app.extensions['compression'] = middleware
 
 
 def register_blueprints(app):
@@ -203,10 +262,6 @@ def register_request_handlers(app):
             response.headers['Access-Control-Allow-Methods'] = 'GET, POST, PUT, DELETE, OPTIONS'
             response.headers['Access-Control-Allow-Headers'] = 'Content-Type, Authorization'
 
-        # 确保JSON响应格式
-        if response.mimetype == 'application/json':
-            response.headers['Content-Type'] = 'application/json; charset=utf-8'
-
         return response
 
 
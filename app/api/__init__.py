@@ -5,6 +5,8 @@ API 蓝图模块
 
 from flask import Blueprint
 from app.services import CardService, AuthService
+from app.cache import ResponseCache
+from .health import ReadinessMonitor
 
 # 创建API蓝图
 api_bp = Blueprint('api', __name__)
@@ -12,20 +14,33 @@ api_bp = Blueprint('api', __name__)
 # 全局服务实例
 card_service = None
 auth_service = None
+response_cache = None
+readiness_monitor = None
 
 
-def init_api_services(data_path: str, auth_svc: AuthService):
+def init_api_services(data_path: str, auth_svc: AuthService, storage_options: dict = None,
+                      cache_options: dict = None, health_interval: float = 5.0):
     """
     初始化API服务
 
     Args:
         data_path: 数据文件路径
         auth_svc: 认证服务实例
+        storage_options: 存储后端选项
+        cache_options: 响应缓存选项（max_entries、max_bytes）
+        health_interval: 就绪检查的间隔（秒）
     """
-    global card_service, auth_service
+    global card_service, auth_service, response_cache, readiness_monitor
 
-    card_service = CardService(data_path)
+    card_service = CardService(data_path, storage_options)
     auth_service = auth_svc
+    response_cache = ResponseCache(**(cache_options or {}))
+
+    # 重新初始化时停止旧的监视器，避免后台线程继续检查已替换的服务
+    if readiness_monitor is not None:
+        readiness_monitor.stop()
+    readiness_monitor = ReadinessMonitor(card_service, response_cache, health_interval)
+    readiness_monitor.start()
 
 
 def get_card_service() -> CardService:
@@ -38,6 +53,16 @@ def get_auth_service() -> AuthService:
     return auth_service
 
 
+def get_response_cache() -> ResponseCache:
+    """获取响应缓存实例"""
+    return response_cache
+
+
+def get_readiness_monitor() -> ReadinessMonitor:
+    """获取就绪状态监视器实例"""
+    return readiness_monitor
+
+
 # 导入所有API路由模块
 from . import cards
 from . import auth
@@ -8,17 +8,20 @@ from . import api_bp, get_auth_service
 from .utils import (
     success_response,
     error_response,
-    validate_json_request,
     handle_api_errors,
     require_json,
     get_client_ip
 )
+from .schema import body_schema
 
 
 @api_bp.route('/auth', methods=['POST'])
 @handle_api_errors
 @require_json
-def login():
+@body_schema({
+    'password': {'type': str, 'required': True}
+})
+def login(body):
     """
     管理员密码验证
 
@@ -34,9 +37,7 @@ def login():
     if not auth_service:
         return jsonify(error_response("认证服务未初始化", "service_error")[0]), 500
 
-    # 验证请求数据
-    data = validate_json_request(required_fields=['password'])
-    password = data['password']
+    password = body['password']
 
     # 获取客户端IP
     client_ip = get_client_ip()
@@ -3,27 +3,133 @@
 处理卡片的增删改查操作
 """
 
-from flask import jsonify, request
-from . import api_bp, get_card_service, get_auth_service
+from flask import current_app, jsonify, request
+from . import api_bp, get_card_service, get_auth_service, get_response_cache
 from .utils import (
     success_response,
     error_response,
-    validate_json_request,
-    validate_query_params,
     handle_api_errors,
     require_json,
-    paginate_data
+    paginate_data,
+    parse_cursor,
+    parse_fields,
+    keyset_page,
+    jsonify_cards,
+    conditional_get,
+    make_etag,
+    parse_timestamp,
+    negotiated,
+    response_format,
+    encode_response
 )
+from .formats import content_type
+from .schema import query_schema, body_schema
 from app.services import require_admin_auth
+from app.models.card import Card, card_serializer
+from app.models.columns import SORT_KEYS
+from app.models.search import card_matches
+from app.models.suggest import MAX_SUGGESTIONS
+
+
+def _card_item(card, serialize, search_query=None):
+    """
+    转换列表中的卡片，有搜索关键词时附带匹配位置
+
+    Args:
+        card: 卡片对象
+        serialize: 序列化函数（card_serializer 的结果）
+        search_query: 搜索关键词
+
+    Returns:
+        Dict: 卡片字典，搜索时含 matches: {'name': [[起始, 结束), ...], 'description': [...]}
+    """
+    item = serialize(card)
+    if search_query:
+        item['matches'] = card_matches(card, search_query)
+    return item
+
+
+def _list_response(data, serialize, search_query, message):
+    """
+    生成卡片列表响应
+
+    返回完整字段且不搜索时直接拼接卡片缓存的 JSON 片段，否则逐张转换。
+
+    Args:
+        data: 响应数据，items 为卡片序列
+        serialize: 序列化函数（card_serializer 的结果）
+        search_query: 搜索关键词
+        message: 响应消息
+
+    Returns:
+        Response: JSON 响应
+    """
+    if serialize is Card.to_dict and not search_query:
+        return jsonify_cards(data, message)
+    data['items'] = [_card_item(card, serialize, search_query) for card in data['items']]
+    return jsonify(success_response(data=data, message=message))
+
+
+def _card_validators(card_id=None):
+    """
+    卡片接口的条件响应校验值：ETag 由数据版本、查询参数和响应格式决定，Last-Modified 取数据的最后修改时间
+
+    按访问次数排序的结果随每次访问变化，不做条件响应。
+
+    Args:
+        card_id: 卡片ID（单个卡片接口）
+
+    Returns:
+        Optional[Tuple[str, datetime]]: (ETag 值, 最后修改时间)，无法确定数据版本时为None
+    """
+    card_service = get_card_service()
+    if not card_service or request.args.get('sort') == 'usage':
+        return None
+
+    generation = card_service.generation()
+    if generation is None:
+        return None
+    etag = make_etag('cards', generation, card_id, sorted(request.args.items(multi=True)), response_format())
+    return etag, parse_timestamp(card_service.last_updated())
 
 
 @api_bp.route('/cards', methods=['GET'])
+@negotiated
 @handle_api_errors
-def get_cards():
+@conditional_get(_card_validators)
+@query_schema({
+    'search': {'type': str, 'default': None},
+    'page': {'type': int, 'default': 1},
+    'per_page': {'type': int, 'default': 20},
+    'after': {'type': str, 'default': None},
+    'limit': {'type': int, 'default': None},
+    'fields': {'type': str, 'default': None, 'parse': parse_fields},
+    'sort': {'type': str, 'default': 'order', 'choices': SORT_KEYS},
+    'dir': {'type': str, 'default': None, 'choices': ('asc', 'desc')}
+})
+def get_cards(query):
     """
     获取卡片列表
 
     GET /api/cards?search=关键词&page=1&per_page=20
+    GET /api/cards?after=排序号,卡片ID&limit=20
+    GET /api/cards?fields=id,name,icon,url
+    GET /api/cards?sort=name&dir=asc
+
+    fields 指定只返回的字段（逗号分隔），未指定时返回全部字段。
+
+    响应带 ETag 和 Last-Modified，数据未变时 If-None-Match 请求直接得到 304。
+
+    默认返回 JSON；Accept 为 application/msgpack 或 application/cbor 时返回对应的二进制编码，结构相同。
+
+    sort 为排序字段：order（默认）、name（中文按拼音）、created_time 或 usage（访问次数）；
+    dir 为 asc 或 desc，按 usage 排序时默认 desc，其余默认 asc。
+
+    传入 after 或 limit 时使用 keyset 分页：按 order 顺序返回游标之后的一页，
+    响应中的 cursor.next 即下一页的 after 参数；只构建和序列化当前页，
+    耗时与卡片总数无关。
+
+    搜索时每张卡片附带 matches，给出关键词在名称和描述中的位置，供前端高亮。
 
     Returns:
         JSON: 卡片列表和分页信息
@@ -32,65 +138,114 @@ def get_cards():
     if not card_service:
         return jsonify(error_response("卡片服务未初始化", "service_error")[0]), 500
 
-    # 验证查询参数
-    try:
-        params = validate_query_params({
-            'search': {
-                'type': str,
-                'required': False,
-                'default': None
-            },
-            'page': {
-                'type': int,
-                'required': False,
-                'default': 1
-            },
-            'per_page': {
-                'type': int,
-                'required': False,
-                'default': 20
-            }
-        })
-    except ValueError as e:
-        return jsonify(error_response(str(e), "validation_error")[0]), 400
+    after = parse_cursor(query['after']) if query['after'] else None
+    serialize = card_serializer(query['fields'])
+
+    search = query['search'].strip() if query['search'] else None
+    sort_by = query['sort']
+    direction = query['dir'] or ('desc' if sort_by == 'usage' else 'asc')
+    descending = direction == 'desc'
+    keyset = query['after'] is not None or query['limit'] is not None
 
     # 验证分页参数
-    if params['page'] < 1:
-        return jsonify(error_response("页码必须大于0", "validation_error")[0]), 400
+    if keyset:
+        if sort_by != 'order' or descending:
+            return jsonify(error_response("keyset 分页只支持按 order 升序", "validation_error")[0]), 400
+        limit = query['limit'] if query['limit'] is not None else 20
+        if limit < 1 or limit > 100:
+            return jsonify(error_response("每页数量必须在1-100之间", "validation_error")[0]), 400
+    else:
+        if query['page'] < 1:
+            return jsonify(error_response("页码必须大于0", "validation_error")[0]), 400
+
+        if query['per_page'] < 1 or query['per_page'] > 100:
+            return jsonify(error_response("每页数量必须在1-100之间", "validation_error")[0]), 400
+
+    # 响应缓存：键包含数据版本，任何写入之后旧条目都不会再命中
+    cache = get_response_cache()
+    cache_key = None
+    generation = card_service.generation() if cache is not None and cache.enabled else None
+    if generation is not None:
+        cache_key = (
+            'cards', search.lower() if search else None,
+            (after, limit) if keyset else (query['page'], query['per_page']),
+            tuple(query['fields']) if query['fields'] else None, sort_by, descending,
+            generation, card_service.usage.generation if sort_by == 'usage' else None, response_format()
+        )
+        body = cache.get(cache_key)
+        if body is not None:
+            return current_app.response_class(body, content_type=content_type(response_format()))
+
+    if keyset:
+        # 多取一张用于判断是否还有下一页
+        page = keyset_page(card_service.page_cards(after, limit + 1, search_query=search), limit)
+        response = _list_response(page, serialize, search,
+                                  f"获取卡片列表成功，本页{len(page['items'])}张卡片")
+    else:
+        # 获取卡片列表（惰性序列，分页后才取出卡片）
+        cards = card_service.query_cards(search_query=search, sort_by=sort_by, descending=descending)
+        total = len(cards)
 
-    if params['per_page'] < 1 or params['per_page'] > 100:
-        return jsonify(error_response("每页数量必须在1-100之间", "validation_error")[0]), 400
+        # 分页处理
+        if query['per_page'] and total > query['per_page']:
+            # 只转换当前页
+            response = _list_response(paginate_data(cards, query['page'], query['per_page']),
+                                      serialize, search, f"获取卡片列表成功，共{total}张卡片")
 
-    # 获取卡片列表
-    cards = card_service.get_all_cards(search_query=params['search'])
+        else:
+            # 不分页，返回所有数据
+            response = _list_response({'items': cards, 'total': total},
+                                      serialize, search, f"获取卡片列表成功，共{total}张卡片")
 
-    # 转换为字典格式
-    cards_data = [card.to_dict() for card in cards]
+    # 缓存最终格式的响应体
+    response = encode_response(response)
+    if cache_key is not None:
+        cache.put(cache_key, response.get_data())
+    return response
 
-    # 分页处理
-    if params['per_page'] and len(cards_data) > params['per_page']:
-        paginated_data = paginate_data(cards_data, params['page'], params['per_page'])
-        return jsonify(success_response(
-            data=paginated_data,
-            message=f"获取卡片列表成功，共{len(cards_data)}张卡片"
-        ))
 
-    else:
-        # 不分页，返回所有数据
-        return jsonify(success_response(
-            data={
-                'items': cards_data,
-                'total': len(cards_data)
-            },
-            message=f"获取卡片列表成功，共{len(cards_data)}张卡片"
-        ))
+@api_bp.route('/cards/suggest', methods=['GET'])
+@handle_api_errors
+@query_schema({
+    'q': {'type': str, 'default': ''},
+    'limit': {'type': int, 'default': 8}
+})
+def suggest_cards(query):
+    """
+    卡片名称联想
+
+    GET /api/cards/suggest?q=gr&limit=8
+
+    只返回卡片ID和名称，供边输入边搜索和快速启动使用。
+
+    Returns:
+        JSON: 联想结果
+    """
+    card_service = get_card_service()
+    if not card_service:
+        return jsonify(error_response("卡片服务未初始化", "service_error")[0]), 500
+
+    if query['limit'] < 1 or query['limit'] > MAX_SUGGESTIONS:
+        return jsonify(error_response(f"联想数量必须在1-{MAX_SUGGESTIONS}之间", "validation_error")[0]), 400
+
+    items = card_service.suggest_cards(query['q'], query['limit'])
+    return jsonify(success_response(
+        data={'items': items, 'query': query['q']},
+        message=f"获取联想成功，共{len(items)}条"
+    ))
 
 
 @api_bp.route('/cards', methods=['POST'])
 @handle_api_errors
 @require_json
 @require_admin_auth
-def create_card():
+@body_schema({
+    'name': {'type': str, 'required': True},
+    'icon': {'type': str, 'required': True},
+    'url': {'type': str, 'required': True},
+    'description': {'type': str, 'default': ''}
+})
+def create_card(body):
     """
     创建新卡片
 
@@ -109,21 +264,12 @@ def create_card():
     if not card_service:
         return jsonify(error_response("卡片服务未初始化", "service_error")[0]), 500
 
-    # 验证请求数据
-    data = validate_json_request(
-        required_fields=['name', 'icon', 'url'],
-        optional_fields=['description']
-    )
-
-    # 设置默认值
-    description = data.get('description', '')
-
     # 创建卡片
     success, message, new_card = card_service.create_card(
-        name=data['name'],
-        icon=data['icon'],
-        url=data['url'],
-        description=description
+        name=body['name'],
+        icon=body['icon'],
+        url=body['url'],
+        description=body['description'] or ''
     )
 
     if success:
@@ -144,12 +290,17 @@ def create_card():
 
 
 @api_bp.route('/cards/<card_id>', methods=['GET'])
+@negotiated
 @handle_api_errors
-def get_card(card_id):
+@conditional_get(_card_validators)
+@query_schema({
+    'fields': {'type': str, 'default': None, 'parse': parse_fields}
+})
+def get_card(card_id, query):
     """
     获取单个卡片
 
-    GET /api/cards/<card_id>
+    GET /api/cards/<card_id>?fields=id,name
 
     Returns:
         JSON: 卡片信息
@@ -158,23 +309,62 @@ def get_card(card_id):
     if not card_service:
         return jsonify(error_response("卡片服务未初始化", "service_error")[0]), 500
 
+    serialize = card_serializer(query['fields'])
+
     # 获取卡片
     card = card_service.get_card_by_id(card_id)
 
     if card:
         return jsonify(success_response(
-            data=card.to_dict(),
+            data=serialize(card),
             message="卡片获取成功"
         ))
     else:
         return jsonify(error_response("卡片不存在", "not_found")[0]), 404
 
 
+@api_bp.route('/cards/<card_id>/visit', methods=['POST'])
+@handle_api_errors
+@require_admin_auth
+def visit_card(card_id):
+    """
+    记录一次卡片访问（前端打开服务时调用，用于按使用频率排序）
+
+    POST /api/cards/<card_id>/visit
+
+    需要管理员认证：访问次数决定所有用户看到的 usage 排序，匿名请求可以任意刷高计数。
+    代价是只统计管理员的访问，未登录时打开服务不计数。计数写入 usage.json 有节流。
+
+    Returns:
+        JSON: 卡片的累计访问次数
+    """
+    card_service = get_card_service()
+    if not card_service:
+        return jsonify(error_response("卡片服务未初始化", "service_error")[0]), 500
+
+    success, message, count = card_service.record_visit(card_id)
+
+    if success:
+        return jsonify(success_response(
+            data={'id': card_id, 'visits': count},
+            message=message
+        ))
+    else:
+        status_code = 404 if "不存在" in message else 500
+        return jsonify(error_response(message, "visit_failed")[0]), status_code
+
+
 @api_bp.route('/cards/<card_id>', methods=['PUT'])
 @handle_api_errors
 @require_json
 @require_admin_auth
-def update_card(card_id):
+@body_schema({
+    'name': {'type': str},
+    'icon': {'type': str},
+    'url': {'type': str},
+    'description': {'type': str}
+})
+def update_card(card_id, body):
     """
     更新卡片
 
@@ -193,18 +383,13 @@ def update_card(card_id):
     if not card_service:
         return jsonify(error_response("卡片服务未初始化", "service_error")[0]), 500
 
-    # 验证请求数据
-    data = validate_json_request(
-        optional_fields=['name', 'icon', 'url', 'description']
-    )
-
-    if not data:
+    if not body:
         return jsonify(error_response("没有要更新的内容", "validation_error")[0]), 400
 
     # 更新卡片
     success, message, updated_card = card_service.update_card(
         card_id=card_id,
-        **data
+        **body
     )
 
     if success:
@@ -259,7 +444,20 @@ def delete_card(card_id):
 @handle_api_errors
 @require_json
 @require_admin_auth
-def reorder_cards():
+@body_schema({
+    'orders': {
+        'type': list,
+        'required': True,
+        'min': 1,
+        'message': '不能为空',
+        'items': {
+            'id': {'type': str, 'required': True},
+            'order': {'type': int, 'required': True, 'min': 1, 'message': '必须是大于0的整数',
+                      'type_message': '必须是大于0的整数'}
+        }
+    }
+})
+def reorder_cards(body):
     """
     重新排序卡片
 
@@ -278,31 +476,8 @@ def reorder_cards():
     if not card_service:
         return jsonify(error_response("卡片服务未初始化", "service_error")[0]), 500
 
-    # 验证请求数据
-    data = validate_json_request(required_fields=['orders'])
-
-    orders = data['orders']
-
-    # 验证orders数据格式
-    if not isinstance(orders, list):
-        return jsonify(error_response("orders必须是数组格式", "validation_error")[0]), 400
-
-    if not orders:
-        return jsonify(error_response("orders不能为空", "validation_error")[0]), 400
-
-    # 验证每个排序项的格式
-    for i, item in enumerate(orders):
-        if not isinstance(item, dict):
-            return jsonify(error_response(f"orders[{i}]必须是对象格式", "validation_error")[0]), 400
-
-        if 'id' not in item or 'order' not in item:
-            return jsonify(error_response(f"orders[{i}]必须包含id和order字段", "validation_error")[0]), 400
-
-        if not isinstance(item['order'], int) or item['order'] < 1:
-            return jsonify(error_response(f"orders[{i}].order必须是大于0的整数", "validation_error")[0]), 400
-
     # 重新排序
-    success, message = card_service.reorder_cards(orders)
+    success, message = card_service.reorder_cards(body['orders'])
 
     if success:
         return jsonify(success_response(message=message))
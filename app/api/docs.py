@@ -5,11 +5,12 @@ API 文档接口
 
 from flask import jsonify
 from . import api_bp
-from .utils import success_response, handle_api_errors
+from .utils import success_response, handle_api_errors, conditional_get, negotiated
 
 
 @api_bp.route('/docs', methods=['GET'])
 @handle_api_errors
+@conditional_get()
 def get_api_docs():
     """
     获取API文档
@@ -62,7 +63,7 @@ def get_api_docs():
                         "search": {
                             "type": "string",
                             "required": False,
-                            "description": "搜索关键词"
+                            "description": "搜索关键词（名称或描述包含，不区分大小写）"
                         },
                         "page": {
                             "type": "integer",
@@ -73,10 +74,54 @@ def get_api_docs():
                             "type": "integer",
                             "required": False,
                             "description": "每页数量"
+                        },
+                        "after": {
+                            "type": "string",
+                            "required": False,
+                            "description": "keyset 分页游标（排序号,卡片ID），取上一页响应中的 cursor.next"
+                        },
+                        "limit": {
+                            "type": "integer",
+                            "required": False,
+                            "description": "keyset 分页每页数量（1-100，默认20）；传入 after 或 limit 时忽略 page/per_page"
+                        },
+                        "fields": {
+                            "type": "string",
+                            "required": False,
+                            "description": "只返回的字段，逗号分隔（id,name,icon,url,description,order,created_time）"
+                        },
+                        "sort": {
+                            "type": "string",
+                            "required": False,
+                            "description": "排序字段：order（默认）、name（中文按拼音）、created_time、usage（访问次数）；keyset 分页只支持 order"
+                        },
+                        "dir": {
+                            "type": "string",
+                            "required": False,
+                            "description": "排序方向 asc 或 desc，按 usage 排序时默认 desc，其余默认 asc"
+                        }
+                    },
+                    "responses": {
+                        "200": "返回卡片列表（keyset 分页时附带 cursor: {limit, next, has_next}）；搜索时每张卡片附带 matches: {name: [[起始, 结束), ...], description: [...]}，位置以 UTF-16 码元计",
+                        "304": "数据未变化（If-None-Match 与 ETag 一致，或 If-Modified-Since 不早于 Last-Modified）；按 usage 排序时不做条件响应"
+                    }
+                },
+                "GET /cards/suggest": {
+                    "description": "卡片名称联想（前缀匹配，不足时补充拼写相近的名称），只返回ID和名称",
+                    "parameters": {
+                        "q": {
+                            "type": "string",
+                            "required": False,
+                            "description": "输入的查询词"
+                        },
+                        "limit": {
+                            "type": "integer",
+                            "required": False,
+                            "description": "返回数量（1-20，默认8）"
                         }
                     },
                     "responses": {
-                        "200": "返回卡片列表"
+                        "200": "返回 {items: [{id, name}, ...], query}"
                     }
                 },
                 "POST /cards": {
@@ -117,10 +162,32 @@ def get_api_docs():
                             "type": "string",
                             "required": True,
                             "description": "卡片ID"
+                        },
+                        "fields": {
+                            "type": "string",
+                            "required": False,
+                            "description": "只返回的字段，逗号分隔（id,name,icon,url,description,order,created_time）"
                         }
                     },
                     "responses": {
                         "200": "返回卡片信息",
+                        "304": "数据未变化（If-None-Match 与 ETag 一致）",
+                        "404": "卡片不存在"
+                    }
+                },
+                "POST /cards/<id>/visit": {
+                    "description": "记录一次卡片访问，用于按使用频率排序（只统计管理员的访问，防止匿名刷高计数）",
+                    "authentication_required": True,
+                    "parameters": {
+                        "id": {
+                            "type": "string",
+                            "required": True,
+                            "description": "卡片ID"
+                        }
+                    },
+                    "responses": {
+                        "200": "返回 {id, visits}",
+                        "401": "需要管理员认证",
                         "404": "卡片不存在"
                     }
                 },
@@ -210,7 +277,8 @@ def get_api_docs():
                         }
                     },
                     "responses": {
-                        "200": "返回图标列表"
+                        "200": "返回图标列表",
+                        "304": "图标列表未变化（If-None-Match 与 ETag 一致）"
                     }
                 },
                 "POST /validate-name": {
@@ -235,7 +303,7 @@ def get_api_docs():
                     "description": "获取系统统计信息",
                     "parameters": {},
                     "responses": {
-                        "200": "返回统计信息"
+                        "200": "返回统计信息（api.response_cache 为列表响应缓存的命中率、淘汰次数等，api.compression 为响应压缩统计，api.health_monitor 为就绪检查的次数和耗时）"
                     }
                 }
             },
@@ -244,14 +312,31 @@ def get_api_docs():
                     "description": "获取API文档（当前接口）",
                     "parameters": {},
                     "responses": {
-                        "200": "返回API文档"
+                        "200": "返回API文档",
+                        "304": "文档未变化（If-None-Match 与 ETag 一致）"
                     }
                 },
                 "GET /health": {
-                    "description": "健康检查",
+                    "description": "健康检查（汇总服务状态和最近一次就绪检查的结果）",
+                    "parameters": {},
+                    "responses": {
+                        "200": "服务正常",
+                        "503": "服务异常或未就绪"
+                    }
+                },
+                "GET /health/live": {
+                    "description": "存活检查，不访问数据文件，适合负载均衡器高频探测",
                     "parameters": {},
                     "responses": {
-                        "200": "服务正常"
+                        "200": "进程存活"
+                    }
+                },
+                "GET /health/ready": {
+                    "description": "就绪检查，返回后台定期检查的快照（数据文件、存储版本、备份积压、缓存状态）",
+                    "parameters": {},
+                    "responses": {
+                        "200": "服务就绪",
+                        "503": "数据文件无法加载或快照过期"
                     }
                 }
             }
@@ -269,6 +354,8 @@ def get_api_docs():
             "internal_server_error": "服务器内部错误",
             "unexpected_error": "发生未知错误"
         },
+        "content_negotiation": "GET /cards、GET /cards/<id>、GET /stats、GET /health、GET /health/ready 默认返回 JSON；"
+                               "Accept: application/msgpack 或 application/cbor 时返回对应的二进制编码，结构与 JSON 相同",
         "response_format": {
             "success": {
                 "success": True,
@@ -287,22 +374,70 @@ def get_api_docs():
     return jsonify(success_response(docs, "API文档获取成功"))
 
 
+@api_bp.route('/health/live', methods=['GET'])
+def liveness_check():
+    """
+    存活检查接口
+
+    只说明进程能处理请求，不访问数据文件或其他服务，供负载均衡器高频探测。
+
+    Returns:
+        JSON: 存活状态
+    """
+    from datetime import datetime
+
+    response = jsonify(success_response({
+        "status": "alive",
+        "timestamp": datetime.now().isoformat()
+    }, "服务存活"))
+    response.headers['Cache-Control'] = 'no-store'
+    return response
+
+
+@api_bp.route('/health/ready', methods=['GET'])
+@negotiated
+@handle_api_errors
+def readiness_check():
+    """
+    就绪检查接口
+
+    返回后台监视器最近一次检查的快照（数据文件、存储版本、备份积压、缓存状态），
+    请求本身不做 I/O；未就绪或快照过期时返回 503。
+
+    Returns:
+        JSON: 就绪状态快照
+    """
+    from . import get_readiness_monitor
+
+    monitor = get_readiness_monitor()
+    snapshot = monitor.snapshot() if monitor else {"ready": False}
+    status = "ready" if snapshot['ready'] else "not_ready"
+
+    response = jsonify(success_response({"status": status, **snapshot}, f"服务状态: {status}"))
+    response.headers['Cache-Control'] = 'no-store'
+    return response, 200 if snapshot['ready'] else 503
+
+
 @api_bp.route('/health', methods=['GET'])
+@negotiated
 @handle_api_errors
 def health_check():
     """
     健康检查接口
 
+    汇总服务状态和就绪检查的快照，数据部分来自最近一次后台检查，不读取数据文件。
+
     Returns:
         JSON: 服务状态信息
     """
-    from . import get_card_service, get_auth_service
+    from . import get_card_service, get_auth_service, get_readiness_monitor
     import os
     from datetime import datetime
 
     # 检查服务状态
     card_svc = get_card_service()
     auth_svc = get_auth_service()
+    monitor = get_readiness_monitor()
 
     health_status = {
         "status": "healthy",
@@ -317,20 +452,16 @@ def health_check():
         }
     }
 
-    # 检查数据文件
-    if card_svc:
-        try:
-            stats = card_svc.get_service_stats()
-            health_status["data"] = {
-                "total_cards": stats.get('total_cards', 0),
-                "last_updated": stats.get('last_updated'),
-                "data_file_accessible": True
-            }
-        except Exception as e:
-            health_status["data"] = {
-                "data_file_accessible": False,
-                "error": str(e)
-            }
+    # 数据文件状态取自就绪检查的快照
+    if card_svc and monitor:
+        snapshot = monitor.snapshot()
+        data = snapshot.get('data') or {"data_file_accessible": False}
+        health_status["data"] = {
+            **{key: data[key] for key in ('total_cards', 'last_updated', 'data_file_accessible', 'error')
+               if key in data},
+            "checked_at": snapshot['checked_at']
+        }
+        if not snapshot['ready']:
             health_status["status"] = "degraded"
 
     # 确定整体状态
@@ -339,7 +470,9 @@ def health_check():
 
     status_code = 200 if health_status["status"] == "healthy" else 503
 
-    return jsonify(success_response(
+    response = jsonify(success_response(
         health_status,
         f"服务状态: {health_status['status']}"
-    )), status_code
\ No newline at end of file
+    ))
+    response.headers['Cache-Control'] = 'no-store'
+    return response, status_code
@@ -0,0 +1,284 @@
+"""
+二进制响应格式
+按 Accept 头协商 MessagePack 或 CBOR 编码，结构与 JSON 响应完全相同（同一个 success_response 信封）。
+安装了 msgpack / cbor2 时使用它们的 C 实现，否则使用这里的纯 Python 编码器。
+"""
+
+import struct
+from functools import partial
+from typing import Any, Callable, Dict, Tuple
+from flask.json.provider import DefaultJSONProvider
+
+try:
+    import msgpack
+except ImportError:  # 未安装 msgpack 时使用内置编码器
+    msgpack = None
+
+try:
+    import cbor2
+except ImportError:  # 未安装 cbor2 时使用内置编码器
+    cbor2 = None
+
+JSON_MIMETYPE = 'application/json'
+
+# 格式 -> 响应的 Content-Type
+MIMETYPES = {
+    'msgpack': 'application/msgpack',
+    'cbor': 'application/cbor'
+}
+
+# Accept 中可识别的类型（按优先顺序，JSON 在前，未指明时仍返回 JSON）-> 格式
+ACCEPTED_TYPES = {
+    JSON_MIMETYPE: 'json',
+    'application/msgpack': 'msgpack',
+    'application/x-msgpack': 'msgpack',
+    'application/vnd.msgpack': 'msgpack',
+    'application/cbor': 'cbor'
+}
+
+# 无法直接编码的对象（日期、UUID、dataclass 等）与 JSON 响应使用同样的转换规则
+_default = DefaultJSONProvider.default
+
+
+def negotiate_format(accept) -> str:
+    """
+    根据 Accept 头选择响应格式
+
+    Args:
+        accept: 请求的 MIMEAccept（request.accept_mimetypes）
+
+    Returns:
+        str: 'json'、'msgpack' 或 'cbor'；没有 Accept 头或都不匹配时为 'json'
+    """
+    return ACCEPTED_TYPES[accept.best_match(list(ACCEPTED_TYPES), default=JSON_MIMETYPE)]
+
+
+def content_type(fmt: str) -> str:
+    """
+    获取格式对应的 Content-Type
+
+    Args:
+        fmt: 'json'、'msgpack' 或 'cbor'
+
+    Returns:
+        str: Content-Type 头的值
+    """
+    return MIMETYPES.get(fmt) or f"{JSON_MIMETYPE}; charset=utf-8"
+
+
+def _pack_msgpack(obj: Any, default: Callable[[Any], Any], out: bytearray):
+    """把对象按 MessagePack 格式追加到 out"""
+    if obj is None:
+        out.append(0xc0)
+    elif obj is True:
+        out.append(0xc3)
+    elif obj is False:
+        out.append(0xc2)
+    elif isinstance(obj, int):
+        if 0 <= obj < 0x80:
+            out.append(obj)
+        elif -32 <= obj < 0:
+            out.append(obj & 0xff)
+        elif obj >= 0:
+            if obj <= 0xff:
+                out += struct.pack('>BB', 0xcc, obj)
+            elif obj <= 0xffff:
+                out += struct.pack('>BH', 0xcd, obj)
+            elif obj <= 0xffffffff:
+                out += struct.pack('>BI', 0xce, obj)
+            elif obj <= 0xffffffffffffffff:
+                out += struct.pack('>BQ', 0xcf, obj)
+            else:
+                raise OverflowError("整数超出 MessagePack 的表示范围")
+        elif obj >= -0x80:
+            out += struct.pack('>Bb', 0xd0, obj)
+        elif obj >= -0x8000:
+            out += struct.pack('>Bh', 0xd1, obj)
+        elif obj >= -0x80000000:
+            out += struct.pack('>Bi', 0xd2, obj)
+        elif obj >= -0x8000000000000000:
+            out += struct.pack('>Bq', 0xd3, obj)
+        else:
+            raise OverflowError("整数超出 MessagePack 的表示范围")
+    elif isinstance(obj, float):
+        out += struct.pack('>Bd', 0xcb, obj)
+    elif isinstance(obj, str):
+        data = obj.encode('utf-8')
+        size = len(data)
+        if size < 32:
+            out.append(0xa0 | size)
+        elif size <= 0xff:
+            out += struct.pack('>BB', 0xd9, size)
+        elif size <= 0xffff:
+            out += struct.pack('>BH', 0xda, size)
+        else:
+            out += struct.pack('>BI', 0xdb, size)
+        out += data
+    elif isinstance(obj, (bytes, bytearray)):
+        size = len(obj)
+        if size <= 0xff:
+            out += struct.pack('>BB', 0xc4, size)
+        elif size <= 0xffff:
+            out += struct.pack('>BH', 0xc5, size)
+        else:
+            out += struct.pack('>BI', 0xc6, size)
+        out += obj
+    elif isinstance(obj, (list, tuple)):
+        out += msgpack_array_header(len(obj))
+        for item in obj:
+            _pack_msgpack(item, default, out)
+    elif isinstance(obj, dict):
+        size = len(obj)
+        if size < 16:
+            out.append(0x80 | size)
+        elif size <= 0xffff:
+            out += struct.pack('>BH', 0xde, size)
+        else:
+            out += struct.pack('>BI', 0xdf, size)
+        for key, value in obj.items():
+            _pack_msgpack(key, default, out)
+            _pack_msgpack(value, default, out)
+    else:
+        _pack_msgpack(default(obj), default, out)
+
+
+def msgpack_array_header(size: int) -> bytes:
+    """MessagePack 数组头"""
+    if size < 16:
+        return bytes((0x90 | size,))
+    if size <= 0xffff:
+        return struct.pack('>BH', 0xdc, size)
+    return struct.pack('>BI', 0xdd, size)
+
+
+def _cbor_head(major: int, value: int) -> bytes:
+    """CBOR 数据项头：主类型和长度（或整数值）"""
+    major <<= 5
+    if value < 24:
+        return bytes((major | value,))
+    if value <= 0xff:
+        return struct.pack('>BB', major | 24, value)
+    if value <= 0xffff:
+        return struct.pack('>BH', major | 25, value)
+    if value <= 0xffffffff:
+        return struct.pack('>BI', major | 26, value)
+    if value <= 0xffffffffffffffff:
+        return struct.pack('>BQ', major | 27, value)
+    raise OverflowError("整数超出 CBOR 的表示范围")
+
+
+def _pack_cbor(obj: Any, default: Callable[[Any], Any], out: bytearray):
+    """把对象按 CBOR 格式追加到 out"""
+    if obj is None:
+        out.append(0xf6)
+    elif obj is True:
+        out.append(0xf5)
+    elif obj is False:
+        out.append(0xf4)
+    elif isinstance(obj, int):
+        out += _cbor_head(0, obj) if obj >= 0 else _cbor_head(1, -1 - obj)
+    elif isinstance(obj, float):
+        out += struct.pack('>Bd', 0xfb, obj)
+    elif isinstance(obj, str):
+        data = obj.encode('utf-8')
+        out += _cbor_head(3, len(data))
+        out += data
+    elif isinstance(obj, (bytes, bytearray)):
+        out += _cbor_head(2, len(obj))
+        out += obj
+    elif isinstance(obj, (list, tuple)):
+        out += _cbor_head(4, len(obj))
+        for item in obj:
+            _pack_cbor(item, default, out)
+    elif isinstance(obj, dict):
+        out += _cbor_head(5, len(obj))
+        for key, value in obj.items():
+            _pack_cbor(key, default, out)
+            _pack_cbor(value, default, out)
+    else:
+        _pack_cbor(default(obj), default, out)
+
+
+def cbor_array_header(size: int) -> bytes:
+    """CBOR 数组头"""
+    return _cbor_head(4, size)
+
+
+def pack_msgpack(obj: Any, default: Callable[[Any], Any] = _default) -> bytes:
+    """
+    编码为 MessagePack
+
+    Args:
+        obj: 要编码的对象
+        default: 无法直接编码的对象的转换函数
+
+    Returns:
+        bytes: 编码结果
+    """
+    if msgpack is not None:
+        return msgpack.packb(obj, default=default, use_bin_type=True)
+    out = bytearray()
+    _pack_msgpack(obj, default, out)
+    return bytes(out)
+
+
+def _cbor2_default(default: Callable[[Any], Any], encoder, value: Any):
+    """把单参数的转换函数适配为 cbor2 的 default(encoder, value)"""
+    encoder.encode(default(value))
+
+
+def pack_cbor(obj: Any, default: Callable[[Any], Any] = _default) -> bytes:
+    """
+    编码为 CBOR
+
+    Args:
+        obj: 要编码的对象
+        default: 无法直接编码的对象的转换函数
+
+    Returns:
+        bytes: 编码结果
+    """
+    if cbor2 is not None:
+        return cbor2.dumps(obj, default=partial(_cbor2_default, default))
+    out = bytearray()
+    _pack_cbor(obj, default, out)
+    return bytes(out)
+
+
+# 格式 -> (编码函数, 数组头函数)
+ENCODERS: Dict[str, Tuple[Callable[[Any], bytes], Callable[[int], bytes]]] = {
+    'msgpack': (pack_msgpack, msgpack_array_header),
+    'cbor': (pack_cbor, cbor_array_header)
+}
+
+
+def encode(obj: Any, fmt: str) -> bytes:
+    """
+    按指定格式编码
+
+    Args:
+        obj: 要编码的对象
+        fmt: 'msgpack' 或 'cbor'
+
+    Returns:
+        bytes: 编码结果
+
+    Raises:
+        ValueError: 不支持的格式
+    """
+    if fmt not in ENCODERS:
+        raise ValueError(f"不支持的响应格式: {fmt}")
+    return ENCODERS[fmt][0](obj)
+
+
+def backends() -> Dict[str, str]:
+    """
+    各格式实际使用的编码实现
+
+    Returns:
+        Dict[str, str]: 格式 -> 库名，使用内置编码器时为 'builtin'
+    """
+    return {
+        'msgpack': 'msgpack' if msgpack is not None else 'builtin',
+        'cbor': 'cbor2' if cbor2 is not None else 'builtin'
+    }
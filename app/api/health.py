@@ -0,0 +1,176 @@
+"""
+就绪检查
+后台线程按固定间隔检查数据文件、存储版本、备份积压和缓存状态，结果保存为快照；
+就绪检查接口直接返回最近的快照，请求本身不做任何 I/O。
+"""
+
+import threading
+import time
+from datetime import datetime
+from typing import Any, Dict, Optional, Tuple
+
+
+def _backup_lag(last_updated: Optional[str], last_backup: Optional[str]) -> Optional[float]:
+    """
+    计算备份落后于数据的秒数
+
+    Args:
+        last_updated: 数据最后修改时间（ISO 格式）
+        last_backup: 本进程最近一次完成备份的时间（ISO 格式）
+
+    Returns:
+        Optional[float]: 最近一次备份之后数据有修改时为距该修改的秒数，否则为0；无法判断时为None
+    """
+    if not last_updated:
+        return None
+    try:
+        updated = datetime.fromisoformat(last_updated)
+        if last_backup and datetime.fromisoformat(last_backup) >= updated:
+            return 0.0
+        return round(max((datetime.now() - updated).total_seconds(), 0.0), 3)
+    except (TypeError, ValueError):
+        return None
+
+
+class ReadinessMonitor:
+    """
+    就绪状态监视器
+
+    快照在后台线程中生成，读取只返回已有的字典（生成后不再修改），不需要加锁。
+    快照超过 3 个检查间隔未更新（后台线程卡住或退出）时视为未就绪。
+    """
+
+    def __init__(self, card_service, response_cache=None, interval: float = 5.0):
+        """
+        初始化监视器
+
+        Args:
+            card_service: 卡片服务实例
+            response_cache: 响应缓存实例（可选）
+            interval: 检查间隔（秒）
+        """
+        if interval <= 0:
+            raise ValueError("检查间隔必须大于0")
+
+        self.card_service = card_service
+        self.response_cache = response_cache
+        self.interval = interval
+
+        # (快照, 生成时的 monotonic 时间)，整体替换，读取时不会看到不一致的组合
+        self._snapshot: Optional[Tuple[Dict[str, Any], float]] = None
+        self._stop = threading.Event()
+        self._worker: Optional[threading.Thread] = None
+        self.stats = {'checks': 0, 'errors': 0, 'last_duration_ms': 0.0}
+
+    def start(self):
+        """先同步检查一次，再启动后台线程"""
+        self.refresh()
+        if self._worker is None or not self._worker.is_alive():
+            self._stop.clear()
+            self._worker = threading.Thread(target=self._run, name='health-monitor', daemon=True)
+            self._worker.start()
+
+    def stop(self):
+        """停止后台线程"""
+        self._stop.set()
+
+    def _run(self):
+        """后台线程主循环"""
+        while not self._stop.wait(self.interval):
+            self.refresh()
+
+    def refresh(self) -> Dict[str, Any]:
+        """
+        立即检查并更新快照
+
+        Returns:
+            Dict: 新的快照
+        """
+        started = time.perf_counter()
+        try:
+            snapshot = self._check()
+        except Exception as e:
+            self.stats['errors'] += 1
+            print(f"就绪检查失败: {e}")
+            snapshot = {
+                "ready": False,
+                "checked_at": datetime.now().isoformat(),
+                "data": {"data_file_accessible": False, "error": str(e)}
+            }
+
+        self.stats['checks'] += 1
+        self.stats['last_duration_ms'] = round((time.perf_counter() - started) * 1000, 3)
+        self._snapshot = (snapshot, time.monotonic())
+        return snapshot
+
+    def _check(self) -> Dict[str, Any]:
+        """执行一次检查"""
+        data_manager = self.card_service.data_manager
+
+        # 版本标识只读取文件状态，缓存有效时不解析文件；无法加载时为None
+        generation = data_manager.generation()
+        accessible = generation is not None
+        data = {
+            "data_file_accessible": accessible,
+            "generation": generation,
+            "last_updated": data_manager.last_updated() if accessible else None,
+            "total_cards": data_manager.count_cards() if accessible else 0
+        }
+        if not accessible:
+            data["error"] = "数据文件无法加载"
+
+        backup = None
+        engine = getattr(data_manager, 'backup_engine', None)
+        if engine is not None:
+            stats = engine.get_stats()
+            backup = {
+                "pending": stats['pending'],
+                "dropped": stats['dropped'],
+                "errors": stats['errors'],
+                "last_backup": stats['last_backup'],
+                "lag_seconds": _backup_lag(data['last_updated'], stats['last_backup'])
+            }
+
+        cache = {}
+        if hasattr(data_manager, 'get_cache_stats'):
+            cache['storage'] = data_manager.get_cache_stats()
+        if self.response_cache is not None:
+            cache['responses'] = self.response_cache.get_stats()
+
+        return {
+            "ready": accessible,
+            "checked_at": datetime.now().isoformat(),
+            "data": data,
+            "backup": backup,
+            "cache": cache
+        }
+
+    def snapshot(self) -> Dict[str, Any]:
+        """
+        获取最近的快照
+
+        Returns:
+            Dict: 快照，附带快照的时长 age_seconds；快照过期时 ready 为False
+        """
+        current = self._snapshot
+        if current is None:
+            return {"ready": False, "checked_at": None, "age_seconds": None, "stale": True}
+
+        snapshot, checked = current
+        age = time.monotonic() - checked
+        stale = age > self.interval * 3
+        return {
+            **snapshot,
+            "ready": snapshot['ready'] and not stale,
+            "age_seconds": round(age, 3),
+            "stale": stale
+        }
+
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        获取监视器统计信息
+
+        Returns:
+            Dict: 检查间隔、检查次数、失败次数和最近一次检查耗时
+        """
+        return {"interval": self.interval, **self.stats}
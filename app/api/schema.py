@@ -0,0 +1,352 @@
+"""
+请求模式
+路由用装饰器声明查询参数和 JSON 请求体的模式，导入时把模式整理为字段规则并生成校验函数，
+视图通过 query / body 参数直接拿到转换、校验好的值。
+
+字段配置:
+    type: 类型，str、int、float、bool，请求体中还可以是 list、dict（默认 str）
+    required: 是否必填
+    default: 缺省时使用的值（不提供则缺省时结果中没有该字段）
+    choices: 允许的取值
+    min / max: 数值的范围，字符串和数组的长度范围
+    items: 数组元素（对象）的字段配置
+    parse: 校验通过后对值做的转换，如 parse_fields（可抛出 ValueError）
+    message: 超出 min / max 范围时的提示（接在字段路径之后），不提供时使用通用提示
+    type_message: 类型错误时的提示（接在字段路径之后），不提供时使用通用提示
+"""
+
+from functools import wraps
+from typing import Any, Callable, Dict, Mapping, NamedTuple, Optional, Tuple
+from flask import request
+
+# 字段配置允许的键
+_OPTION_KEYS = frozenset(('type', 'required', 'default', 'choices', 'min', 'max', 'items', 'parse',
+                          'message', 'type_message'))
+
+_QUERY_TYPES = (str, int, float, bool)
+_BODY_TYPES = (str, int, float, bool, list, dict)
+
+# 请求体中各类型接受的值类型和错误提示；JSON 解码只产生这些精确类型，布尔值不算整数
+_TYPE_RULES = {
+    str: ((str,), "必须是字符串"),
+    int: ((int,), "必须是整数"),
+    float: ((float, int), "必须是数字"),
+    bool: ((bool,), "必须是布尔值"),
+    list: ((list,), "必须是数组格式"),
+    dict: ((dict,), "必须是对象格式")
+}
+
+_TRUTHY = frozenset(('true', '1', 'yes', 'on'))
+
+# 缺省标记（区分字段缺失与显式的 null）
+_MISSING = object()
+
+
+class _Invalid(Exception):
+    """字段值不合法，message 接在字段路径之后"""
+
+
+class _FieldRule(NamedTuple):
+    """一个字段的校验规则"""
+    name: str
+    required: bool
+    default: Any
+    types: Tuple[type, ...]
+    type_message: str
+    check: Optional[Callable[[Any], Any]]
+    items: Optional['_ObjectRule']
+
+
+class _ObjectRule(NamedTuple):
+    """一个对象的校验规则"""
+    fields: Tuple[_FieldRule, ...]
+    required: Tuple[str, ...]
+
+
+def _value_check(options: Dict[str, Any], sized: bool) -> Optional[Callable[[Any], Any]]:
+    """
+    生成取值、范围检查和转换函数
+
+    Args:
+        options: 字段配置
+        sized: 范围检查是否针对长度（字符串、数组）
+
+    Returns:
+        Optional[Callable]: 接收值、返回转换后的值，不合法时抛出 _Invalid；没有任何检查时为None
+    """
+    choices = options.get('choices')
+    allowed = frozenset(choices) if choices is not None else None
+    choices_message = f" 的值必须是以下之一: {list(choices)}" if choices is not None else None
+
+    low, high = options.get('min'), options.get('max')
+    range_message = options.get('message')
+    if range_message is None and (low is not None or high is not None):
+        prefix = "长度" if sized else ""
+        if low is not None and high is not None:
+            range_message = f"{prefix}必须在{low}-{high}之间"
+        elif low is not None:
+            range_message = f"{prefix}不能小于{low}"
+        else:
+            range_message = f"{prefix}不能大于{high}"
+
+    parse = options.get('parse')
+    if allowed is None and low is None and high is None and parse is None:
+        return None
+
+    def check(value):
+        if allowed is not None and value not in allowed:
+            raise _Invalid(choices_message)
+        if low is not None or high is not None:
+            measure = len(value) if sized else value
+            if (low is not None and measure < low) or (high is not None and measure > high):
+                raise _Invalid(range_message)
+        return parse(value) if parse is not None else value
+
+    return check
+
+
+def _object_rule(spec: Dict[str, Dict[str, Any]]) -> _ObjectRule:
+    """把请求体（或数组元素）的字段配置整理为对象规则"""
+    fields = []
+    for name, options in spec.items():
+        field_type = options.get('type', str)
+        types, type_message = _TYPE_RULES[field_type]
+        items = options.get('items')
+        fields.append(_FieldRule(
+            name=name,
+            required=bool(options.get('required')),
+            default=options.get('default', _MISSING),
+            types=types,
+            type_message=options.get('type_message', type_message),
+            check=_value_check(options, sized=field_type in (str, list)),
+            items=_object_rule(items) if items is not None else None
+        ))
+    required = tuple(rule.name for rule in fields if rule.required)
+    return _ObjectRule(tuple(fields), required)
+
+
+def _check_spec(spec: Dict[str, Dict[str, Any]], types: tuple):
+    """检查模式声明本身（在导入时发现拼写错误）"""
+    for name, options in spec.items():
+        unknown = set(options) - _OPTION_KEYS
+        if unknown:
+            raise ValueError(f"字段 {name} 的配置包含不支持的项: {', '.join(sorted(unknown))}")
+        field_type = options.get('type', str)
+        if field_type not in types:
+            raise ValueError(f"字段 {name} 的类型不受支持: {field_type}")
+        if 'items' in options:
+            if field_type is not list:
+                raise ValueError(f"字段 {name} 只有数组类型才能声明 items")
+            _check_spec(options['items'], _BODY_TYPES)
+
+
+def compile_query(spec: Dict[str, Dict[str, Any]]) -> Callable[[Mapping[str, str]], Dict[str, Any]]:
+    """
+    把查询参数模式整理为校验函数
+
+    字符串去除首尾空白，布尔值接受 true/1/yes/on；缺少必填参数或类型转换失败时给出参数名。
+
+    Args:
+        spec: 字段配置 {'参数名': {'type': int, 'default': 1, ...}}
+
+    Returns:
+        Callable: 接收 request.args，返回参数字典；校验失败时抛出 ValueError
+
+    Raises:
+        ValueError: 模式声明有误
+    """
+    _check_spec(spec, _QUERY_TYPES)
+    rules = tuple(
+        (name, options.get('type', str), bool(options.get('required')), options.get('default', _MISSING),
+         _value_check(options, sized=options.get('type', str) is str))
+        for name, options in spec.items()
+    )
+
+    def validate(args):
+        result = {}
+        for name, field_type, required, default, check in rules:
+            value = args.get(name)
+            if value is None:
+                if required:
+                    raise ValueError(f"缺少必填参数: {name}")
+                if default is not _MISSING:
+                    result[name] = default
+                continue
+
+            if field_type is str:
+                value = value.strip()
+            elif field_type is bool:
+                value = value.lower() in _TRUTHY
+            else:
+                try:
+                    value = field_type(value)
+                except ValueError as e:
+                    raise ValueError(f"参数 {name} 类型错误: {e}") from None
+
+            if check is not None:
+                try:
+                    value = check(value)
+                except _Invalid as e:
+                    raise ValueError(f"参数 {name}{e}") from None
+            result[name] = value
+        return result
+
+    return validate
+
+
+def _validate_items(items: list, rule: _ObjectRule, path: str):
+    """
+    校验数组中的每个对象元素（只校验、不复制）
+
+    数组可能很长，循环中只做必要的判断，字段路径只在出错时才拼接。
+
+    Args:
+        items: 数组
+        rule: 元素的对象规则
+        path: 数组的字段路径
+    """
+    fields = tuple((field.name, field.required, field.types, field.type_message, field.check, field.items)
+                   for field in rule.fields)
+    for index, item in enumerate(items):
+        if type(item) is not dict:
+            raise ValueError(f"{path}[{index}]必须是对象格式")
+        get = item.get
+        try:
+            for name, required, types, type_message, check, nested in fields:
+                value = get(name)
+                if value is None:
+                    if required:
+                        raise ValueError(f"{path}[{index}]必须包含{'和'.join(rule.required)}字段")
+                    continue
+                if type(value) not in types:
+                    raise _Invalid(type_message)
+                if nested is not None:
+                    _validate_items(value, nested, f"{path}[{index}].{name}")
+                if check is not None:
+                    check(value)
+        except _Invalid as e:
+            raise ValueError(f"{path}[{index}].{name}{e}") from None
+
+
+def _check_field(field: _FieldRule, value: Any, path: str) -> Any:
+    """
+    校验一个非 null 的字段值
+
+    Args:
+        field: 字段规则
+        value: 字段值
+        path: 字段路径，用于错误提示
+
+    Returns:
+        Any: 转换后的值
+    """
+    if type(value) not in field.types:
+        raise ValueError(f"{path}{field.type_message}")
+    if field.items is not None:
+        _validate_items(value, field.items, path)
+    if field.check is not None:
+        try:
+            return field.check(value)
+        except _Invalid as e:
+            raise ValueError(f"{path}{e}") from None
+    return value
+
+
+def compile_body(spec: Dict[str, Dict[str, Any]]) -> Callable[[Any], Dict[str, Any]]:
+    """
+    把 JSON 请求体模式整理为校验函数
+
+    必填字段缺失或为 null 时一并报告，未声明的字段被丢弃，并检查字段类型和范围。
+    数组元素（items）只校验、不复制，缺少必填字段时报告元素下标。
+
+    Args:
+        spec: 字段配置 {'字段名': {'type': str, 'required': True, ...}}
+
+    Returns:
+        Callable: 接收解码后的请求体，返回只含已声明字段的字典；校验失败时抛出 ValueError
+
+    Raises:
+        ValueError: 模式声明有误
+    """
+    _check_spec(spec, _BODY_TYPES)
+    rule = _object_rule(spec)
+
+    def validate(data):
+        if type(data) is not dict:
+            raise ValueError("请求数据必须是对象格式")
+
+        missing = [name for name in rule.required if data.get(name) is None]
+        if missing:
+            raise ValueError(f"缺少必填字段: {', '.join(missing)}")
+
+        result = {}
+        for field in rule.fields:
+            value = data.get(field.name, _MISSING)
+            if value is _MISSING:
+                if field.default is not _MISSING:
+                    result[field.name] = field.default
+                continue
+            # 可选字段显式传入 null 时原样保留
+            result[field.name] = value if value is None else _check_field(field, value, field.name)
+        return result
+
+    return validate
+
+
+def query_schema(spec: Dict[str, Dict[str, Any]]):
+    """
+    装饰器：按模式校验查询参数，结果作为 query 参数传给视图
+
+    模式在导入时整理一次；校验失败抛出 ValueError，由 handle_api_errors 转换为 400。
+
+    Args:
+        spec: 字段配置，见 compile_query
+
+    Returns:
+        装饰器
+    """
+    validate = compile_query(spec)
+
+    def decorator(f):
+        @wraps(f)
+        def decorated_function(*args, **kwargs):
+            return f(*args, query=validate(request.args), **kwargs)
+
+        decorated_function.query_schema = spec
+        return decorated_function
+
+    return decorator
+
+
+def body_schema(spec: Dict[str, Dict[str, Any]]):
+    """
+    装饰器：按模式校验 JSON 请求体，结果作为 body 参数传给视图
+
+    模式在导入时整理一次；请求不是 JSON、格式错误或校验失败时抛出 ValueError，
+    由 handle_api_errors 转换为 400。
+
+    Args:
+        spec: 字段配置，见 compile_body
+
+    Returns:
+        装饰器
+    """
+    validate = compile_body(spec)
+
+    def decorator(f):
+        @wraps(f)
+        def decorated_function(*args, **kwargs):
+            if not request.is_json:
+                raise ValueError("请求必须是JSON格式")
+            try:
+                data = request.get_json()
+            except Exception as e:
+                raise ValueError(f"JSON格式错误: {str(e)}")
+            if data is None:
+                raise ValueError("请求数据为空")
+            return f(*args, body=validate(data), **kwargs)
+
+        decorated_function.body_schema = spec
+        return decorated_function
+
+    return decorator
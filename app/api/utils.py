@@ -3,11 +3,20 @@ API 工具函数
 统一的响应格式和验证工具
 """
 
-from typing import Any, Dict, Optional, Tuple
-from flask import jsonify, request
+from datetime import datetime
+from typing import Any, Callable, Dict, Optional, Tuple, Sequence
+from flask import current_app, g, has_request_context, jsonify, make_response, request
+from flask.json.provider import DefaultJSONProvider
+from app.models.card import card_fragments, encode_fragment
+from app.models.storage import DataValidationError
+from . import formats
 from functools import wraps
+import hashlib
 import json
 
+# 组装卡片列表响应时 items 的占位值，序列化后替换为拼接好的卡片片段
+_ITEMS_PLACEHOLDER = '\x00cards\x00'
+
 
 def success_response(data: Any = None, message: str = "操作成功", **kwargs) -> Dict[str, Any]:
     """
@@ -65,122 +74,6 @@ def error_response(message: str, error_code: str = "error", details: Any = None,
     return response, status_code
 
 
-def validate_json_request(required_fields: list = None, optional_fields: list = None) -> Dict[str, Any]:
-    """
-    验证JSON请求数据
-
-    Args:
-        required_fields: 必填字段列表
-        optional_fields: 可选字段列表
-
-    Returns:
-        Dict: 验证后的数据
-
-    Raises:
-        ValueError: 验证失败时抛出异常
-    """
-    if not request.is_json:
-        raise ValueError("请求必须是JSON格式")
-
-    try:
-        data = request.get_json()
-    except Exception as e:
-        raise ValueError(f"JSON格式错误: {str(e)}")
-
-    if data is None:
-        raise ValueError("请求数据为空")
-
-    if not isinstance(data, dict):
-        raise ValueError("请求数据必须是对象格式")
-
-    # 检查必填字段
-    if required_fields:
-        missing_fields = []
-        for field in required_fields:
-            if field not in data or data[field] is None:
-                missing_fields.append(field)
-
-        if missing_fields:
-            raise ValueError(f"缺少必填字段: {', '.join(missing_fields)}")
-
-    # 过滤允许的字段
-    allowed_fields = set()
-    if required_fields:
-        allowed_fields.update(required_fields)
-    if optional_fields:
-        allowed_fields.update(optional_fields)
-
-    if allowed_fields:
-        filtered_data = {k: v for k, v in data.items() if k in allowed_fields}
-        return filtered_data
-
-    return data
-
-
-def validate_query_params(params_config: Dict[str, Dict[str, Any]]) -> Dict[str, Any]:
-    """
-    验证查询参数
-
-    Args:
-        params_config: 参数配置字典
-            格式: {
-                'param_name': {
-                    'required': bool,
-                    'type': type,
-                    'default': any,
-                    'choices': list
-                }
-            }
-
-    Returns:
-        Dict: 验证后的参数字典
-
-    Raises:
-        ValueError: 验证失败时抛出异常
-    """
-    result = {}
-
-    for param_name, config in params_config.items():
-        value = request.args.get(param_name)
-
-        # 检查必填参数
-        if config.get('required', False) and value is None:
-            raise ValueError(f"缺少必填参数: {param_name}")
-
-        # 使用默认值
-        if value is None and 'default' in config:
-            result[param_name] = config['default']
-            continue
-
-        if value is None:
-            continue
-
-        # 类型转换
-        param_type = config.get('type', str)
-        try:
-            if param_type == bool:
-                # 布尔值特殊处理
-                value = value.lower() in ('true', '1', 'yes', 'on')
-            elif param_type == int:
-                value = int(value)
-            elif param_type == float:
-                value = float(value)
-            elif param_type == str:
-                value = str(value).strip()
-            else:
-                value = param_type(value)
-        except (ValueError, TypeError) as e:
-            raise ValueError(f"参数 {param_name} 类型错误: {str(e)}")
-
-        # 检查选择范围
-        if 'choices' in config and value not in config['choices']:
-            raise ValueError(f"参数 {param_name} 的值必须是以下之一: {config['choices']}")
-
-        result[param_name] = value
-
-    return result
-
-
 def require_json(f):
     """
     装饰器：要求请求为JSON格式
@@ -228,6 +121,9 @@ def handle_api_errors(f):
         except json.JSONDecodeError as e:
             # JSON解析错误
             return jsonify(error_response("数据格式错误", "json_decode_error", str(e))[0]), 500
+        except DataValidationError as e:
+            # 严格校验模式下数据文件包含无效卡片，不返回空数据
+            return jsonify(error_response("数据文件校验失败", "service_error", str(e))[0]), 500
         except Exception as e:
             # 其他未预期的错误
             error_message = "发生未知错误"
@@ -238,6 +134,220 @@ def handle_api_errors(f):
     return decorated_function
 
 
+def _fragment_encoder() -> Optional[Callable[[Any], bytes]]:
+    """
+    获取与当前 JSON 紧凑输出一致的片段编码函数
+
+    Returns:
+        Optional[Callable]: 编码函数；输出方式与片段无法拼接（如调试模式下的缩进输出）时为None
+    """
+    provider = current_app.json
+    if hasattr(provider, 'fragment_encoder'):
+        return provider.fragment_encoder
+
+    # 未定制的默认提供者：紧凑输出、键排序、ASCII 转义时与 encode_fragment 一致
+    cls = type(provider)
+    if (isinstance(provider, DefaultJSONProvider)
+            and cls.dumps is DefaultJSONProvider.dumps and cls.response is DefaultJSONProvider.response
+            and provider.ensure_ascii and provider.sort_keys
+            and not (provider.compact is False or (provider.compact is None and current_app.debug))):
+        return encode_fragment
+    return None
+
+
+def jsonify_cards(data: Dict[str, Any], message: str):
+    """
+    生成卡片列表响应，与 jsonify(success_response(data, message)) 逐字节一致
+
+    data['items'] 为卡片对象序列。信封（分页信息、消息等）照常序列化，
+    卡片直接拼接各自缓存的 JSON 片段，不再逐张生成字典和编码。
+    JSON 输出方式与片段不一致（如调试模式下的缩进输出）时按常规方式序列化。
+
+    客户端协商了二进制格式（见 response_format）时按该格式输出，卡片同样拼接缓存的片段。
+
+    Args:
+        data: 响应数据，items 为卡片序列（会被修改）
+        message: 响应消息
+
+    Returns:
+        Response: JSON（或协商的二进制格式）响应
+    """
+    cards = data['items']
+    fmt = response_format()
+    if fmt != 'json':
+        return _pack_cards(data, message, fmt)
+
+    encode = _fragment_encoder()
+    if encode is None:
+        data['items'] = [card.to_dict() for card in cards]
+        return jsonify(success_response(data=data, message=message))
+
+    data['items'] = _ITEMS_PLACEHOLDER
+    response = jsonify(success_response(data=data, message=message))
+    items = b'[' + b','.join(card_fragments(cards, encode)) + b']'
+    # 字符串值中的引号都会被转义，因此标记只可能匹配到 items 键本身
+    marker = b'"items":' + encode(_ITEMS_PLACEHOLDER)
+    response.set_data(response.get_data().replace(marker, b'"items":' + items, 1))
+    return response
+
+
+def _pack_cards(data: Dict[str, Any], message: str, fmt: str):
+    """按二进制格式生成卡片列表响应：信封照常编码，items 替换为数组头加各卡片缓存的片段"""
+    encode, array_header = formats.ENCODERS[fmt]
+    fragments = card_fragments(data['items'], encode, batch=False)
+    data['items'] = _ITEMS_PLACEHOLDER
+    body = encode(success_response(data=data, message=message))
+    key = encode('items')
+    # 信封中的字符串都由服务端生成，占位值只会出现在 items 处
+    body = body.replace(key + encode(_ITEMS_PLACEHOLDER), key + array_header(len(fragments)) + b''.join(fragments), 1)
+    return current_app.response_class(body, content_type=formats.content_type(fmt))
+
+
+def response_format() -> str:
+    """
+    当前请求协商的响应格式（按 Accept 头，每个请求只计算一次）
+
+    Returns:
+        str: 'json'、'msgpack' 或 'cbor'；不在请求上下文中时为 'json'
+    """
+    if not has_request_context():
+        return 'json'
+    fmt = g.get('response_format')
+    if fmt is None:
+        fmt = formats.negotiate_format(request.accept_mimetypes)
+        g.response_format = fmt
+    return fmt
+
+
+def encode_response(response):
+    """
+    把 JSON 响应转换为协商的二进制格式（结构不变）
+
+    非 JSON 响应（304、已转换的响应等）和协商结果为 JSON 时原样返回。
+
+    Args:
+        response: 响应对象
+
+    Returns:
+        Response: 转换后的响应
+    """
+    fmt = response_format()
+    if fmt == 'json' or response.mimetype != formats.JSON_MIMETYPE or response.direct_passthrough:
+        return response
+    payload = current_app.json.loads(response.get_data())
+    response.set_data(formats.encode(payload, fmt))
+    response.content_type = formats.content_type(fmt)
+    return response
+
+
+def negotiated(f):
+    """
+    装饰器：按 Accept 头以 JSON、MessagePack 或 CBOR 输出响应
+
+    JSON 仍是默认格式；Accept 中 application/msgpack 或 application/cbor 的权重更高时
+    按该格式编码，错误响应同样转换。响应都带 Vary: Accept。
+    应放在路由装饰器之下、其他装饰器之上，使 handle_api_errors 生成的错误响应也被转换。
+    """
+
+    @wraps(f)
+    def decorated_function(*args, **kwargs):
+        response = encode_response(make_response(f(*args, **kwargs)))
+        response.vary.add('Accept')
+        return response
+
+    return decorated_function
+
+
+def make_etag(*parts: Any) -> str:
+    """
+    由若干部分生成强 ETag 值
+
+    Args:
+        *parts: 决定响应内容的各项（数据版本、查询参数等）
+
+    Returns:
+        str: ETag 值（不含引号）
+    """
+    return hashlib.sha1(repr(parts).encode('utf-8')).hexdigest()
+
+
+def parse_timestamp(value: Optional[str]) -> Optional[datetime]:
+    """
+    把 ISO 格式的本地时间转换为带时区的时间，用于 Last-Modified
+
+    Args:
+        value: ISO 格式的时间字符串
+
+    Returns:
+        Optional[datetime]: 带时区的时间（精确到秒），无法解析时为None
+    """
+    if not value:
+        return None
+    try:
+        # 不带时区的时间按服务器本地时间解释
+        return datetime.fromisoformat(value).astimezone().replace(microsecond=0)
+    except (TypeError, ValueError):
+        return None
+
+
+def conditional_get(validators: Callable[..., Optional[Tuple[str, Optional[datetime]]]] = None):
+    """
+    装饰器：为 GET 接口加上 ETag / Last-Modified 条件响应
+
+    提供 validators 时在执行视图之前计算校验值，If-None-Match（或 If-Modified-Since）
+    匹配时直接返回 304，不加载、不序列化数据；未提供时按响应体内容计算 ETag。
+    只处理 200 响应，错误响应原样返回。
+
+    Args:
+        validators: 接收视图参数，返回 (ETag 值, 最后修改时间)；返回None表示本次不做条件响应
+
+    Returns:
+        装饰器
+    """
+
+    def decorator(f):
+        @wraps(f)
+        def decorated_function(*args, **kwargs):
+            etag, last_modified = (validators(*args, **kwargs) if validators else None) or (None, None)
+
+            if etag is not None:
+                # 有 If-None-Match 时忽略 If-Modified-Since；If-None-Match 按弱比较（RFC 9110），
+                # 压缩后的响应带弱 ETag，客户端回传时同样能命中
+                if request.if_none_match:
+                    not_modified = request.if_none_match.contains_weak(etag)
+                else:
+                    not_modified = (last_modified is not None and request.if_modified_since is not None
+                                    and last_modified <= request.if_modified_since)
+                if not_modified:
+                    response = current_app.response_class(status=304)
+                    _set_validators(response, etag, last_modified)
+                    return response
+
+            response = make_response(f(*args, **kwargs))
+            if response.status_code != 200:
+                return response
+
+            if etag is not None:
+                _set_validators(response, etag, last_modified)
+            elif validators is None:
+                response.add_etag()
+                response.cache_control.no_cache = True
+                response.make_conditional(request)
+            return response
+
+        return decorated_function
+
+    return decorator
+
+
+def _set_validators(response, etag: str, last_modified: Optional[datetime]):
+    """设置 ETag、Last-Modified，并要求客户端每次使用缓存前先验证"""
+    response.set_etag(etag)
+    if last_modified is not None:
+        response.last_modified = last_modified
+    response.cache_control.no_cache = True
+
+
 def get_client_ip() -> str:
     """
     获取客户端IP地址
@@ -254,12 +364,14 @@ def get_client_ip() -> str:
         return request.remote_addr or '127.0.0.1'
 
 
-def paginate_data(data: list, page: int = 1, per_page: int = 20) -> Dict[str, Any]:
+def paginate_data(data: Sequence, page: int = 1, per_page: int = 20) -> Dict[str, Any]:
     """
     分页处理数据
 
+    只对数据做一次切片，传入惰性序列（如 CardView、NumPy 下标数组）时不会展开全部数据。
+
     Args:
-        data: 要分页的数据列表
+        data: 要分页的数据序列（支持 len 和切片）
         page: 页码（从1开始）
         per_page: 每页数量
 
@@ -289,6 +401,67 @@ def paginate_data(data: list, page: int = 1, per_page: int = 20) -> Dict[str, An
     }
 
 
+def parse_fields(value: Optional[str]) -> Optional[list]:
+    """
+    解析字段投影参数
+
+    Args:
+        value: 逗号分隔的字段名，如 "id,name,icon,url"
+
+    Returns:
+        Optional[list]: 字段名列表，未指定时为None（返回全部字段）
+    """
+    if value is None or not value.strip():
+        return None
+    return [field.strip() for field in value.split(',') if field.strip()]
+
+
+def parse_cursor(value: str) -> Tuple[int, str]:
+    """
+    解析 keyset 分页游标
+
+    Args:
+        value: 游标字符串，格式为 "排序号,卡片ID"
+
+    Returns:
+        Tuple[int, str]: (排序号, 卡片ID)
+
+    Raises:
+        ValueError: 游标格式错误
+    """
+    order, sep, card_id = (value or '').partition(',')
+    if not sep or not card_id:
+        raise ValueError("游标格式错误，应为: 排序号,卡片ID")
+    try:
+        return int(order), card_id
+    except ValueError:
+        raise ValueError("游标格式错误，排序号必须是整数")
+
+
+def keyset_page(items: Sequence, limit: int) -> Dict[str, Any]:
+    """
+    生成 keyset 分页结果
+
+    Args:
+        items: 按 order 排序的卡片，最多 limit + 1 张（多取的一张用于判断是否还有下一页）
+        limit: 每页数量
+
+    Returns:
+        Dict: {'items': 本页卡片, 'cursor': {'limit', 'next', 'has_next'}}，
+        next 为下一页的 after 参数
+    """
+    page = list(items[:limit])
+    has_next = len(items) > limit
+    return {
+        'items': page,
+        'cursor': {
+            'limit': limit,
+            'next': f"{page[-1].order},{page[-1].id}" if has_next else None,
+            'has_next': has_next
+        }
+    }
+
+
 def filter_sensitive_data(data: Dict[str, Any], sensitive_keys: list = None) -> Dict[str, Any]:
     """
     过滤敏感数据
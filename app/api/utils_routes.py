@@ -3,21 +3,28 @@
 提供图标列表、名称验证等辅助功能
 """
 
-from flask import jsonify
-from . import api_bp, get_card_service
+from flask import current_app, jsonify
+from . import api_bp, get_card_service, get_response_cache, get_readiness_monitor
 from .utils import (
     success_response,
     error_response,
-    validate_json_request,
-    validate_query_params,
     handle_api_errors,
-    require_json
+    require_json,
+    conditional_get,
+    negotiated
 )
+from . import formats
+from .schema import query_schema, body_schema
 
 
 @api_bp.route('/icons', methods=['GET'])
 @handle_api_errors
-def get_icons():
+@conditional_get()
+@query_schema({
+    'search': {'type': str, 'default': None},
+    'category': {'type': str, 'default': None}
+})
+def get_icons(query):
     """
     获取可用图标列表
 
@@ -26,23 +33,6 @@ def get_icons():
     Returns:
         JSON: 图标列表
     """
-    # 验证查询参数
-    try:
-        params = validate_query_params({
-            'search': {
-                'type': str,
-                'required': False,
-                'default': None
-            },
-            'category': {
-                'type': str,
-                'required': False,
-                'default': None
-            }
-        })
-    except ValueError as e:
-        return jsonify(error_response(str(e), "validation_error")[0]), 400
-
     # Bootstrap Icons 常用图标列表
     # 这里提供一个预定义的图标列表，实际使用时可以从Bootstrap Icons CDN获取
     icons_data = {
@@ -126,12 +116,12 @@ def get_icons():
 
     for category, icons in icons_data.items():
         # 分类过滤
-        if params['category'] and params['category'] != category:
+        if query['category'] and query['category'] != category:
             continue
 
         # 搜索过滤
-        if params['search']:
-            search_term = params['search'].lower()
+        if query['search']:
+            search_term = query['search'].lower()
             filtered_category_icons = [
                 icon for icon in icons
                 if (search_term in icon['name'].lower() or
@@ -149,8 +139,8 @@ def get_icons():
     response_data = {
         "categories": filtered_icons,
         "total_count": total_count,
-        "search_query": params['search'],
-        "category_filter": params['category']
+        "search_query": query['search'],
+        "category_filter": query['category']
     }
 
     return jsonify(success_response(
@@ -162,7 +152,11 @@ def get_icons():
 @api_bp.route('/validate-name', methods=['POST'])
 @handle_api_errors
 @require_json
-def validate_name():
+@body_schema({
+    'name': {'type': str, 'required': True},
+    'exclude_id': {'type': str}
+})
+def validate_name(body):
     """
     验证卡片名称唯一性
 
@@ -179,14 +173,8 @@ def validate_name():
     if not card_service:
         return jsonify(error_response("卡片服务未初始化", "service_error")[0]), 500
 
-    # 验证请求数据
-    data = validate_json_request(
-        required_fields=['name'],
-        optional_fields=['exclude_id']
-    )
-
-    name = data['name']
-    exclude_id = data.get('exclude_id')
+    name = body['name']
+    exclude_id = body.get('exclude_id')
 
     # 验证名称
     is_valid, message = card_service.validate_name(name, exclude_id)
@@ -210,6 +198,7 @@ def validate_name():
 
 
 @api_bp.route('/stats', methods=['GET'])
+@negotiated
 @handle_api_errors
 def get_stats():
     """
@@ -230,9 +219,21 @@ def get_stats():
     # 添加API相关统计
     api_stats = {
         "api_version": "1.0.0",
-        "endpoints_count": 15,  # 当前API接口数量
-        "supported_methods": ["GET", "POST", "PUT", "DELETE"]
+        # 当前API接口数量（蓝图中注册的路由规则数）
+        "endpoints_count": sum(1 for rule in current_app.url_map.iter_rules()
+                               if rule.endpoint.startswith(f"{api_bp.name}.")),
+        "supported_methods": ["GET", "POST", "PUT", "DELETE"],
+        "binary_formats": formats.backends()
     }
+    cache = get_response_cache()
+    if cache is not None:
+        api_stats["response_cache"] = cache.get_stats()
+    monitor = get_readiness_monitor()
+    if monitor is not None:
+        api_stats["health_monitor"] = monitor.get_stats()
+    compression = current_app.extensions.get('compression')
+    if compression is not None:
+        api_stats["compression"] = compression.get_stats()
 
     response_data = {
         "service": stats,
@@ -0,0 +1,105 @@
+"""
+响应缓存
+线程安全的 LRU 字节缓存（按条数和总字节数限制），API 用它按查询参数和数据版本缓存
+序列化好的 JSON 响应体，压缩中间件用它缓存压缩结果。
+键中带有数据版本（或 ETag），旧条目不会再被命中，随后被自然淘汰，无需显式清除。
+"""
+
+import threading
+from collections import OrderedDict
+from typing import Any, Dict, Hashable, Optional
+
+
+class ResponseCache:
+    """线程安全的 LRU 响应体缓存"""
+
+    def __init__(self, max_entries: int = 256, max_bytes: int = 16 * 1024 * 1024):
+        """
+        初始化缓存
+
+        Args:
+            max_entries: 最多缓存的条数，0 表示关闭缓存
+            max_bytes: 缓存响应体的总字节数上限
+        """
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self._entries: 'OrderedDict[Hashable, bytes]' = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self.stats = {'hits': 0, 'misses': 0, 'evictions': 0, 'rejected': 0}
+
+    @property
+    def enabled(self) -> bool:
+        """缓存是否启用"""
+        return self.max_entries > 0 and self.max_bytes > 0
+
+    def get(self, key: Hashable) -> Optional[bytes]:
+        """
+        查找缓存的响应体，命中时移到最近使用的位置
+
+        Args:
+            key: 缓存键
+
+        Returns:
+            Optional[bytes]: 响应体，未命中时为None
+        """
+        with self._lock:
+            body = self._entries.get(key)
+            if body is None:
+                self.stats['misses'] += 1
+                return None
+            self._entries.move_to_end(key)
+            self.stats['hits'] += 1
+            return body
+
+    def put(self, key: Hashable, body: bytes):
+        """
+        缓存响应体，超出限制时淘汰最久未使用的条目
+
+        Args:
+            key: 缓存键
+            body: 响应体
+        """
+        if not self.enabled:
+            return
+        if len(body) > self.max_bytes:
+            # 单个响应超过总上限，缓存它会挤掉全部条目
+            with self._lock:
+                self.stats['rejected'] += 1
+            return
+
+        with self._lock:
+            previous = self._entries.pop(key, None)
+            if previous is not None:
+                self._bytes -= len(previous)
+            self._entries[key] = body
+            self._bytes += len(body)
+
+            while len(self._entries) > self.max_entries or self._bytes > self.max_bytes:
+                _, evicted = self._entries.popitem(last=False)
+                self._bytes -= len(evicted)
+                self.stats['evictions'] += 1
+
+    def clear(self):
+        """清空缓存"""
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        获取缓存统计信息
+
+        Returns:
+            Dict: 命中、未命中、淘汰次数、命中率及当前条数和字节数
+        """
+        with self._lock:
+            lookups = self.stats['hits'] + self.stats['misses']
+            return {
+                **self.stats,
+                "hit_ratio": round(self.stats['hits'] / lookups, 4) if lookups else 0.0,
+                "entries": len(self._entries),
+                "bytes": self._bytes,
+                "max_entries": self.max_entries,
+                "max_bytes": self.max_bytes
+            }
@@ -0,0 +1,309 @@
+"""
+响应压缩
+WSGI 中间件：按 Accept-Encoding 对文本类响应做 gzip（或 deflate）压缩，
+带强 ETag 的响应压缩结果缓存复用；静态文件在启动时预先生成 .gz 文件并直接发送。
+"""
+
+import gzip
+import mimetypes
+import os
+import tempfile
+import zlib
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+from werkzeug.security import safe_join
+from werkzeug.utils import send_file
+from app.cache import ResponseCache
+
+# 值得压缩的内容类型（图片、字体等已压缩格式不在其中）
+COMPRESSIBLE_TYPES = frozenset((
+    'application/json', 'application/javascript', 'application/xml', 'application/manifest+json',
+    'image/svg+xml', 'image/x-icon', 'image/vnd.microsoft.icon'
+))
+
+
+def is_compressible(mimetype: Optional[str]) -> bool:
+    """
+    判断内容类型是否值得压缩
+
+    Args:
+        mimetype: 内容类型（可带参数，如 charset）
+
+    Returns:
+        bool: text/* 及 COMPRESSIBLE_TYPES 中的类型为True
+    """
+    if not mimetype:
+        return False
+    mimetype = mimetype.split(';', 1)[0].strip().lower()
+    return mimetype.startswith('text/') or mimetype in COMPRESSIBLE_TYPES
+
+
+def negotiate_encoding(accept_encoding: str) -> Optional[str]:
+    """
+    根据 Accept-Encoding 选择压缩方式
+
+    Args:
+        accept_encoding: 请求头的值，如 "gzip, deflate;q=0.5"
+
+    Returns:
+        Optional[str]: 'gzip'、'deflate'，都不接受时为None；两者权重相同时优先 gzip
+    """
+    weights: Dict[str, float] = {}
+    for part in accept_encoding.split(','):
+        coding, _, params = part.strip().partition(';')
+        coding = coding.strip().lower()
+        if not coding:
+            continue
+        weight = 1.0
+        params = params.strip().lower()
+        if params.startswith('q='):
+            try:
+                weight = float(params[2:])
+            except ValueError:
+                weight = 0.0
+        weights[coding] = weight
+
+    star = weights.get('*', 0.0)
+    gzip_weight = weights.get('gzip', weights.get('x-gzip', star))
+    deflate_weight = weights.get('deflate', star)
+    if gzip_weight <= 0 and deflate_weight <= 0:
+        return None
+    return 'gzip' if gzip_weight >= deflate_weight else 'deflate'
+
+
+def compress(body: bytes, encoding: str, level: int = 6) -> bytes:
+    """
+    压缩响应体
+
+    Args:
+        body: 原始响应体
+        encoding: 'gzip' 或 'deflate'（zlib 格式，即 HTTP 的 deflate 编码）
+        level: 压缩级别（1-9）
+
+    Returns:
+        bytes: 压缩后的数据（gzip 头中不写时间戳，相同输入得到相同输出）
+    """
+    if encoding == 'gzip':
+        return gzip.compress(body, compresslevel=level, mtime=0)
+    return zlib.compress(body, level)
+
+
+def precompress_static(folder: str, min_size: int = 1024, level: int = 9) -> Dict[str, int]:
+    """
+    为静态目录中的文本类文件生成 .gz 文件
+
+    .gz 文件的修改时间与原文件一致，原文件变化后（修改时间不同）下次启动时重新生成，
+    在此之前中间件不会使用过期的 .gz 文件。
+
+    Args:
+        folder: 静态文件目录
+        min_size: 小于此大小的文件不压缩
+        level: 压缩级别
+
+    单个文件读写失败（OSError）时跳过该文件并计数，不影响其他文件和启动；其他异常照常抛出。
+
+    Returns:
+        Dict[str, int]: 本次生成的文件数 created 与失败的文件数 errors
+    """
+    result = {'created': 0, 'errors': 0}
+    for root, _, files in os.walk(folder):
+        for name in files:
+            if name.endswith('.gz'):
+                continue
+            path = os.path.join(root, name)
+            if not is_compressible(mimetypes.guess_type(name)[0]):
+                continue
+
+            tmp_path = None
+            try:
+                st = os.stat(path)
+                if st.st_size < min_size:
+                    continue
+                try:
+                    if os.stat(path + '.gz').st_mtime_ns == st.st_mtime_ns:
+                        continue
+                except FileNotFoundError:
+                    pass
+
+                with open(path, 'rb') as f:
+                    data = compress(f.read(), 'gzip', level)
+                fd, tmp_path = tempfile.mkstemp(prefix='.precompress-', suffix='.tmp', dir=root)
+                with os.fdopen(fd, 'wb') as f:
+                    f.write(data)
+                os.utime(tmp_path, ns=(st.st_atime_ns, st.st_mtime_ns))
+                os.replace(tmp_path, path + '.gz')
+                tmp_path = None
+                result['created'] += 1
+            except OSError:
+                result['errors'] += 1
+            finally:
+                if tmp_path and os.path.exists(tmp_path):
+                    os.remove(tmp_path)
+    return result
+
+
+def _merge_vary(headers: List[Tuple[str, str]]) -> List[Tuple[str, str]]:
+    """在 Vary 头中加入 Accept-Encoding"""
+    for i, (name, value) in enumerate(headers):
+        if name.lower() == 'vary':
+            if 'accept-encoding' not in value.lower() and value.strip() != '*':
+                headers[i] = (name, f"{value}, Accept-Encoding")
+            return headers
+    headers.append(('Vary', 'Accept-Encoding'))
+    return headers
+
+
+class CompressionMiddleware:
+    """
+    响应压缩 WSGI 中间件
+
+    只压缩 200 响应中大于阈值的文本类内容；已编码、标记 no-transform 的响应和 HEAD 请求原样返回。
+    压缩后的响应 ETag 改为弱 ETag（与 nginx 相同），条件请求按弱比较仍能命中 304。
+    """
+
+    def __init__(self, app, min_size: int = 1024, level: int = 6, cache_entries: int = 128,
+                 cache_bytes: int = 8 * 1024 * 1024, static_folder: Optional[str] = None,
+                 static_url_path: str = '/static'):
+        """
+        初始化中间件
+
+        Args:
+            app: 被包装的 WSGI 应用
+            min_size: 小于此大小（字节）的响应不压缩
+            level: 压缩级别（1-9）
+            cache_entries: 压缩结果缓存的条数，0 表示不缓存
+            cache_bytes: 压缩结果缓存的总字节数上限
+            static_folder: 静态文件目录，提供时优先发送预先生成的 .gz 文件
+            static_url_path: 静态文件的 URL 前缀
+        """
+        self.app = app
+        self.min_size = min_size
+        self.level = level
+        self.cache = ResponseCache(cache_entries, cache_bytes)
+        self.static_folder = static_folder
+        self.static_prefix = static_url_path.rstrip('/') + '/'
+        self.stats = {'compressed': 0, 'bytes_in': 0, 'bytes_out': 0, 'precompressed': 0,
+                      'precompress_errors': 0}
+
+    def __call__(self, environ: Dict[str, Any], start_response):
+        encoding = negotiate_encoding(environ.get('HTTP_ACCEPT_ENCODING', ''))
+
+        if encoding == 'gzip' and self.static_folder and environ.get('REQUEST_METHOD') in ('GET', 'HEAD'):
+            path = environ.get('PATH_INFO', '')
+            if path.startswith(self.static_prefix):
+                response = self._precompressed(path[len(self.static_prefix):], environ)
+                if response is not None:
+                    self.stats['precompressed'] += 1
+                    return response(environ, start_response)
+
+        captured = {}
+        written = []
+
+        def capture(status, headers, exc_info=None):
+            captured['status'] = status
+            captured['headers'] = headers
+            captured['exc_info'] = exc_info
+            return written.append
+
+        app_iter = self.app(environ, capture)
+        status, headers = captured['status'], list(captured['headers'])
+        header_map = {name.lower(): value for name, value in headers}
+
+        if not is_compressible(header_map.get('content-type')):
+            start_response(status, headers, captured['exc_info'])
+            return self._prepend(written, app_iter)
+
+        # 响应内容随 Accept-Encoding 变化，无论本次是否压缩都要告知缓存
+        headers = _merge_vary(headers)
+        if (encoding is None or not status.startswith('200') or environ.get('REQUEST_METHOD') == 'HEAD'
+                or 'content-encoding' in header_map
+                or 'no-transform' in header_map.get('cache-control', '').lower()
+                or int(header_map.get('content-length') or self.min_size) < self.min_size):
+            start_response(status, headers, captured['exc_info'])
+            return self._prepend(written, app_iter)
+
+        try:
+            body = b''.join(written) + b''.join(app_iter)
+        finally:
+            if hasattr(app_iter, 'close'):
+                app_iter.close()
+
+        if len(body) < self.min_size:
+            start_response(status, headers, captured['exc_info'])
+            return [body]
+
+        etag = header_map.get('etag')
+        key = None
+        if etag and not etag.startswith('W/'):
+            key = (environ.get('PATH_INFO'), environ.get('QUERY_STRING'), etag, encoding)
+        data = self.cache.get(key) if key is not None else None
+        if data is None:
+            data = compress(body, encoding, self.level)
+            if key is not None:
+                self.cache.put(key, data)
+
+        self.stats['compressed'] += 1
+        self.stats['bytes_in'] += len(body)
+        self.stats['bytes_out'] += len(data)
+
+        headers = [(name, value) for name, value in headers if name.lower() not in ('content-length', 'etag')]
+        headers.append(('Content-Encoding', encoding))
+        headers.append(('Content-Length', str(len(data))))
+        if etag:
+            headers.append(('ETag', etag if etag.startswith('W/') else f"W/{etag}"))
+        start_response(status, headers, captured['exc_info'])
+        return [data]
+
+    @staticmethod
+    def _prepend(written: List[bytes], app_iter: Iterable[bytes]) -> Iterable[bytes]:
+        """把通过 write() 写出的数据放在响应体之前（很少用到，保持 WSGI 语义）"""
+        if not written:
+            return app_iter
+
+        def chained():
+            try:
+                yield from written
+                yield from app_iter
+            finally:
+                if hasattr(app_iter, 'close'):
+                    app_iter.close()
+        return chained()
+
+    def _precompressed(self, filename: str, environ: Dict[str, Any]):
+        """
+        查找与原文件同步的 .gz 文件
+
+        Args:
+            filename: 静态目录下的相对路径
+            environ: WSGI 环境
+
+        Returns:
+            发送 .gz 文件的响应，没有可用的 .gz 文件时为None
+        """
+        path = safe_join(self.static_folder, filename)
+        if path is None or filename.endswith('.gz'):
+            return None
+        try:
+            source = os.stat(path)
+            if os.stat(path + '.gz').st_mtime_ns != source.st_mtime_ns:
+                return None
+        except OSError:
+            return None
+
+        mimetype = mimetypes.guess_type(filename)[0] or 'application/octet-stream'
+        response = send_file(path + '.gz', environ, mimetype=mimetype)
+        response.headers['Content-Encoding'] = 'gzip'
+        response.vary.add('Accept-Encoding')
+        return response
+
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        获取压缩统计信息
+
+        Returns:
+            Dict: 压缩次数、压缩前后字节数、压缩比、预压缩文件发送次数、预压缩失败的文件数及缓存统计
+        """
+        return {
+            **self.stats,
+            "ratio": round(self.stats['bytes_out'] / self.stats['bytes_in'], 4) if self.stats['bytes_in'] else None,
+            "cache": self.cache.get_stats()
+        }
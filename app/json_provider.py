@@ -0,0 +1,111 @@
+"""
+JSON 响应
+替换 Flask 默认的 JSON 提供者：通过 app.models.serialization 选用 orjson、simplejson 或标准库，
+直接编码为 UTF-8 字节作为响应体；是否排序键、是否转义非 ASCII 字符由配置决定。
+"""
+
+import json
+from functools import partial
+from typing import Any, Callable, Optional
+from flask.json.provider import JSONProvider, DefaultJSONProvider
+from app.models import serialization
+
+
+class FastJSONProvider(JSONProvider):
+    """
+    基于 app.models.serialization 的 JSON 提供者
+
+    与 DefaultJSONProvider 的属性和行为一致：compact 为 None 时调试模式缩进输出、
+    否则紧凑输出；无法直接编码的对象（日期、UUID、dataclass 等）按默认提供者的规则转换。
+    """
+
+    default: Callable[[Any], Any] = staticmethod(DefaultJSONProvider.default)
+
+    ensure_ascii = True
+    sort_keys = True
+    compact: Optional[bool] = None
+    mimetype = 'application/json'
+
+    def __init__(self, app, backend: str = 'auto'):
+        """
+        初始化提供者
+
+        Args:
+            app: Flask 应用
+            backend: 编码后端，auto、orjson、simplejson 或 json
+
+        Raises:
+            ValueError: 不支持的后端名
+        """
+        super().__init__(app)
+        self.backend = serialization.available_backend(backend)
+        self._fragment = None
+
+    def _indent(self) -> bool:
+        """当前是否缩进输出"""
+        return self.compact is False or (self.compact is None and self._app.debug)
+
+    def dumps_bytes(self, obj: Any, indent: bool = False) -> bytes:
+        """
+        将对象编码为 JSON 字节
+
+        Args:
+            obj: 要编码的对象
+            indent: 是否缩进输出
+
+        Returns:
+            bytes: UTF-8 编码的 JSON
+        """
+        return serialization.dumps(obj, sort_keys=self.sort_keys, ensure_ascii=self.ensure_ascii,
+                                   indent=indent, default=self.default, backend=self.backend)
+
+    def dumps(self, obj: Any, **kwargs: Any) -> str:
+        """
+        将对象编码为 JSON 字符串
+
+        传入格式参数（indent、separators 等）时交给标准库处理，行为与默认提供者相同。
+        """
+        if kwargs:
+            kwargs.setdefault('default', self.default)
+            kwargs.setdefault('ensure_ascii', self.ensure_ascii)
+            kwargs.setdefault('sort_keys', self.sort_keys)
+            return json.dumps(obj, **kwargs)
+        return self.dumps_bytes(obj).decode('utf-8')
+
+    def loads(self, s: Any, **kwargs: Any) -> Any:
+        """解码 JSON 字符串或字节"""
+        if kwargs:
+            return json.loads(s, **kwargs)
+        return serialization.loads(s, backend=self.backend)
+
+    @property
+    def content_type(self) -> str:
+        """响应的 Content-Type"""
+        return f"{self.mimetype}; charset=utf-8"
+
+    def response(self, *args: Any, **kwargs: Any):
+        """
+        生成 JSON 响应（jsonify 调用此方法）
+
+        响应体直接由编码后的字节构成，末尾带换行，与默认提供者一致。
+        """
+        obj = self._prepare_response_obj(args, kwargs)
+        body = self.dumps_bytes(obj, indent=self._indent()) + b'\n'
+        return self._app.response_class(body, content_type=self.content_type)
+
+    @property
+    def fragment_encoder(self) -> Optional[Callable[[Any], bytes]]:
+        """
+        与紧凑响应编码方式一致的编码函数，用于拼接预先编码的 JSON 片段
+
+        同一组设置返回同一个函数对象，调用方可以用它判断缓存的片段是否仍然有效。
+        缩进输出时片段无法与响应拼接，返回 None。
+        """
+        if self._indent():
+            return None
+        key = (self.sort_keys, self.ensure_ascii, self.backend)
+        if self._fragment is None or self._fragment[0] != key:
+            encode = partial(serialization.dumps, sort_keys=self.sort_keys, ensure_ascii=self.ensure_ascii,
+                             default=self.default, backend=self.backend)
+            self._fragment = (key, encode)
+        return self._fragment[1]
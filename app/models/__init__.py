@@ -5,25 +5,95 @@
 
 import json
 import os
+import tempfile
+import threading
+from contextlib import contextmanager
 from datetime import datetime
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Callable, Optional, Set, Tuple, Iterator
 from .card import Card, validate_card_data
-import shutil
-
-
-class DataManager:
+from .transaction import CardTransaction
+from .index import CardIndex
+from .columns import CardColumns
+from .suggest import NameSuggester
+from .sidecar import IndexSidecar
+from .checksum import CONTENT_HASH_KEY, seal_document, verify_document
+from . import serialization
+from .journal import CardJournal
+from .filelock import FileLock
+from .backup import BackupEngine
+from .storage import StorageBackend, DataValidationError
+from .sqlite_store import SQLiteDataManager, is_sqlite_url
+from .memory_store import MemoryDataManager, is_memory_path
+
+
+# 加载校验模式：lenient 跳过无效卡片，strict 遇到无效卡片时拒绝加载
+VALIDATION_MODES = ('lenient', 'strict')
+
+
+class DataManager(StorageBackend):
     """数据管理器，负责JSON文件的读写操作"""
 
-    def __init__(self, data_path: str = './data/cards.json'):
+    def __init__(self, data_path: str = './data/cards.json', journal: bool = False,
+                 journal_max_bytes: int = 1024 * 1024, journal_max_records: int = 1000,
+                 backup: Dict[str, Any] = None, index_sidecar: bool = True,
+                 validation: str = 'lenient', pretty: bool = True):
         """
         初始化数据管理器
 
         Args:
             data_path: 数据文件路径
+            journal: 是否启用预写日志模式（变更追加到 cards.wal，定期合并回快照）
+            journal_max_bytes: 日志超过该字节数时触发后台合并
+            journal_max_records: 日志超过该记录数时触发后台合并
+            backup: 备份引擎选项（compression、keep_last、keep_hourly、keep_daily）
+            index_sidecar: 是否将构建好的索引持久化到 cards.idx，冷启动时直接加载
+            validation: 校验模式，lenient 跳过无效卡片，strict 遇到无效卡片时拒绝加载
+            pretty: 数据文件是否缩进输出，否则紧凑输出
+
+        Raises:
+            ValueError: 不支持的校验模式
         """
+        if validation not in VALIDATION_MODES:
+            raise ValueError(f"不支持的校验模式: {validation}")
+
         self.data_path = data_path
+        self.pretty = pretty
         self.backup_dir = os.path.join(os.path.dirname(data_path), 'backup')
+
+        # 预写日志：cards.json 作为检查点，cards.wal 保存检查点之后的变更
+        self.journal = CardJournal(os.path.splitext(data_path)[0] + '.wal') if journal else None
+        self.journal_max_bytes = journal_max_bytes
+        self.journal_max_records = journal_max_records
+        self.journal_stats = {'appends': 0, 'records': 0, 'compactions': 0, 'last_compaction': None}
+        self._compacting = False
+
+        # 进程内读缓存：保存解码、校验后的卡片索引（id、规范化名称、最大排序号），
+        # 以数据文件的 (mtime_ns, size, inode) 作为有效性标记；本进程的写入增量更新索引
+        self._cache_lock = threading.RLock()
+        self._cache_key: Optional[Tuple[int, int, int]] = None
+        self._cache_index: Optional[CardIndex] = None
+        self._cache_config: Dict[str, Any] = {}
+        # 日志模式下已消费的日志状态: (inode, size) 签名和字节偏移
+        self._cache_wal_key: Optional[Tuple[int, int]] = None
+        self._cache_wal_offset = 0
+        self.cache_stats = {'hits': 0, 'misses': 0, 'reloads': 0, 'wal_replays': 0}
+
+        # 索引文件：以数据文件内容摘要为键，摘要一致时跳过解析、校验和索引构建
+        self.sidecar = IndexSidecar(os.path.splitext(data_path)[0] + '.idx') if index_sidecar else None
+
+        # 加载校验：内容摘要与 config 中记录一致的文件由本程序写入，跳过逐卡校验
+        self.validation = validation
+        self.validation_stats = {'trusted_loads': 0, 'validated_loads': 0, 'invalid_cards': 0, 'invalid_total': 0}
+
+        # 写锁（进程内 + 跨进程），保证事务的"读取-修改-写入"不会交错，
+        # 多个 worker 进程可以共享同一个数据文件；读操作不加锁
+        self._write_lock = FileLock(data_path + '.lock')
+
         self._ensure_directories()
+
+        # 备份在后台线程中完成，不占用写请求的耗时
+        self.backup_engine = BackupEngine(self.backup_dir, **(backup or {}))
+
         self._init_data_file()
 
     def _ensure_directories(self):
@@ -39,21 +109,45 @@ class DataManager:
 
     def _init_data_file(self):
         """初始化数据文件"""
-        if not os.path.exists(self.data_path):
-            initial_data = {
-                "cards": [],
-                "config": {
-                    "last_updated": datetime.now().isoformat(),
-                    "total_cards": 0,
-                    "version": "1.0"
+        if os.path.exists(self.data_path):
+            return
+
+        with self._write_lock:
+            # 加锁后再检查一次，避免多个进程同时启动时互相覆盖
+            if not os.path.exists(self.data_path):
+                initial_data = {
+                    "cards": [],
+                    "config": {
+                        "last_updated": datetime.now().isoformat(),
+                        "total_cards": 0,
+                        "version": "1.0"
+                    }
                 }
-            }
-            self._write_json(initial_data)
+                self._write_json(initial_data)
 
-    def _read_json(self) -> Dict[str, Any]:
+    def _read_raw(self) -> bytes:
+        """
+        读取数据文件的原始内容
+
+        Returns:
+            bytes: 文件内容
+
+        Raises:
+            FileNotFoundError: 文件不存在
+        """
+        try:
+            with open(self.data_path, 'rb') as f:
+                return f.read()
+        except FileNotFoundError:
+            raise FileNotFoundError(f"数据文件不存在: {self.data_path}")
+
+    def _read_json(self, raw: bytes = None) -> Dict[str, Any]:
         """
         读取JSON数据文件
 
+        Args:
+            raw: 已读取的文件内容，为空时从磁盘读取
+
         Returns:
             Dict: JSON数据
 
@@ -61,17 +155,20 @@ class DataManager:
             FileNotFoundError: 文件不存在
             json.JSONDecodeError: JSON格式错误
         """
+        if raw is None:
+            raw = self._read_raw()
         try:
-            with open(self.data_path, 'r', encoding='utf-8') as f:
-                return json.load(f)
-        except FileNotFoundError:
-            raise FileNotFoundError(f"数据文件不存在: {self.data_path}")
+            return serialization.loads(raw)
         except json.JSONDecodeError as e:
-            raise json.JSONDecodeError(f"JSON格式错误: {e}")
+            raise json.JSONDecodeError(f"JSON格式错误: {e.msg}", e.doc, e.pos)
 
     def _write_json(self, data: Dict[str, Any]) -> bool:
         """
-        写入JSON数据到文件
+        原子地写入JSON数据到文件
+
+        先写入同目录下的临时文件并 fsync，再用 os.replace 替换原文件：
+        崩溃时原文件保持完整，读者只会看到旧文档或新文档，不会读到半个文档。
+        调用方需持有写锁。
 
         Args:
             data: 要写入的数据
@@ -79,40 +176,363 @@ class DataManager:
         Returns:
             bool: 是否写入成功
         """
+        tmp_path = None
         try:
             # 更新配置信息
             data['config']['last_updated'] = datetime.now().isoformat()
             data['config']['total_cards'] = len(data.get('cards', []))
 
-            # 写入文件
-            with open(self.data_path, 'w', encoding='utf-8') as f:
-                json.dump(data, f, ensure_ascii=False, indent=2)
+            data_dir = os.path.dirname(self.data_path) or '.'
+            fd, tmp_path = tempfile.mkstemp(prefix='.cards-', suffix='.tmp', dir=data_dir)
+
+            # 沿用原文件权限（mkstemp 默认为 0600）
+            try:
+                os.chmod(tmp_path, os.stat(self.data_path).st_mode & 0o777)
+            except FileNotFoundError:
+                os.chmod(tmp_path, 0o644)
+
+            with os.fdopen(fd, 'wb') as f:
+                f.write(seal_document(data, pretty=self.pretty))
+                f.flush()
+                os.fsync(f.fileno())
+
+            os.replace(tmp_path, self.data_path)
+            tmp_path = None
+            self._fsync_directory(data_dir)
             return True
         except Exception as e:
             print(f"写入数据失败: {e}")
             return False
+        finally:
+            if tmp_path and os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            # 无论写入成功与否，文件内容都可能已变化
+            self.invalidate_cache()
+
+    @staticmethod
+    def _fsync_directory(directory: str):
+        """
+        刷新目录项，确保 os.replace 的结果在断电后依然有效
+
+        Args:
+            directory: 目录路径
+        """
+        if not hasattr(os, 'O_DIRECTORY'):
+            return
+        try:
+            dir_fd = os.open(directory, os.O_RDONLY | os.O_DIRECTORY)
+        except OSError:
+            return
+        try:
+            os.fsync(dir_fd)
+        except OSError:
+            pass
+        finally:
+            os.close(dir_fd)
+
+    def _file_signature(self) -> Optional[Tuple[int, int, int]]:
+        """
+        获取数据文件的状态签名
+
+        Returns:
+            Optional[Tuple[int, int, int]]: (mtime_ns, size, inode)，文件不存在时为None
+        """
+        try:
+            st = os.stat(self.data_path)
+        except OSError:
+            return None
+        return st.st_mtime_ns, st.st_size, st.st_ino
+
+    def _load_snapshot(self) -> Tuple[CardIndex, Dict[str, Any]]:
+        """
+        获取缓存的卡片索引和配置块，文件状态变化时重新加载
+
+        编辑器通常以"写临时文件再重命名"的方式保存，inode 会变化；
+        原地重写则会改变 mtime_ns 或 size，因此两种情况都能被检测到。
+        日志模式下快照未变而日志增长时，只读取并应用新增的日志记录。
+
+        返回的索引会被本进程后续的写入原地更新，读取其内容时需持有 _cache_lock。
+
+        Returns:
+            Tuple[CardIndex, Dict]: (卡片索引, 配置信息，generation 为包含日志后的代数)
+
+        Raises:
+            FileNotFoundError: 文件不存在
+            json.JSONDecodeError: JSON格式错误
+            DataValidationError: 严格校验模式下存在无效卡片（读取接口不吞掉此异常）
+        """
+        with self._cache_lock:
+            # 先取签名再读文件：读取期间若文件被改写，下次签名必然不同，只会多一次重载
+            signature = self._file_signature()
+            wal_key = self.journal.signature() if self.journal else None
+
+            if self._cache_index is not None and signature == self._cache_key:
+                if wal_key == self._cache_wal_key:
+                    self.cache_stats['hits'] += 1
+                    return self._cache_index, self._cache_config
+
+                # 同一个日志文件只是变长了：增量回放新记录
+                if (wal_key and self._cache_wal_key and wal_key[0] == self._cache_wal_key[0]
+                        and wal_key[1] >= self._cache_wal_offset):
+                    self.cache_stats['wal_replays'] += 1
+                    records, self._cache_wal_offset = self.journal.read(self._cache_wal_offset)
+                    self._apply_journal(records)
+                    self._cache_wal_key = wal_key
+                    return self._cache_index, self._cache_config
+
+            self.cache_stats['misses'] += 1
+            if self._cache_index is not None:
+                self.cache_stats['reloads'] += 1
+
+            index, config = self._build_index(self._read_raw())
+
+            self._cache_key = signature
+            self._cache_index = index
+            self._cache_config = config
+            self._cache_wal_key = wal_key
+            self._cache_wal_offset = 0
+            self.journal_stats['records'] = 0
+
+            if self.journal:
+                records, self._cache_wal_offset = self.journal.read(0)
+                self._apply_journal(records)
+
+            return self._cache_index, self._cache_config
+
+    def _build_index(self, raw: bytes) -> Tuple[CardIndex, Dict[str, Any]]:
+        """
+        从数据文件内容构建卡片索引，优先加载摘要匹配的索引文件
+
+        文件内容摘要与 config 中记录的一致时，说明文件由本程序写入后未被修改，
+        直接构建卡片对象；否则（旧文件或被外部编辑）逐卡校验。
+
+        Args:
+            raw: 数据文件内容
+
+        Returns:
+            Tuple[CardIndex, Dict]: (卡片索引, 配置信息)
+
+        Raises:
+            json.JSONDecodeError: JSON格式错误
+            DataValidationError: 严格校验模式下存在无效卡片
+        """
+        checksum, trusted = verify_document(raw)
+        if self.sidecar:
+            loaded = self.sidecar.load(checksum)
+            if loaded is not None:
+                index, config, meta = loaded
+                self._record_validation(meta.get('invalid_cards', 0), meta.get('trusted', False))
+                return index, config
+
+        data = self._read_json(raw)
+        index = CardIndex()
+        invalid = 0
+
+        if trusted:
+            for card_data in data.get('cards', []):
+                index.put(Card.from_dict(card_data))
+        else:
+            for card_data in data.get('cards', []):
+                if validate_card_data(card_data):
+                    index.put(Card.from_dict(card_data))
+                else:
+                    invalid += 1
+
+        config = dict(data.get('config', {}))
+        config.setdefault('generation', 0)
+
+        self._record_validation(invalid, trusted)
+        if self.sidecar:
+            self.sidecar.save(checksum, index, config, {'invalid_cards': invalid, 'trusted': trusted})
+        return index, config
+
+    def _record_validation(self, invalid: int, trusted: bool):
+        """
+        记录一次加载的校验结果
+
+        Args:
+            invalid: 被跳过的无效卡片数量
+            trusted: 是否因摘要一致而跳过了逐卡校验
+
+        Raises:
+            DataValidationError: 严格校验模式下存在无效卡片
+        """
+        self.validation_stats['trusted_loads' if trusted else 'validated_loads'] += 1
+        self.validation_stats['invalid_cards'] = invalid
+        self.validation_stats['invalid_total'] += invalid
+
+        # 宽松模式下跳过的数量只记入统计（get_validation_stats），不逐次输出
+        if invalid and self.validation == 'strict':
+            raise DataValidationError(f"数据文件中有 {invalid} 张无效的卡片（严格校验模式）")
+
+    def _apply_journal(self, records: List[Dict[str, Any]]):
+        """
+        将日志记录增量应用到缓存的卡片索引上
+
+        只应用代数大于快照代数的记录，因此合并过程中崩溃后重复回放也是安全的。
+
+        Args:
+            records: 日志记录列表
+
+        Raises:
+            DataValidationError: 严格校验模式下存在无效的日志记录
+        """
+        snapshot_generation = self._cache_config.get('snapshot_generation',
+                                                     self._cache_config.get('generation', 0))
+        self._cache_config['snapshot_generation'] = snapshot_generation
+
+        for record in records:
+            self.journal_stats['records'] += 1
+            generation = record.get('generation', 0)
+            if generation <= snapshot_generation:
+                continue
+
+            card_data = record.get('card') or {}
+            if record.get('op') == 'delete':
+                self._cache_index.remove(card_data.get('id'))
+            elif validate_card_data(card_data):
+                self._cache_index.put(Card.from_dict(card_data))
+            elif self.validation == 'strict':
+                raise DataValidationError(f"日志中有无效的卡片记录（严格校验模式）: {record}")
+            else:
+                self.validation_stats['invalid_total'] += 1
+
+            self._cache_config['generation'] = max(self._cache_config['generation'], generation)
+            if record.get('time'):
+                self._cache_config['last_updated'] = record['time']
+
+        self._cache_config['total_cards'] = len(self._cache_index)
+
+    def _adopt_commit(self, base: CardIndex, changes: List[Tuple[str, Card]], config: Dict[str, Any]):
+        """
+        快照写入成功后，把本次事务的净变更增量应用到缓存索引，避免下次读取时整体重建
+
+        调用方需持有写锁：此时没有其他写者，刚写入的文件签名就是本次写入的结果。
+        索引文件同时按新文件的内容摘要重新保存，其他进程（及重启后）冷启动时仍可直接加载。
+
+        Args:
+            base: 事务开始时的缓存索引
+            changes: 事务的净变更
+            config: 写入文件的配置块（含 seal_document 写入的内容摘要）
+        """
+        with self._cache_lock:
+            base.apply(changes)
+            self._cache_index = base
+            self._cache_config = dict(config)
+            self._cache_key = self._file_signature()
+            self._cache_wal_key = self.journal.signature() if self.journal else None
+            self._cache_wal_offset = 0
+
+            if self.sidecar:
+                # 本程序写入的文件摘要必然一致，卡片都已通过校验
+                self.sidecar.save(config[CONTENT_HASH_KEY], base, self._cache_config,
+                                  {'invalid_cards': 0, 'trusted': True})
+
+    def invalidate_cache(self):
+        """使读缓存失效，下次读取时重新加载数据文件"""
+        with self._cache_lock:
+            self._cache_key = None
+            self._cache_index = None
+            self._cache_config = {}
+            self._cache_wal_key = None
+            self._cache_wal_offset = 0
+
+    def get_cache_stats(self) -> Dict[str, Any]:
+        """
+        获取读缓存统计信息
+
+        Returns:
+            Dict: 命中、未命中、重载次数及当前缓存的卡片数量
+        """
+        with self._cache_lock:
+            lookups = self.cache_stats['hits'] + self.cache_stats['misses']
+            return {
+                **self.cache_stats,
+                "hit_ratio": round(self.cache_stats['hits'] / lookups, 4) if lookups else 0.0,
+                "cached_cards": len(self._cache_index) if self._cache_index is not None else 0
+            }
+
+    def get_validation_stats(self) -> Dict[str, Any]:
+        """
+        获取加载校验统计信息
+
+        Returns:
+            Dict: 校验模式、免校验/逐卡校验的加载次数、最近一次及累计跳过的无效卡片数
+        """
+        return {
+            "mode": self.validation,
+            "trusted_loads": self.validation_stats['trusted_loads'],
+            "validated_loads": self.validation_stats['validated_loads'],
+            "invalid_cards": self.validation_stats['invalid_cards'],
+            "invalid_total": self.validation_stats['invalid_total']
+        }
+
+    def get_journal_stats(self) -> Dict[str, Any]:
+        """
+        获取预写日志统计信息
+
+        Returns:
+            Dict: 是否启用、日志大小、记录数、合并次数等
+        """
+        if not self.journal:
+            return {"enabled": False}
+
+        wal_key = self.journal.signature()
+        return {
+            "enabled": True,
+            "size": wal_key[1] if wal_key else 0,
+            "max_bytes": self.journal_max_bytes,
+            "max_records": self.journal_max_records,
+            **self.journal_stats
+        }
 
     def backup_data(self) -> bool:
         """
-        备份当前数据文件
+        将当前数据文件提交给后台备份引擎
+
+        这里只打开文件：之后的写入会用 os.replace 替换成新文件，
+        已打开的文件对象仍指向旧内容，备份线程读取到的就是本次修改前的数据。
 
         Returns:
-            bool: 备份是否成功
+            bool: 是否已提交备份
         """
-        if not os.path.exists(self.data_path):
+        try:
+            source = open(self.data_path, 'rb')
+        except FileNotFoundError:
             return False
 
         try:
-            timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
-            backup_filename = f"cards_backup_{timestamp}.json"
-            backup_path = os.path.join(self.backup_dir, backup_filename)
-            shutil.copy2(self.data_path, backup_path)
-            print(f"数据已备份到: {backup_path}")
-            return True
+            return self.backup_engine.submit(source)
         except Exception as e:
+            source.close()
             print(f"备份失败: {e}")
             return False
 
+    def _query(self, read: Callable[[CardIndex, Dict[str, Any]], Any], fallback: Callable[[], Any],
+               action: str) -> Any:
+        """
+        在缓存的卡片索引上执行只读查询
+
+        数据文件无法读取或解析时打印错误并返回默认值；严格校验失败（DataValidationError）继续抛出，
+        不把有问题的数据当作空数据返回。
+
+        Args:
+            read: 查询函数，接收 (卡片索引, 配置信息)，在 _cache_lock 内调用
+            fallback: 查询失败时生成默认值的函数
+            action: 错误提示中的操作名称
+
+        Returns:
+            查询结果或默认值
+        """
+        try:
+            with self._cache_lock:
+                return read(*self._load_snapshot())
+        except DataValidationError:
+            raise
+        except Exception as e:
+            print(f"{action}失败: {e}")
+            return fallback()
+
     def load_cards(self) -> List[Card]:
         """
         加载所有卡片
@@ -120,23 +540,66 @@ class DataManager:
         Returns:
             List[Card]: 卡片列表
         """
-        try:
-            data = self._read_json()
-            cards = []
+        # 返回浅拷贝，调用方增删列表元素不会污染缓存
+        return self._query(lambda index, _: list(index.sorted_cards()), list, "加载卡片")
 
-            for card_data in data.get('cards', []):
-                if validate_card_data(card_data):
-                    cards.append(Card.from_dict(card_data))
-                else:
-                    print(f"跳过无效的卡片数据: {card_data}")
+    @contextmanager
+    def transaction(self) -> Iterator[CardTransaction]:
+        """
+        卡片事务上下文管理器
 
-            # 按order字段排序
-            cards.sort(key=lambda x: x.order)
-            return cards
+        进入时读取一次数据（缓存有效时不解析文件），在叠加于缓存索引之上的
+        工作集中完成查询与修改；正常退出且有变更时只写入一次，发生异常时不写入。
+        写入成功后把净变更增量应用到缓存索引，无需重新解析刚写入的文件。
+        提交结果记录在 ``tx.committed`` 上。
 
-        except Exception as e:
-            print(f"加载卡片失败: {e}")
-            return []
+        用法:
+            with data_manager.transaction() as tx:
+                tx.put(card)
+            if tx.committed: ...
+
+        Yields:
+            CardTransaction: 事务工作集
+
+        Raises:
+            FileNotFoundError: 文件不存在
+            json.JSONDecodeError: JSON格式错误
+        """
+        with self._write_lock:
+            index, config = self._load_snapshot()
+            tx = CardTransaction(index)
+
+            yield tx
+
+            if not tx.dirty:
+                tx.committed = True
+                return
+
+            generation = config.get('generation', 0) + 1
+
+            if self.journal:
+                # 日志模式：只追加本次事务的净变更
+                timestamp = datetime.now().isoformat()
+                records = [
+                    {'op': op, 'card': card.to_dict(), 'generation': generation, 'time': timestamp}
+                    for op, card in tx.net_changes()
+                ]
+                self.journal.append(records)
+                self.journal_stats['appends'] += 1
+                tx.committed = True
+                self._maybe_compact()
+                return
+
+            # 备份现有数据
+            self.backup_data()
+
+            data = {
+                'cards': [card.to_dict() for card in tx.cards()],
+                'config': self._snapshot_config(config, generation)
+            }
+            tx.committed = self._write_json(data)
+            if tx.committed:
+                self._adopt_commit(index, tx.net_changes(), data['config'])
 
     def save_cards(self, cards: List[Card]) -> bool:
         """
@@ -149,23 +612,169 @@ class DataManager:
             bool: 是否保存成功
         """
         try:
-            # 备份现有数据
-            self.backup_data()
+            with self._write_lock:
+                # 备份现有数据
+                self.backup_data()
+
+                # 读取现有配置（缓存有效时不重新解析文件）
+                try:
+                    _, config = self._load_snapshot()
+                except Exception:
+                    config = {}
+
+                data = {
+                    'cards': [card.to_dict() for card in cards],
+                    'config': self._snapshot_config(config, config.get('generation', 0) + 1)
+                }
 
-            # 读取现有配置
-            try:
-                data = self._read_json()
-            except:
-                data = {"config": {"version": "1.0"}}
+                # 整体保存相当于一次检查点，之前的日志不再需要
+                success = self._write_json(data)
+                if success:
+                    if self.journal:
+                        self.journal.reset()
+                    self._adopt_commit(CardIndex(cards), [], data['config'])
+                return success
 
-            # 更新卡片数据
-            data['cards'] = [card.to_dict() for card in cards]
+        except Exception as e:
+            print(f"保存卡片失败: {e}")
+            return False
+
+    @staticmethod
+    def _snapshot_config(config: Dict[str, Any], generation: int) -> Dict[str, Any]:
+        """
+        生成写入快照的配置块
+
+        Args:
+            config: 当前配置信息
+            generation: 快照对应的代数
+
+        Returns:
+            Dict: 配置块
+        """
+        snapshot_config = {k: v for k, v in config.items() if k != 'snapshot_generation'}
+        snapshot_config.setdefault('version', '1.0')
+        snapshot_config['generation'] = generation
+        return snapshot_config
+
+    def _maybe_compact(self):
+        """日志超过阈值时在后台线程中合并"""
+        if self._compacting:
+            return
+
+        # 先增量回放本次追加的记录，顺便刷新记录数
+        self._load_snapshot()
+        wal_key = self.journal.signature()
+        wal_size = wal_key[1] if wal_key else 0
+
+        if wal_size >= self.journal_max_bytes or self.journal_stats['records'] >= self.journal_max_records:
+            self._compacting = True
+            threading.Thread(target=self.compact, name='cards-wal-compactor', daemon=True).start()
+
+    def compact(self) -> bool:
+        """
+        将日志合并为新的快照并清空日志
 
-            return self._write_json(data)
+        先写快照再清空日志；两步之间崩溃时，快照代数已覆盖日志中的记录，
+        重新回放会跳过这些记录。
 
+        Returns:
+            bool: 是否合并成功
+        """
+        if not self.journal:
+            return False
+
+        try:
+            with self._write_lock:
+                index, config = self._load_snapshot()
+                if not self.journal_stats['records']:
+                    return True
+
+                # 备份被替换的旧快照
+                self.backup_data()
+
+                data = {
+                    'cards': [card.to_dict() for card in index.sorted_cards()],
+                    'config': self._snapshot_config(config, config.get('generation', 0))
+                }
+                if not self._write_json(data):
+                    return False
+
+                self.journal.reset()
+                # 合并后的快照就是当前索引的内容，直接沿用，不必重新解析
+                self._adopt_commit(index, [], data['config'])
+                self.journal_stats['records'] = 0
+                self.journal_stats['compactions'] += 1
+                self.journal_stats['last_compaction'] = datetime.now().isoformat()
+                return True
         except Exception as e:
-            print(f"保存卡片失败: {e}")
+            print(f"合并日志失败: {e}")
             return False
+        finally:
+            self._compacting = False
+
+    def generation(self) -> Optional[str]:
+        """
+        获取数据版本标识
+
+        由写入代数（含日志）和数据文件签名组成：本程序的写入使代数增加，
+        外部编辑使文件签名变化。只读取文件状态，缓存有效时不解析文件。
+
+        Returns:
+            Optional[str]: 版本标识，数据文件无法加载时为None
+        """
+        def read(_, config):
+            mtime_ns, size, inode = self._cache_key
+            return f"{config.get('generation', 0)}:{mtime_ns}:{size}:{inode}"
+
+        return self._query(read, lambda: None, "加载卡片")
+
+    def last_updated(self) -> Optional[str]:
+        """
+        获取最后修改时间（配置块中的 last_updated，含日志中的写入）
+
+        Returns:
+            Optional[str]: ISO 格式的本地时间，数据文件无法加载时为None
+        """
+        return self._query(lambda _, config: config.get('last_updated'), lambda: None, "加载卡片")
+
+    def count_cards(self) -> int:
+        """
+        获取卡片数量（缓存的索引大小，缓存有效时不解析文件）
+
+        Returns:
+            int: 卡片数量，数据文件无法加载时为0
+        """
+        return self._query(lambda index, _: len(index), int, "加载卡片")
+
+    def columns(self) -> CardColumns:
+        """
+        获取列式快照（缓存到下次变更）
+
+        Returns:
+            CardColumns: 列式快照
+        """
+        return self._query(lambda index, _: index.columns(), lambda: CardColumns([]), "加载卡片")
+
+    def suggester(self) -> NameSuggester:
+        """
+        获取名称联想快照（缓存到下次变更）
+
+        Returns:
+            NameSuggester: 名称联想快照
+        """
+        return self._query(lambda index, _: index.suggester(), lambda: NameSuggester([]), "加载卡片")
+
+    def search_candidates(self, query: str) -> Optional[Set[str]]:
+        """
+        获取可能包含搜索关键词的卡片ID（倒排索引）
+
+        Args:
+            query: 搜索关键词
+
+        Returns:
+            Optional[Set[str]]: 候选卡片ID集合，无法使用索引时为None
+        """
+        return self._query(lambda index, _: index.search_candidates(query), lambda: None, "搜索卡片")
 
     def get_card_by_id(self, card_id: str) -> Optional[Card]:
         """
@@ -177,15 +786,11 @@ class DataManager:
         Returns:
             Optional[Card]: 找到的卡片或None
         """
-        cards = self.load_cards()
-        for card in cards:
-            if card.id == card_id:
-                return card
-        return None
+        return self._query(lambda index, _: index.get(card_id), lambda: None, "获取卡片")
 
     def card_name_exists(self, name: str, exclude_id: str = None) -> bool:
         """
-        检查卡片名称是否已存在
+        检查卡片名称是否已存在（按规范化名称比较，忽略大小写与全半角差异）
 
         Args:
             name: 要检查的名称
@@ -194,11 +799,7 @@ class DataManager:
         Returns:
             bool: 名称是否已存在
         """
-        cards = self.load_cards()
-        for card in cards:
-            if card.name == name and card.id != exclude_id:
-                return True
-        return False
+        return self._query(lambda index, _: index.name_exists(name, exclude_id), bool, "检查卡片名称")
 
     def get_next_order(self) -> int:
         """
@@ -207,10 +808,7 @@ class DataManager:
         Returns:
             int: 下一个可用的排序号
         """
-        cards = self.load_cards()
-        if not cards:
-            return 1
-        return max(card.order for card in cards) + 1
+        return self._query(lambda index, _: index.next_order(), lambda: 1, "获取排序号")
 
     def get_stats(self) -> Dict[str, Any]:
         """
@@ -219,21 +817,52 @@ class DataManager:
         Returns:
             Dict: 统计信息
         """
-        try:
-            data = self._read_json()
-            cards = self.load_cards()
-
+        def read(index, config):
             return {
-                "total_cards": len(cards),
-                "last_updated": data.get('config', {}).get('last_updated'),
-                "version": data.get('config', {}).get('version', '1.0'),
-                "data_file_size": os.path.getsize(self.data_path) if os.path.exists(self.data_path) else 0
+                "total_cards": len(index),
+                "last_updated": config.get('last_updated'),
+                "version": config.get('version', '1.0'),
+                "data_file_size": os.path.getsize(self.data_path) if os.path.exists(self.data_path) else 0,
+                "storage": "json",
+                "generation": config.get('generation', 0),
+                "cache": self.get_cache_stats(),
+                "journal": self.get_journal_stats(),
+                "write_lock": self._write_lock.get_stats(),
+                "backup": self.backup_engine.get_stats(),
+                "index_sidecar": self.sidecar.get_stats() if self.sidecar else None,
+                "validation": self.get_validation_stats()
             }
-        except Exception as e:
-            print(f"获取统计信息失败: {e}")
-            return {
-                "total_cards": 0,
-                "last_updated": None,
-                "version": "1.0",
-                "data_file_size": 0
-            }
\ No newline at end of file
+
+        return self._query(read, lambda: {
+            "total_cards": 0,
+            "last_updated": None,
+            "version": "1.0",
+            "data_file_size": 0,
+            "storage": "json"
+        }, "获取统计信息")
+
+
+def create_data_manager(data_path: str = './data/cards.json', **options) -> StorageBackend:
+    """
+    根据数据路径创建对应的存储后端
+
+    Args:
+        data_path: 数据路径，:memory: 使用内存存储，sqlite:/// 开头时使用 SQLite，否则使用 JSON 文件
+        **options: 存储选项。columnar 适用于所有后端；其余为 JSON 存储选项
+            （journal、journal_max_bytes、journal_max_records、backup、index_sidecar、validation、pretty）
+
+    Returns:
+        StorageBackend: 存储后端实例
+    """
+    columnar = options.pop('columnar', True)
+
+    if is_memory_path(data_path):
+        manager = MemoryDataManager(data_path)
+    elif is_sqlite_url(data_path):
+        # SQLite 自带 WAL，不使用 JSON 存储的日志选项
+        manager = SQLiteDataManager(data_path)
+    else:
+        manager = DataManager(data_path, **options)
+
+    manager.columnar = columnar
+    return manager
@@ -0,0 +1,354 @@
+"""
+备份引擎
+在后台线程中生成按内容寻址、压缩存储的数据快照，并按保留策略自动清理
+"""
+
+import atexit
+import gzip
+import hashlib
+import json
+import lzma
+import os
+import queue
+import tempfile
+import threading
+import time
+from datetime import datetime
+from typing import List, Dict, Any, Optional, BinaryIO
+from .filelock import FileLock
+
+# 每次保存都会变化、不代表卡片内容的配置字段，计算快照摘要时去掉
+VOLATILE_CONFIG_KEYS = ('last_updated', 'generation', 'content_hash')
+
+# 支持的压缩方式: 名称 -> (文件后缀, 压缩函数, 解压函数)
+COMPRESSORS = {
+    'gzip': ('.gz', lambda raw: gzip.compress(raw, compresslevel=6), gzip.decompress),
+    'lzma': ('.xz', lzma.compress, lzma.decompress),
+}
+
+
+def content_digest(raw: bytes) -> str:
+    """
+    计算快照的内容摘要
+
+    去掉配置块中每次保存都会变化的字段（修改时间、写入代数、文件摘要）后按规范形式计算，
+    卡片内容相同的两次保存得到相同的摘要；无法解析的文件按原始字节计算。
+
+    Args:
+        raw: 数据文件内容
+
+    Returns:
+        str: sha256 十六进制摘要
+    """
+    try:
+        data = json.loads(raw)
+    except ValueError:
+        return hashlib.sha256(raw).hexdigest()
+
+    if isinstance(data, dict) and isinstance(data.get('config'), dict):
+        data['config'] = {key: value for key, value in data['config'].items()
+                          if key not in VOLATILE_CONFIG_KEYS}
+    canonical = json.dumps(data, sort_keys=True, ensure_ascii=False, separators=(',', ':'))
+    return hashlib.sha256(canonical.encode('utf-8')).hexdigest()
+
+
+class BackupEngine:
+    """
+    异步备份引擎
+
+    目录结构:
+        backup/objects/<sha256>.json.gz   按内容寻址的快照对象，卡片内容相同的快照只存一份
+                                          （摘要见 content_digest，不含修改时间等每次保存都变化的字段）
+        backup/manifest.json              快照时间线 [{time, timestamp, hash, object, size, stored_size}, ...]
+
+    保留策略（满足任一条件即保留）:
+        - 最近 keep_last 个快照
+        - 最近 keep_hourly 小时内每小时最新的一个
+        - 最近 keep_daily 天内每天最新的一个
+
+    备份时机（由 DataManager 提交）: 直接写入时每次保存前备份将被替换的文件；
+    预写日志模式下变更只追加到日志，只在合并日志时备份被替换的快照，
+    两次合并之间的单次修改不会各自生成快照。
+    """
+
+    def __init__(self, backup_dir: str, compression: str = 'gzip', keep_last: int = 20,
+                 keep_hourly: int = 24, keep_daily: int = 30, max_pending: int = 32):
+        """
+        初始化备份引擎
+
+        Args:
+            backup_dir: 备份目录
+            compression: 压缩方式，gzip 或 lzma
+            keep_last: 始终保留的最近快照数量
+            keep_hourly: 按小时保留的时长（小时）
+            keep_daily: 按天保留的时长（天）
+            max_pending: 排队等待处理的快照上限，超出时丢弃新的备份请求
+        """
+        if compression not in COMPRESSORS:
+            raise ValueError(f"不支持的压缩方式: {compression}")
+
+        self.backup_dir = backup_dir
+        self.objects_dir = os.path.join(backup_dir, 'objects')
+        self.manifest_path = os.path.join(backup_dir, 'manifest.json')
+        self.compression = compression
+        self.keep_last = keep_last
+        self.keep_hourly = keep_hourly
+        self.keep_daily = keep_daily
+
+        os.makedirs(self.objects_dir, exist_ok=True)
+
+        # 多个进程共享备份目录时串行化清单的读写
+        self._manifest_lock = FileLock(os.path.join(backup_dir, 'manifest.lock'))
+        self._queue: queue.Queue = queue.Queue(maxsize=max_pending)
+        self._worker: Optional[threading.Thread] = None
+        self._worker_lock = threading.Lock()
+
+        self.stats = {
+            'snapshots_taken': 0,
+            'dedup_hits': 0,
+            'dropped': 0,
+            'errors': 0,
+            'pruned': 0,
+            'bytes_in': 0,
+            'bytes_saved': 0,
+            'bytes_stored': 0,
+            'total_duration_ms': 0.0,
+            'last_duration_ms': 0.0,
+            'last_backup': None
+        }
+
+        atexit.register(self.flush, 10)
+
+    def submit(self, source: BinaryIO) -> bool:
+        """
+        提交一个待备份的数据文件
+
+        调用方传入已打开的文件对象后立即返回，引擎负责读取并关闭它。
+        由于数据文件以 os.replace 整体替换，已打开的文件对象始终指向提交时的内容。
+
+        Args:
+            source: 以二进制模式打开的数据文件
+
+        Returns:
+            bool: 是否已加入队列
+        """
+        self._ensure_worker()
+        try:
+            self._queue.put_nowait(source)
+            return True
+        except queue.Full:
+            source.close()
+            self.stats['dropped'] += 1
+            print("备份队列已满，跳过本次备份")
+            return False
+
+    def flush(self, timeout: float = None) -> bool:
+        """
+        等待队列中的备份全部完成
+
+        Args:
+            timeout: 最长等待秒数，None 表示一直等待
+
+        Returns:
+            bool: 是否在超时前完成
+        """
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while self._queue.unfinished_tasks:
+            if deadline is not None and time.monotonic() >= deadline:
+                return False
+            time.sleep(0.01)
+        return True
+
+    def _ensure_worker(self):
+        """按需启动后台工作线程"""
+        with self._worker_lock:
+            if self._worker is None or not self._worker.is_alive():
+                self._worker = threading.Thread(target=self._run, name='cards-backup', daemon=True)
+                self._worker.start()
+
+    def _run(self):
+        """后台工作线程主循环"""
+        while True:
+            source = self._queue.get()
+            try:
+                self._backup(source.read())
+            except Exception as e:
+                self.stats['errors'] += 1
+                print(f"备份失败: {e}")
+            finally:
+                source.close()
+                self._queue.task_done()
+
+    def _backup(self, raw: bytes):
+        """
+        存储一个快照并执行保留策略
+
+        Args:
+            raw: 数据文件内容
+        """
+        start = time.perf_counter()
+        digest = content_digest(raw)
+        object_path = self._object_path(digest)
+
+        with self._manifest_lock:
+            snapshots = self._read_manifest()
+
+            if os.path.exists(object_path):
+                self.stats['dedup_hits'] += 1
+                self.stats['bytes_saved'] += len(raw)
+            else:
+                compressed = COMPRESSORS[self.compression][1](raw)
+                self._atomic_write(object_path, compressed)
+                self.stats['bytes_saved'] += len(raw) - len(compressed)
+
+            # 与最近一个快照内容相同时不再追加时间线记录
+            if not snapshots or snapshots[-1]['hash'] != digest:
+                now = time.time()
+                snapshots.append({
+                    'time': datetime.fromtimestamp(now).isoformat(),
+                    'timestamp': now,
+                    'hash': digest,
+                    'object': os.path.basename(object_path),
+                    'size': len(raw),
+                    'stored_size': os.path.getsize(object_path)
+                })
+
+            snapshots = self._apply_retention(snapshots)
+            self._write_manifest(snapshots)
+
+        duration_ms = (time.perf_counter() - start) * 1000
+        self.stats['snapshots_taken'] += 1
+        self.stats['bytes_in'] += len(raw)
+        self.stats['bytes_stored'] = sum(
+            os.path.getsize(os.path.join(self.objects_dir, name)) for name in os.listdir(self.objects_dir)
+        )
+        self.stats['total_duration_ms'] += duration_ms
+        self.stats['last_duration_ms'] = duration_ms
+        self.stats['last_backup'] = datetime.now().isoformat()
+
+    def _object_path(self, digest: str) -> str:
+        """获取快照对象的存储路径"""
+        suffix = COMPRESSORS[self.compression][0]
+        return os.path.join(self.objects_dir, f"{digest}.json{suffix}")
+
+    def _apply_retention(self, snapshots: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """
+        按保留策略筛选快照，并删除不再被引用的快照对象
+
+        Args:
+            snapshots: 按时间排序的快照列表
+
+        Returns:
+            List[Dict]: 保留下来的快照列表
+        """
+        now = time.time()
+        keep = set(range(max(0, len(snapshots) - self.keep_last), len(snapshots)))
+        hourly, daily = {}, {}
+
+        for i, snapshot in enumerate(snapshots):
+            age = now - snapshot['timestamp']
+            if age <= self.keep_hourly * 3600:
+                hourly[int(snapshot['timestamp'] // 3600)] = i
+            if age <= self.keep_daily * 86400:
+                daily[snapshot['time'][:10]] = i
+
+        keep.update(hourly.values())
+        keep.update(daily.values())
+
+        retained = [snapshot for i, snapshot in enumerate(snapshots) if i in keep]
+        self.stats['pruned'] += len(snapshots) - len(retained)
+
+        # 清理未被引用的快照对象（临时文件以 . 开头，跳过）
+        referenced = {snapshot['object'] for snapshot in retained}
+        for name in os.listdir(self.objects_dir):
+            if name not in referenced and not name.startswith('.'):
+                os.remove(os.path.join(self.objects_dir, name))
+
+        return retained
+
+    def _read_manifest(self) -> List[Dict[str, Any]]:
+        """读取快照清单"""
+        try:
+            with open(self.manifest_path, 'r', encoding='utf-8') as f:
+                return json.load(f).get('snapshots', [])
+        except (FileNotFoundError, ValueError):
+            return []
+
+    def _write_manifest(self, snapshots: List[Dict[str, Any]]):
+        """原子地写入快照清单"""
+        payload = json.dumps({'compression': self.compression, 'snapshots': snapshots},
+                             ensure_ascii=False, indent=2)
+        self._atomic_write(self.manifest_path, payload.encode('utf-8'))
+
+    def _atomic_write(self, path: str, payload: bytes):
+        """写入临时文件后替换目标文件"""
+        fd, tmp_path = tempfile.mkstemp(prefix='.backup-', suffix='.tmp', dir=os.path.dirname(path))
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                f.write(payload)
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(tmp_path, path)
+        except Exception:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
+
+    def list_snapshots(self) -> List[Dict[str, Any]]:
+        """
+        获取当前保留的快照列表
+
+        Returns:
+            List[Dict]: 快照列表，按时间排序
+        """
+        return self._read_manifest()
+
+    def read_snapshot(self, digest: str) -> bytes:
+        """
+        读取并解压指定快照的内容
+
+        Args:
+            digest: 快照的内容摘要（见 content_digest）
+
+        Returns:
+            bytes: 原始数据文件内容
+
+        Raises:
+            FileNotFoundError: 快照不存在
+        """
+        for suffix, _, decompress in COMPRESSORS.values():
+            path = os.path.join(self.objects_dir, f"{digest}.json{suffix}")
+            if os.path.exists(path):
+                with open(path, 'rb') as f:
+                    return decompress(f.read())
+        raise FileNotFoundError(f"快照不存在: {digest}")
+
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        获取备份统计信息
+
+        Returns:
+            Dict: 快照数量、耗时、压缩及去重节省的字节数等
+        """
+        taken = self.stats['snapshots_taken']
+        return {
+            "compression": self.compression,
+            "retention": {
+                "keep_last": self.keep_last,
+                "keep_hourly": self.keep_hourly,
+                "keep_daily": self.keep_daily
+            },
+            "snapshots": len(self._read_manifest()),
+            "pending": self._queue.unfinished_tasks,
+            "snapshots_taken": taken,
+            "dedup_hits": self.stats['dedup_hits'],
+            "dropped": self.stats['dropped'],
+            "errors": self.stats['errors'],
+            "pruned": self.stats['pruned'],
+            "bytes_stored": self.stats['bytes_stored'],
+            "bytes_in": self.stats['bytes_in'],
+            "bytes_saved": self.stats['bytes_saved'],
+            "avg_duration_ms": round(self.stats['total_duration_ms'] / taken, 3) if taken else 0.0,
+            "last_duration_ms": round(self.stats['last_duration_ms'], 3),
+            "last_backup": self.stats['last_backup']
+        }
@@ -3,22 +3,124 @@
 定义卡片的数据结构和基础操作
 """
 
-from dataclasses import dataclass, asdict
-from datetime import datetime
-from typing import Dict, Any
+import json
+import re
+import sys
+import unicodedata
+from dataclasses import FrozenInstanceError
+from datetime import datetime, timedelta
+from functools import lru_cache
+from operator import attrgetter
+from typing import Dict, Any, List, Tuple, Union, Callable, Iterable, Optional
 import uuid
 
+# created_time 在内部以"本地时间距 1970-01-01 的微秒数"保存，不涉及时区换算，可与 ISO 字符串无损互转
+_EPOCH = datetime(1970, 1, 1)
+_MICROSECOND = timedelta(microseconds=1)
+# datetime.isoformat() 对无时区时间的两种输出形式，只有这两种形式能无损还原
+_ISO_PATTERN = re.compile(r'\d{4}-\d{2}-\d{2}T\d{2}:\d{2}:\d{2}(\.\d{6})?')
+
+
+def _to_timestamp(value: Union[str, int, datetime]) -> Union[str, int]:
+    """
+    将创建时间转换为内部表示
+
+    Args:
+        value: ISO 字符串、微秒时间戳或 datetime
+
+    Returns:
+        Union[str, int]: 微秒时间戳；无法无损转换的字符串（带时区、非标准格式等）原样保留
+    """
+    if isinstance(value, int):
+        return value
+    if isinstance(value, datetime):
+        return (value - _EPOCH) // _MICROSECOND
+
+    match = _ISO_PATTERN.fullmatch(value) if isinstance(value, str) else None
+    if match is None:
+        return value
+    try:
+        dt = datetime.fromisoformat(value)
+    except ValueError:
+        return value
+    # 微秒为 0 时 isoformat() 不输出小数部分，".000000" 无法原样还原
+    if match.group(1) and not dt.microsecond:
+        return value
+    return (dt - _EPOCH) // _MICROSECOND
+
+
+def _to_isoformat(value: Union[str, int]) -> str:
+    """将内部表示的创建时间转换为 ISO 字符串"""
+    if isinstance(value, int):
+        return (_EPOCH + value * _MICROSECOND).isoformat()
+    return value
+
+
+def normalize_name(name: str) -> str:
+    """
+    规范化卡片名称，用于唯一性判断
+
+    先做 NFKC 规范化（全角/半角、兼容字符统一），再 casefold 忽略大小写，
+    最后去掉首尾空白，因此 "Grafana"、"grafana " 和 "Ｇｒａｆａｎａ" 视为同一名称。
+
+    Args:
+        name: 原始名称
+
+    Returns:
+        str: 规范化后的名称
+    """
+    return unicodedata.normalize('NFKC', unicodedata.normalize('NFKC', name).casefold()).strip()
+
 
-@dataclass
 class Card:
-    """卡片数据模型"""
-    id: str
-    name: str
-    icon: str
-    url: str
-    description: str
-    order: int
-    created_time: str
+    """
+    卡片数据模型
+
+    不可变对象：使用 __slots__ 存储字段，修改字段请使用 replace() 生成新卡片。
+    图标类名取值有限，统一驻留（intern）以共享字符串对象。
+    序列化好的片段（JSON、MessagePack 等）在首次使用时缓存在卡片上，卡片修改后是新对象，缓存自然失效。
+    """
+
+    __slots__ = ('id', 'name', 'icon', 'url', 'description', 'order', '_created', '_json')
+
+    def __init__(self, id: str, name: str, icon: str, url: str, description: str, order: int,
+                 created_time: Union[str, int]):
+        """
+        初始化卡片
+
+        Args:
+            id: 卡片ID
+            name: 卡片名称
+            icon: 图标类名
+            url: 链接地址
+            description: 描述信息
+            order: 排序位置
+            created_time: 创建时间，ISO 字符串或微秒时间戳
+        """
+        _set_id(self, id)
+        _set_name(self, name)
+        _set_icon(self, sys.intern(icon) if type(icon) is str else icon)
+        _set_url(self, url)
+        _set_description(self, description)
+        _set_order(self, order)
+        _set_created(self, _to_timestamp(created_time))
+        _set_json(self, None)
+
+    def __setattr__(self, name, value):
+        raise FrozenInstanceError(f"不能修改卡片字段 '{name}'，请使用 replace()")
+
+    def __delattr__(self, name):
+        raise FrozenInstanceError(f"不能删除卡片字段 '{name}'")
+
+    @property
+    def created_time(self) -> str:
+        """创建时间（ISO 字符串）"""
+        return _to_isoformat(self._created)
+
+    @property
+    def created_timestamp(self) -> Union[str, int]:
+        """创建时间的内部表示（微秒时间戳），适合用作排序键"""
+        return self._created
 
     @classmethod
     def create(cls, name: str, icon: str, url: str, description: str, order: int = 0) -> 'Card':
@@ -42,7 +144,7 @@ class Card:
             url=url,
             description=description,
             order=order,
-            created_time=datetime.now().isoformat()
+            created_time=datetime.now()
         )
 
     def to_dict(self) -> Dict[str, Any]:
@@ -52,7 +154,59 @@ class Card:
         Returns:
             Dict: 卡片数据字典
         """
-        return asdict(self)
+        return {
+            'id': self.id,
+            'name': self.name,
+            'icon': self.icon,
+            'url': self.url,
+            'description': self.description,
+            'order': self.order,
+            'created_time': _to_isoformat(self._created)
+        }
+
+    def to_json(self, encode: Callable[[Any], bytes] = None) -> bytes:
+        """
+        获取 to_dict() 的 JSON 片段（首次调用时生成并缓存）
+
+        默认编码方式与 Flask 默认的紧凑输出一致：键排序、非 ASCII 字符转义、无多余空白。
+
+        Args:
+            encode: 编码函数（对象 -> UTF-8 字节），None 表示 encode_fragment
+
+        Returns:
+            bytes: UTF-8 编码的 JSON 对象
+        """
+        return self.fragment(encode or encode_fragment)
+
+    def fragment(self, encode: Callable[[Any], bytes]) -> bytes:
+        """
+        获取 to_dict() 按指定编码函数编码的片段（首次调用时生成并缓存）
+
+        每种编码函数（JSON、MessagePack 等）的片段分别缓存，按函数对象区分。
+
+        Args:
+            encode: 编码函数（对象 -> 字节）
+
+        Returns:
+            bytes: 编码结果
+        """
+        cached = self._json
+        if cached is not None:
+            for encoder, data in cached:
+                if encoder is encode:
+                    return data
+        data = encode(self.to_dict())
+        _set_json(self, _add_fragment(cached, encode, data))
+        return data
+
+    def to_row(self) -> Tuple:
+        """
+        将卡片对象转换为字段元组（创建时间为内部表示），Card(*row) 可还原
+
+        Returns:
+            Tuple: (id, name, icon, url, description, order, created_time)
+        """
+        return (self.id, self.name, self.icon, self.url, self.description, self.order, self._created)
 
     @classmethod
     def from_dict(cls, data: Dict[str, Any]) -> 'Card':
@@ -67,25 +221,59 @@ class Card:
         """
         return cls(**data)
 
+    def replace(self, **changes) -> 'Card':
+        """
+        生成修改了指定字段的新卡片
+
+        Args:
+            **changes: 要修改的字段
+
+        Returns:
+            Card: 新的卡片实例
+
+        Raises:
+            TypeError: 字段名不存在
+        """
+        if not changes.keys() <= _FIELDS:
+            unknown = ', '.join(sorted(set(changes) - _FIELDS))
+            raise TypeError(f"未知的卡片字段: {unknown}")
+
+        get = changes.get
+        return Card(
+            get('id', self.id),
+            get('name', self.name),
+            get('icon', self.icon),
+            get('url', self.url),
+            get('description', self.description),
+            get('order', self.order),
+            get('created_time', self._created)
+        )
+
     def update(self, **kwargs) -> 'Card':
         """
         更新卡片信息
 
         Args:
-            **kwargs: 要更新的字段
+            **kwargs: 要更新的字段（不存在的字段被忽略）
 
         Returns:
             Card: 更新后的卡片实例
         """
-        # 创建当前实例的副本
-        data = self.to_dict()
+        return self.replace(**{key: value for key, value in kwargs.items() if key in _FIELDS})
 
-        # 更新指定字段
-        for key, value in kwargs.items():
-            if hasattr(self, key):
-                data[key] = value
+    def __eq__(self, other) -> bool:
+        if other.__class__ is not self.__class__:
+            return NotImplemented
+        return self.to_row() == other.to_row()
 
-        return self.from_dict(data)
+    def __hash__(self) -> int:
+        return hash(self.to_row())
+
+    def __getstate__(self):
+        return self.to_row()
+
+    def __setstate__(self, state):
+        self.__init__(*state)
 
     def __str__(self) -> str:
         """字符串表示"""
@@ -97,6 +285,142 @@ class Card:
                 f"icon='{self.icon}', url='{self.url}')")
 
 
+# 对外字段及其标准顺序（与 to_dict 一致）
+CARD_FIELDS = ('id', 'name', 'icon', 'url', 'description', 'order', 'created_time')
+_FIELDS = frozenset(CARD_FIELDS)
+
+# 各字段的取值函数
+_FIELD_GETTERS = {
+    'id': attrgetter('id'),
+    'name': attrgetter('name'),
+    'icon': attrgetter('icon'),
+    'url': attrgetter('url'),
+    'description': attrgetter('description'),
+    'order': attrgetter('order'),
+    'created_time': lambda card: _to_isoformat(card._created)
+}
+
+# 生成 JSON 片段的编码器（复用实例，json.dumps 传入非默认参数时每次都会新建编码器）
+_FRAGMENT_ENCODER = json.JSONEncoder(ensure_ascii=True, sort_keys=True, separators=(',', ':'))
+
+# 直接调用槽描述符写入字段，绕过被禁用的 __setattr__，比 object.__setattr__ 快约一倍
+(_set_id, _set_name, _set_icon, _set_url, _set_description, _set_order, _set_created, _set_json) = (
+    getattr(Card, slot).__set__ for slot in Card.__slots__
+)
+
+
+@lru_cache(maxsize=64)
+def _field_serializer(fields: Tuple[str, ...]) -> Callable[[Card], Dict[str, Any]]:
+    """生成只包含指定字段的序列化函数（字段已校验，按标准顺序排列）"""
+    getters = tuple((field, _FIELD_GETTERS[field]) for field in fields)
+
+    def serialize(card: Card) -> Dict[str, Any]:
+        return {field: getter(card) for field, getter in getters}
+
+    return serialize
+
+
+def card_serializer(fields: Optional[Iterable[str]] = None) -> Callable[[Card], Dict[str, Any]]:
+    """
+    获取只输出指定字段的卡片序列化函数
+
+    每种字段组合只生成一次并缓存，生成的函数直接构造目标字典，不经过完整的 to_dict。
+
+    Args:
+        fields: 字段名，None 表示全部字段
+
+    Returns:
+        Callable[[Card], Dict]: 序列化函数，输出字段按标准顺序排列
+
+    Raises:
+        ValueError: 字段为空或包含不支持的字段
+    """
+    if fields is None:
+        return Card.to_dict
+
+    requested = set(fields)
+    if not requested:
+        raise ValueError("字段列表不能为空")
+    unknown = requested - _FIELDS
+    if unknown:
+        raise ValueError(f"不支持的字段: {', '.join(sorted(unknown))}")
+    if requested == _FIELDS:
+        return Card.to_dict
+    return _field_serializer(tuple(field for field in CARD_FIELDS if field in requested))
+
+
+# 批量生成片段时插在卡片之间的分隔值；字符串中的引号都会被转义，分隔值编码后不会出现在卡片片段内部
+_FRAGMENT_SEP = '\x00'
+
+# 每张卡片最多缓存的片段种类数
+_MAX_FRAGMENTS = 3
+
+
+def encode_fragment(obj: Any) -> bytes:
+    """
+    按 Flask 默认的紧凑输出编码 JSON 片段（键排序、非 ASCII 字符转义）
+
+    Args:
+        obj: 要编码的对象
+
+    Returns:
+        bytes: UTF-8 编码的 JSON
+    """
+    return _FRAGMENT_ENCODER.encode(obj).encode('utf-8')
+
+
+def _add_fragment(cached: Optional[Tuple], encode: Callable[[Any], bytes], data: bytes) -> Tuple:
+    """在片段缓存中加入一项；同一张卡片通常只有一两种编码，超过上限时丢弃最早的"""
+    entries = (cached or ())[-(_MAX_FRAGMENTS - 1):]
+    return entries + ((encode, data),)
+
+
+def card_fragments(cards: Iterable[Card], encode: Callable[[Any], bytes] = None,
+                   batch: bool = True) -> List[bytes]:
+    """
+    获取一组卡片的片段（Card.fragment(encode)）
+
+    编码结果为 JSON 时，尚未缓存片段的卡片合并为一次编码再拆分，避免逐张调用编码器的固定开销。
+
+    Args:
+        cards: 卡片序列
+        encode: 编码函数，None 表示 encode_fragment
+        batch: 是否合并编码（只适用于紧凑输出的 JSON 编码函数）
+
+    Returns:
+        List[bytes]: 各卡片的片段
+    """
+    encode = encode or encode_fragment
+    fragments = []
+    missing = []
+    for card in cards:
+        data = None
+        cached = card._json
+        if cached is not None:
+            for encoder, value in cached:
+                if encoder is encode:
+                    data = value
+                    break
+        if data is None:
+            missing.append((len(fragments), card))
+        fragments.append(data)
+
+    if batch and len(missing) > 1:
+        values = []
+        for _, card in missing:
+            values.append(card.to_dict())
+            values.append(_FRAGMENT_SEP)
+        encoded = encode(values[:-1])[1:-1]
+        split = b',' + encode(_FRAGMENT_SEP) + b','
+        for (position, card), data in zip(missing, encoded.split(split)):
+            _set_json(card, _add_fragment(card._json, encode, data))
+            fragments[position] = data
+    else:
+        for position, card in missing:
+            fragments[position] = card.fragment(encode)
+    return fragments
+
+
 # 用于验证的辅助函数
 def validate_card_data(data: Dict[str, Any]) -> bool:
     """
@@ -131,4 +455,19 @@ def validate_card_data(data: Dict[str, Any]) -> bool:
     if not isinstance(data['order'], int):
         return False
 
-    return True
\ No newline at end of file
+    return True
+
+def ensure_valid_card(card: Card):
+    """
+    检查写入存储的卡片是否有效
+
+    各存储后端的事务在写入时调用，无效卡片不会被提交。
+
+    Args:
+        card: 卡片对象
+
+    Raises:
+        ValueError: 卡片数据无效
+    """
+    if not validate_card_data(card.to_dict()):
+        raise ValueError(f"无效的卡片数据: {card.to_dict()}")
@@ -0,0 +1,109 @@
+"""
+内容摘要
+写入数据文件时在 config 中记录文件内容的 BLAKE2 摘要，读取时据此判断文件是否被外部修改
+"""
+
+import hashlib
+from typing import Dict, Any, Tuple
+from . import serialization
+
+CONTENT_HASH_KEY = 'content_hash'
+
+# 摘要长度（字节），十六进制表示为两倍长度
+DIGEST_SIZE = 16
+_PLACEHOLDER = b'0' * (DIGEST_SIZE * 2)
+_MARKER = f'"{CONTENT_HASH_KEY}":'.encode('utf-8')
+
+
+def _digest(raw: bytes, start: int = None) -> str:
+    """
+    计算文件内容摘要，摘要字段本身按占位符计算
+
+    Args:
+        raw: 文件内容
+        start: 摘要值在文件中的起始位置，None 表示文件中没有摘要字段
+
+    Returns:
+        str: 十六进制摘要
+    """
+    if start is None:
+        return hashlib.blake2b(raw, digest_size=DIGEST_SIZE).hexdigest()
+
+    view = memoryview(raw)
+    h = hashlib.blake2b(view[:start], digest_size=DIGEST_SIZE)
+    h.update(_PLACEHOLDER)
+    h.update(view[start + len(_PLACEHOLDER):])
+    return h.hexdigest()
+
+
+def seal_document(data: Dict[str, Any], pretty: bool = False) -> bytes:
+    """
+    序列化数据文档，并在 config 末尾写入内容摘要
+
+    先以占位符序列化，再对整个文件内容计算摘要并原位替换占位符，
+    因此摘要覆盖文件中除摘要值以外的所有字节。
+
+    Args:
+        data: 数据文档 {'cards': [...], 'config': {...}}，config 中的摘要会被更新
+        pretty: 是否缩进输出，否则紧凑输出
+
+    Returns:
+        bytes: 文件内容
+    """
+    config = data['config']
+    config.pop(CONTENT_HASH_KEY, None)
+    # 摘要位于文档末尾，读取时从后向前查找
+    config[CONTENT_HASH_KEY] = _PLACEHOLDER.decode('ascii')
+
+    raw = serialization.dumps(data, indent=pretty)
+    start = _find_hash(raw)
+    digest = _digest(raw, start)
+
+    config[CONTENT_HASH_KEY] = digest
+    return raw[:start] + digest.encode('ascii') + raw[start + len(_PLACEHOLDER):]
+
+
+def _find_hash(raw: bytes) -> int:
+    """
+    查找摘要值在文件中的起始位置
+
+    Args:
+        raw: 文件内容
+
+    Returns:
+        int: 起始位置，不存在或格式不符时为 -1
+    """
+    pos = raw.rfind(_MARKER)
+    if pos < 0:
+        return -1
+
+    start = pos + len(_MARKER)
+    while raw[start:start + 1] == b' ':
+        start += 1
+    if raw[start:start + 1] != b'"':
+        return -1
+
+    start += 1
+    end = start + len(_PLACEHOLDER)
+    if raw[end:end + 1] != b'"':
+        return -1
+    return start
+
+
+def verify_document(raw: bytes) -> Tuple[str, bool]:
+    """
+    计算文件内容摘要，并检查是否与文件中记录的摘要一致
+
+    Args:
+        raw: 文件内容
+
+    Returns:
+        Tuple[str, bool]: (内容摘要, 是否与记录一致)；
+        没有记录摘要的旧文件或被外部修改的文件返回 False
+    """
+    start = _find_hash(raw)
+    if start < 0:
+        return _digest(raw), False
+
+    digest = _digest(raw, start)
+    return digest, raw[start:start + len(_PLACEHOLDER)] == digest.encode('ascii')
@@ -0,0 +1,79 @@
+"""
+名称排序规则
+生成卡片名称的排序键：中文按拼音、拉丁字母不区分大小写，两者按首字母交错排列
+（"Apache"、"北京"、"Consul" 依次排列）。
+安装了 pypinyin 时按完整拼音排序，否则按 GB2312 一级汉字的编码顺序（即拼音顺序）近似。
+"""
+
+import unicodedata
+from bisect import bisect_right
+from functools import lru_cache
+
+try:
+    from pypinyin import lazy_pinyin, Style
+except ImportError:  # 未安装 pypinyin 时按 GB2312 编码近似
+    lazy_pinyin = None
+
+# GB2312 一级汉字按拼音排列，各声母首字的编码（区位码高字节在前）
+_GB2312_INITIALS = (
+    (0xB0A1, 'a'), (0xB0C5, 'b'), (0xB2C1, 'c'), (0xB4EE, 'd'), (0xB6EA, 'e'),
+    (0xB7A2, 'f'), (0xB8C1, 'g'), (0xB9FE, 'h'), (0xBBF7, 'j'), (0xBFA6, 'k'),
+    (0xC0AC, 'l'), (0xC2E8, 'm'), (0xC4C3, 'n'), (0xC5B6, 'o'), (0xC5BE, 'p'),
+    (0xC6DA, 'q'), (0xC8BB, 'r'), (0xC8F6, 's'), (0xCBFA, 't'), (0xCDDA, 'w'),
+    (0xCEF4, 'x'), (0xD1B9, 'y'), (0xD4D1, 'z'),
+)
+_GB2312_CODES = [code for code, _ in _GB2312_INITIALS]
+# 一级汉字的最后一个编码，之后的二级汉字按部首排列，无法得到拼音
+_GB2312_LEVEL1_END = 0xD7F9
+
+# 汉字在排序键中以私用区字符表示，排在同一首字母的所有拉丁字符之后
+_PRIVATE_BASE = 0xE000
+
+
+def _is_han(char: str) -> bool:
+    """判断是否为汉字"""
+    return '㐀' <= char <= '鿿' or '豈' <= char <= '﫿'
+
+
+@lru_cache(maxsize=8192)
+def _han_key(char: str) -> str:
+    """
+    单个汉字的排序键
+
+    Args:
+        char: 汉字
+
+    Returns:
+        str: 有 pypinyin 时为拼音加 \x00（"北" 排在 "bei" 之后、"beijing" 之前）；
+        否则为首字母加编码顺序字符，不在一级汉字中的字排在所有字母之后
+    """
+    if lazy_pinyin is not None:
+        return lazy_pinyin(char, style=Style.NORMAL)[0] + '\x00'
+
+    try:
+        raw = char.encode('gb2312')
+    except UnicodeEncodeError:
+        return '\U000f0000' + char
+
+    code = (raw[0] << 8) | raw[1]
+    if not _GB2312_CODES[0] <= code <= _GB2312_LEVEL1_END:
+        return '\U000f0000' + char
+    initial = _GB2312_INITIALS[bisect_right(_GB2312_CODES, code) - 1][1]
+    return initial + chr(_PRIVATE_BASE + code - _GB2312_CODES[0])
+
+
+def collation_key(name: str) -> str:
+    """
+    生成名称的排序键
+
+    先做 NFKC 规范化并 casefold，全角、大小写差异不影响顺序；
+    汉字替换为拼音（或首字母加编码顺序），与拉丁字母按首字母交错排列。
+
+    Args:
+        name: 卡片名称
+
+    Returns:
+        str: 排序键，直接按字符串比较
+    """
+    text = unicodedata.normalize('NFKC', name).casefold().strip()
+    return ''.join(_han_key(char) if _is_han(char) else char for char in text)
@@ -0,0 +1,323 @@
+"""
+列式卡片视图
+把卡片按列展开（排序号、创建时间为整数数组，搜索文本为连续字符串加偏移表），
+过滤、排序和分页都在下标数组上完成，最后只为当前页取出卡片对象。
+安装了 NumPy 时使用向量化运算，否则退回纯 Python 实现，结果完全一致。
+"""
+
+from bisect import bisect_left, bisect_right
+from collections.abc import Sequence
+from typing import List, Dict, Optional, Set, Tuple, Union
+from .card import Card
+from .collation import collation_key
+
+try:
+    import numpy as np
+except ImportError:  # 未安装 NumPy 时使用纯 Python 实现
+    np = None
+
+# 搜索文本中名称与描述、卡片与卡片之间的分隔符
+_FIELD_SEP = '\x00'
+_ROW_SEP = '\x01'
+
+SORT_KEYS = ('order', 'name', 'created_time', 'usage')
+
+
+class CardColumns:
+    """
+    一组卡片的列式快照（构建后只读）
+
+    行号即卡片在按 (order, id) 排序后的列表中的位置，因此按 order 升序就是行号顺序。
+    """
+
+    def __init__(self, cards: List[Card]):
+        """
+        构建列式快照
+
+        Args:
+            cards: 按 (order, id) 排序的卡片列表
+        """
+        self.cards = cards
+
+        orders = [card.order for card in cards]
+        created = [card.created_timestamp for card in cards]
+        # 个别无法转换为时间戳的创建时间（外部编辑写入的非标准格式）按 ISO 字符串比较
+        if all(type(value) is int for value in created):
+            self.created = self._int_column(created)
+        else:
+            self.created = [card.created_time for card in cards]
+        self.orders = self._int_column(orders)
+
+        # 名称与描述的小写形式连接成一个字符串，搜索时由 str.find 在 C 层扫描
+        texts = [f"{card.name.lower()}{_FIELD_SEP}{card.description.lower()}" for card in cards]
+        self.text = _ROW_SEP.join(texts)
+        offsets = []
+        position = 0
+        for text in texts:
+            offsets.append(position)
+            position += len(text) + 1
+        self.offsets = offsets
+
+        self._ranks: Dict[str, Union[List[int], 'np.ndarray']] = {}
+        self._rows_by_id: Optional[Dict[str, int]] = None
+        # (排序字段, 是否降序, 访问统计版本) -> 全部行的排列
+        self._permutations: Dict[Tuple, Union[List[int], 'np.ndarray']] = {}
+        # (访问统计版本, 访问次数列)
+        self._usage: Optional[Tuple[int, Union[List[int], 'np.ndarray']]] = None
+
+    def __len__(self) -> int:
+        return len(self.cards)
+
+    @staticmethod
+    def _int_column(values: List[int]):
+        """生成整数列，有 NumPy 时为 int64 数组"""
+        return np.array(values, dtype=np.int64) if np is not None else values
+
+    def _all(self):
+        """全部行号"""
+        return np.arange(len(self.cards)) if np is not None else range(len(self.cards))
+
+    def filter(self, query: Optional[str], candidates: Optional[Set[str]] = None):
+        """
+        按名称或描述包含关键词（不区分大小写）过滤
+
+        Args:
+            query: 搜索关键词，为空时不过滤
+            candidates: 倒排索引给出的候选卡片ID（不会遗漏匹配的卡片），
+                提供时只校验这些卡片，否则扫描全部搜索文本
+
+        Returns:
+            行号序列（按 order 排序）
+        """
+        query = (query or '').strip().lower()
+        if not query:
+            return self._all()
+
+        if _FIELD_SEP in query or _ROW_SEP in query:
+            # 关键词中含分隔符时可能跨字段误匹配，逐张检查
+            rows = [i for i, card in enumerate(self.cards)
+                    if query in card.name.lower() or query in card.description.lower()]
+        elif candidates is not None and len(candidates) * 4 < len(self.cards):
+            # 候选较少时只校验候选卡片；候选占比较大时顺序扫描反而更快
+            rows = []
+            text, offsets, row_of = self.text, self.offsets, self._row_of()
+            last = len(offsets) - 1
+            for card_id in candidates:
+                row = row_of.get(card_id)
+                if row is None:
+                    continue
+                end = offsets[row + 1] - 1 if row < last else len(text)
+                if text.find(query, offsets[row], end) != -1:
+                    rows.append(row)
+            rows.sort()
+        else:
+            rows = []
+            text, offsets = self.text, self.offsets
+            position = text.find(query)
+            while position != -1:
+                row = bisect_right(offsets, position) - 1
+                rows.append(row)
+                # 同一张卡片只记录一次，从下一张卡片开始继续查找
+                if row + 1 >= len(offsets):
+                    break
+                position = text.find(query, offsets[row + 1])
+
+        return np.array(rows, dtype=np.intp) if np is not None else rows
+
+    def seek(self, after: Optional[Tuple[int, str]]) -> int:
+        """
+        定位 keyset 游标：返回排在游标卡片之后的第一行
+
+        行按 (排序号, 卡片ID) 排列，先用排序号二分，再在排序号相同的卡片中按ID二分，
+        耗时与卡片总数无关。游标卡片已被删除或改了排序号时，从排在 (排序号, 卡片ID) 之后的第一行开始。
+
+        Args:
+            after: 游标 (排序号, 卡片ID)，None 表示从头开始
+
+        Returns:
+            int: 起始行号
+        """
+        if after is None:
+            return 0
+
+        order, card_id = after
+        if np is not None:
+            lo = int(np.searchsorted(self.orders, order, side='left'))
+            hi = int(np.searchsorted(self.orders, order, side='right'))
+        else:
+            lo = bisect_left(self.orders, order)
+            hi = bisect_right(self.orders, order, lo)
+
+        ids = [self.cards[row].id for row in range(lo, hi)]
+        return lo + bisect_right(ids, card_id)
+
+    def after(self, rows, after: Optional[Tuple[int, str]]):
+        """
+        截取 keyset 游标之后的行号
+
+        Args:
+            rows: 按 order 排序的行号序列（filter 的结果）
+            after: 游标 (排序号, 卡片ID)
+
+        Returns:
+            游标之后的行号序列
+        """
+        start = self.seek(after)
+        if np is not None:
+            return rows[int(np.searchsorted(rows, start)):]
+        return rows[bisect_left(rows, start):]
+
+    def _row_of(self) -> Dict[str, int]:
+        """卡片ID -> 行号（首次使用时构建）"""
+        if self._rows_by_id is None:
+            self._rows_by_id = {card.id: row for row, card in enumerate(self.cards)}
+        return self._rows_by_id
+
+    def _rank(self, key: str):
+        """
+        获取各行在指定字段上的名次（按快照缓存）
+
+        键值相同的行名次相同，排序时保持 order 顺序。名称按 collation_key 比较
+        （中文按拼音，拉丁字母不区分大小写）。
+
+        Args:
+            key: 排序字段
+
+        Returns:
+            名次列，值越小越靠前
+        """
+        ranks = self._ranks.get(key)
+        if ranks is None:
+            if key == 'name':
+                values = [collation_key(card.name) for card in self.cards]
+            else:
+                values = list(self.created)
+
+            ranks = [0] * len(values)
+            rank, previous = -1, None
+            for row in sorted(range(len(values)), key=values.__getitem__):
+                if rank < 0 or values[row] != previous:
+                    rank += 1
+                    previous = values[row]
+                ranks[row] = rank
+            ranks = self._int_column(ranks)
+            self._ranks[key] = ranks
+        return ranks
+
+    def _usage_column(self, usage):
+        """各行的访问次数（按访问统计版本缓存）"""
+        generation = usage.generation
+        cached = self._usage
+        if cached is None or cached[0] != generation:
+            counts = usage.counts()
+            cached = (generation, self._int_column([counts.get(card.id, 0) for card in self.cards]))
+            self._usage = cached
+        return cached[1]
+
+    def sort(self, rows, key: str = 'order', descending: bool = False, usage=None):
+        """
+        对行号排序（稳定排序，相同键值保持 order 顺序）
+
+        对全部行排序时，结果按 (字段, 方向) 缓存在快照上，同一快照的后续请求不再排序；
+        按访问次数排序的结果还随访问统计版本失效。
+
+        Args:
+            rows: 行号序列
+            key: 排序字段，order、name、created_time 或 usage
+            descending: 是否降序
+            usage: 访问统计（UsageCounter），按 usage 排序时必需
+
+        Returns:
+            排序后的行号序列（调用方不应修改）
+
+        Raises:
+            ValueError: 不支持的排序字段
+        """
+        if key not in SORT_KEYS:
+            raise ValueError(f"不支持的排序字段: {key}")
+        if key == 'usage' and usage is None:
+            raise ValueError("按使用频率排序需要访问统计")
+
+        if len(rows) != len(self.cards):
+            return self._sort(rows, key, descending, usage)
+
+        # 行号互不重复，数量相同即为全部行
+        cache_key = (key, descending, usage.generation if key == 'usage' else None)
+        permutation = self._permutations.get(cache_key)
+        if permutation is None:
+            permutation = self._sort(self._all(), key, descending, usage)
+            if key == 'usage':
+                # 旧版本访问统计的排列不会再被使用
+                for stale in [k for k in self._permutations if k[0] == 'usage']:
+                    self._permutations.pop(stale, None)
+            self._permutations[cache_key] = permutation
+        return permutation
+
+    def _sort(self, rows, key: str, descending: bool, usage):
+        """对行号做稳定排序（不缓存）"""
+        if key == 'order':
+            values = self.orders
+        elif key == 'usage':
+            values = self._usage_column(usage)
+        elif key == 'created_time' and (np is None or isinstance(self.created, np.ndarray)):
+            values = self.created
+        else:
+            # 名称按名次比较；创建时间含字符串时 NumPy 无法直接比较，同样换算为名次
+            values = self._rank(key)
+
+        if np is not None:
+            rows = np.asarray(rows, dtype=np.intp)
+            keys = values[rows]
+            order = np.argsort(-keys if descending else keys, kind='stable')
+            return rows[order]
+
+        if key == 'order' and not descending:
+            # 行号顺序就是 order 顺序
+            return list(rows)
+        return sorted(rows, key=values.__getitem__, reverse=descending)
+
+    def view(self, rows) -> 'CardView':
+        """
+        获取行号对应的卡片序列
+
+        Args:
+            rows: 行号序列
+
+        Returns:
+            CardView: 惰性卡片序列
+        """
+        return CardView(self.cards, rows)
+
+
+class CardView(Sequence):
+    """
+    按行号惰性取卡片的只读序列
+
+    切片仍然返回 CardView，只有真正访问元素时才取出卡片对象，
+    因此分页时只会为当前页生成卡片。
+    """
+
+    def __init__(self, cards: List[Card], rows):
+        """
+        初始化序列
+
+        Args:
+            cards: 全部卡片
+            rows: 行号序列（list、range 或 NumPy 数组）
+        """
+        self._cards = cards
+        self._rows = rows
+
+    def __len__(self) -> int:
+        return len(self._rows)
+
+    def __getitem__(self, item):
+        if isinstance(item, slice):
+            return CardView(self._cards, self._rows[item])
+        return self._cards[self._rows[item]]
+
+    def __iter__(self):
+        rows = self._rows.tolist() if hasattr(self._rows, 'tolist') else self._rows
+        cards = self._cards
+        for row in rows:
+            yield cards[row]
@@ -0,0 +1,105 @@
+"""
+跨进程文件锁
+串行化多个 worker 进程对同一数据文件的写操作，并统计锁等待时间
+"""
+
+import os
+import threading
+import time
+from typing import Dict, Any
+
+try:
+    import fcntl
+except ImportError:  # Windows 等不支持 fcntl 的平台只做进程内互斥
+    fcntl = None
+
+
+class FileLock:
+    """
+    可重入的写锁：进程内使用 RLock，进程间使用 fcntl.flock
+
+    同一线程可以嵌套获取；只有最外层获取时才对锁文件加 flock，
+    最外层释放时解锁。每次加锁都重新打开锁文件，避免 fork 出的
+    子进程共享同一个打开的文件描述而互相"持有"对方的锁。
+    """
+
+    def __init__(self, path: str):
+        """
+        初始化文件锁
+
+        Args:
+            path: 锁文件路径
+        """
+        self.path = path
+        self._thread_lock = threading.RLock()
+        self._depth = 0
+        self._fd = None
+        self.stats = {
+            'acquisitions': 0,
+            'contended': 0,
+            'total_wait_ms': 0.0,
+            'max_wait_ms': 0.0,
+            'last_wait_ms': 0.0
+        }
+
+    def acquire(self):
+        """获取锁，阻塞直到成功"""
+        start = time.perf_counter()
+        self._thread_lock.acquire()
+
+        if self._depth == 0 and fcntl is not None:
+            try:
+                self._fd = os.open(self.path, os.O_RDWR | os.O_CREAT, 0o644)
+                fcntl.flock(self._fd, fcntl.LOCK_EX)
+            except Exception:
+                if self._fd is not None:
+                    os.close(self._fd)
+                    self._fd = None
+                self._thread_lock.release()
+                raise
+
+        self._depth += 1
+
+        if self._depth == 1:
+            wait_ms = (time.perf_counter() - start) * 1000
+            self.stats['acquisitions'] += 1
+            self.stats['total_wait_ms'] += wait_ms
+            self.stats['last_wait_ms'] = wait_ms
+            self.stats['max_wait_ms'] = max(self.stats['max_wait_ms'], wait_ms)
+            if wait_ms >= 1:
+                self.stats['contended'] += 1
+
+    def release(self):
+        """释放锁"""
+        self._depth -= 1
+        if self._depth == 0 and self._fd is not None:
+            try:
+                fcntl.flock(self._fd, fcntl.LOCK_UN)
+            finally:
+                os.close(self._fd)
+                self._fd = None
+        self._thread_lock.release()
+
+    def __enter__(self) -> 'FileLock':
+        self.acquire()
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.release()
+
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        获取锁等待统计
+
+        Returns:
+            Dict: 获取次数、发生等待的次数、平均/最大/最近一次等待时间（毫秒）
+        """
+        acquisitions = self.stats['acquisitions']
+        return {
+            "cross_process": fcntl is not None,
+            "acquisitions": acquisitions,
+            "contended": self.stats['contended'],
+            "avg_wait_ms": round(self.stats['total_wait_ms'] / acquisitions, 3) if acquisitions else 0.0,
+            "max_wait_ms": round(self.stats['max_wait_ms'], 3),
+            "last_wait_ms": round(self.stats['last_wait_ms'], 3)
+        }
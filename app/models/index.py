@@ -0,0 +1,278 @@
+"""
+卡片索引
+维护 id、规范化名称和最大排序号的内存索引，所有查询均为 O(1)，随变更增量更新；
+搜索用的 n-gram 倒排索引在首次搜索时构建（或从索引文件恢复），此后同样增量更新
+"""
+
+from collections import Counter
+from typing import List, Dict, Any, Optional, Set, Iterable, Tuple
+from .card import Card, normalize_name
+from .columns import CardColumns
+from .search import SearchIndex
+from .suggest import NameSuggester
+
+
+class CardIndex:
+    """卡片索引：id -> 卡片、规范化名称 -> id 集合、排序号计数与最大排序号"""
+
+    def __init__(self, cards: Iterable[Card] = ()):
+        """
+        初始化索引
+
+        Args:
+            cards: 初始卡片
+        """
+        self.by_id: Dict[str, Card] = {}
+        # 历史数据中可能存在规范化后重名的卡片，因此名称映射到 id 集合
+        self.by_name: Dict[str, Set[str]] = {}
+        self._order_counts: Dict[int, int] = {}
+        self.max_order = 0
+        self._sorted: Optional[List[Card]] = None
+        self._columns: Optional[CardColumns] = None
+        self._suggester: Optional[NameSuggester] = None
+        # 搜索索引按需构建，不搜索的进程不承担构建开销
+        self._search: Optional[SearchIndex] = None
+        # 从索引文件恢复的倒排表 (状态, 行号对应的卡片ID)，首次搜索或修改时才解码
+        self._search_state: Optional[Tuple[bytes, List[str]]] = None
+
+        for card in cards:
+            self.put(card)
+
+    def __len__(self) -> int:
+        return len(self.by_id)
+
+    def __contains__(self, card_id: str) -> bool:
+        return card_id in self.by_id
+
+    def get(self, card_id: str) -> Optional[Card]:
+        """
+        根据ID获取卡片
+
+        Args:
+            card_id: 卡片ID
+
+        Returns:
+            Optional[Card]: 找到的卡片或None
+        """
+        return self.by_id.get(card_id)
+
+    def name_ids(self, name: str) -> Set[str]:
+        """
+        获取规范化名称相同的卡片ID集合
+
+        Args:
+            name: 卡片名称（无需预先规范化）
+
+        Returns:
+            Set[str]: 卡片ID集合（只读）
+        """
+        return self.by_name.get(normalize_name(name), set())
+
+    def name_exists(self, name: str, exclude_id: str = None) -> bool:
+        """
+        检查规范化后的名称是否已被其他卡片使用
+
+        Args:
+            name: 要检查的名称
+            exclude_id: 排除的卡片ID（用于更新时检查）
+
+        Returns:
+            bool: 名称是否已存在
+        """
+        ids = self.name_ids(name)
+        return bool(ids) and (exclude_id not in ids or len(ids) > 1)
+
+    def next_order(self) -> int:
+        """
+        获取下一个排序号
+
+        Returns:
+            int: 下一个可用的排序号
+        """
+        return self.max_order + 1
+
+    def put(self, card: Card):
+        """
+        新增或替换卡片，增量更新各索引
+
+        Args:
+            card: 卡片对象
+        """
+        # 先登记新排序号再移除旧卡片，修改最大排序号卡片的其他字段时无需重新计算最大值
+        self._order_counts[card.order] = self._order_counts.get(card.order, 0) + 1
+        if card.order > self.max_order:
+            self.max_order = card.order
+
+        previous = self.by_id.get(card.id)
+        if previous is not None:
+            self._unindex(previous)
+
+        search = self._search if self._search_state is None else self._ensure_search()
+        if search is not None and (previous is None or previous.name != card.name
+                                   or previous.description != card.description):
+            if previous is not None:
+                search.remove(previous)
+            search.add(card)
+
+        self.by_id[card.id] = card
+        self.by_name.setdefault(normalize_name(card.name), set()).add(card.id)
+        self._sorted = None
+        self._columns = None
+        self._suggester = None
+
+    def remove(self, card_id: str) -> Optional[Card]:
+        """
+        删除卡片，增量更新各索引
+
+        Args:
+            card_id: 卡片ID
+
+        Returns:
+            Optional[Card]: 被删除的卡片，不存在时为None
+        """
+        if self._search_state is not None and card_id in self.by_id:
+            self._ensure_search()
+        card = self.by_id.pop(card_id, None)
+        if card is not None:
+            self._unindex(card)
+            if self._search is not None:
+                self._search.remove(card)
+            self._sorted = None
+            self._columns = None
+            self._suggester = None
+        return card
+
+    def apply(self, changes: Iterable[Tuple[str, Card]]):
+        """
+        应用一组净变更
+
+        Args:
+            changes: [('put' | 'delete', card), ...]
+        """
+        for op, card in changes:
+            if op == 'delete':
+                self.remove(card.id)
+            else:
+                self.put(card)
+
+    def _unindex(self, card: Card):
+        """从名称和排序号索引中移除卡片（不修改 by_id）"""
+        key = normalize_name(card.name)
+        ids = self.by_name.get(key)
+        if ids is not None:
+            ids.discard(card.id)
+            if not ids:
+                del self.by_name[key]
+
+        count = self._order_counts.get(card.order, 0) - 1
+        if count > 0:
+            self._order_counts[card.order] = count
+        else:
+            self._order_counts.pop(card.order, None)
+            # 只有移除了当前最大排序号的最后一张卡片时才需要重新计算
+            if card.order == self.max_order:
+                self.max_order = max(self._order_counts, default=0)
+
+    def search_candidates(self, query: str) -> Optional[Set[str]]:
+        """
+        获取可能包含查询词的卡片ID，首次调用时构建搜索索引
+
+        Args:
+            query: 搜索关键词
+
+        Returns:
+            Optional[Set[str]]: 候选卡片ID集合（调用方可修改），查询词过短无法使用索引时为None
+        """
+        return self._ensure_search().candidates(query)
+
+    def _ensure_search(self) -> SearchIndex:
+        """获取搜索索引：优先从索引文件的倒排表恢复，否则从卡片构建"""
+        if self._search is None:
+            if self._search_state is not None:
+                self._search = SearchIndex.from_state(*self._search_state)
+            else:
+                self._search = SearchIndex(self.by_id.values())
+        self._search_state = None
+        return self._search
+
+    def to_state(self) -> Dict[str, Any]:
+        """
+        导出索引状态（只包含基础类型，用于持久化为索引文件）
+
+        按列存储：每个字段一个列表，另附规范化名称列，恢复时无需重新规范化。
+        列式布局比逐张卡片的元组解码更快。搜索倒排表以行号保存，尚未构建时在此构建。
+
+        Returns:
+            Dict: {'columns': [id列, name列, ..., created_time列（内部表示）], 'name_keys': [...],
+            'search': 搜索倒排表（SearchIndex.to_state）}
+        """
+        cards = list(self.by_id.values())
+        positions = {card.id: row for row, card in enumerate(cards)}
+        return {
+            'columns': [list(column) for column in zip(*(card.to_row() for card in cards))] or [[]] * 7,
+            'name_keys': [normalize_name(card.name) for card in cards],
+            'search': self._ensure_search().to_state(positions)
+        }
+
+    @classmethod
+    def from_state(cls, state: Dict[str, Any]) -> 'CardIndex':
+        """
+        从导出的状态恢复索引，跳过名称规范化
+
+        Args:
+            state: to_state() 的结果
+
+        Returns:
+            CardIndex: 恢复的索引
+        """
+        columns = state['columns']
+        ids, orders = columns[0], columns[5]
+
+        index = cls()
+        index.by_id = dict(zip(ids, map(Card, *columns)))
+        index.by_name = {key: {card_id} for key, card_id in zip(state['name_keys'], ids)}
+        if len(index.by_name) < len(ids):
+            # 存在规范化后重名的卡片，逐个合并
+            index.by_name = {}
+            for key, card_id in zip(state['name_keys'], ids):
+                index.by_name.setdefault(key, set()).add(card_id)
+        index._order_counts = dict(Counter(orders))
+        index.max_order = max(orders, default=0)
+        if state.get('search') is not None:
+            index._search_state = (state['search'], ids)
+        return index
+
+    def sorted_cards(self) -> List[Card]:
+        """
+        获取按 (order, id) 排序的卡片列表，结果在下次变更前复用
+
+        排序号相同的卡片按ID排列，与 keyset 游标和其他存储后端使用同一个键。
+
+        Returns:
+            List[Card]: 卡片列表（调用方不应修改）
+        """
+        if self._sorted is None:
+            self._sorted = sorted(self.by_id.values(), key=lambda x: (x.order, x.id))
+        return self._sorted
+
+    def columns(self) -> CardColumns:
+        """
+        获取列式快照，结果在下次变更前复用
+
+        Returns:
+            CardColumns: 列式快照
+        """
+        if self._columns is None:
+            self._columns = CardColumns(self.sorted_cards())
+        return self._columns
+
+    def suggester(self) -> NameSuggester:
+        """
+        获取名称联想快照，结果在下次变更前复用
+
+        Returns:
+            NameSuggester: 名称联想快照
+        """
+        if self._suggester is None:
+            self._suggester = NameSuggester(self.by_id.values())
+        return self._suggester
@@ -0,0 +1,97 @@
+"""
+卡片预写日志
+以追加方式记录每次变更，配合快照文件实现 O(变更量) 的写入
+"""
+
+import os
+from typing import List, Dict, Any, Optional, Tuple
+from . import serialization
+
+
+class CardJournal:
+    """
+    追加式变更日志（cards.wal）
+
+    每行一条紧凑的 JSON 记录: {"op": "put"|"delete", "card": {...}, "generation": n, "time": "..."}
+    同一事务内的记录共享同一个 generation。
+    """
+
+    def __init__(self, path: str):
+        """
+        初始化日志
+
+        Args:
+            path: 日志文件路径
+        """
+        self.path = path
+
+    def signature(self) -> Optional[Tuple[int, int]]:
+        """
+        获取日志文件的状态签名
+
+        Returns:
+            Optional[Tuple[int, int]]: (inode, size)，文件不存在时为None
+        """
+        try:
+            st = os.stat(self.path)
+        except OSError:
+            return None
+        return st.st_ino, st.st_size
+
+    def append(self, records: List[Dict[str, Any]]) -> int:
+        """
+        追加记录并刷盘
+
+        Args:
+            records: 要追加的记录列表
+
+        Returns:
+            int: 写入的字节数
+        """
+        payload = b''.join(
+            serialization.dumps(record) + b'\n'
+            for record in records
+        )
+        with open(self.path, 'ab') as f:
+            f.write(payload)
+            f.flush()
+            os.fsync(f.fileno())
+        return len(payload)
+
+    def read(self, offset: int = 0) -> Tuple[List[Dict[str, Any]], int]:
+        """
+        从指定偏移读取完整的记录
+
+        末尾未写完的行（写入过程中崩溃或另一进程正在追加）不会被消费，
+        返回的偏移停在该行开头，下次读取时会重新尝试。
+
+        Args:
+            offset: 起始字节偏移
+
+        Returns:
+            Tuple[List[Dict], int]: (记录列表, 已消费到的字节偏移)
+        """
+        try:
+            with open(self.path, 'rb') as f:
+                f.seek(offset)
+                chunk = f.read()
+        except FileNotFoundError:
+            return [], 0
+
+        end = chunk.rfind(b'\n') + 1
+        records = []
+        for line in chunk[:end].splitlines():
+            if not line.strip():
+                continue
+            try:
+                records.append(serialization.loads(line))
+            except ValueError as e:
+                print(f"跳过损坏的日志记录: {e}")
+
+        return records, offset + end
+
+    def reset(self):
+        """清空日志（快照已包含全部变更之后调用）"""
+        with open(self.path, 'wb') as f:
+            f.flush()
+            os.fsync(f.fileno())
@@ -0,0 +1,232 @@
+"""
+内存存储后端
+数据只保存在进程内存中，用于测试和基准测试；可按需把快照写入磁盘
+"""
+
+import os
+import tempfile
+import threading
+import uuid
+from contextlib import contextmanager
+from datetime import datetime
+from typing import List, Dict, Any, Optional, Set, Iterator
+from .card import Card, validate_card_data
+from .storage import StorageBackend
+from .transaction import CardTransaction
+from .index import CardIndex
+from .columns import CardColumns
+from .suggest import NameSuggester
+from .checksum import seal_document
+
+MEMORY_PATH = ':memory:'
+
+
+def is_memory_path(data_path: str) -> bool:
+    """
+    判断数据路径是否表示内存存储
+
+    Args:
+        data_path: 数据路径
+
+    Returns:
+        bool: 是否为 :memory:
+    """
+    return data_path == MEMORY_PATH
+
+
+class MemoryDataManager(StorageBackend):
+    """内存数据管理器，行为与 JSON 文件存储一致（排序、校验、统计），但不访问磁盘"""
+
+    def __init__(self, data_path: str = MEMORY_PATH, cards: List[Card] = None):
+        """
+        初始化数据管理器
+
+        Args:
+            data_path: 固定为 :memory:
+            cards: 初始卡片列表（可选）
+        """
+        self.data_path = data_path
+        self._index = CardIndex()
+        self._config = {
+            "last_updated": datetime.now().isoformat(),
+            "total_cards": 0,
+            "version": "1.0",
+            "generation": 0
+        }
+        # 数据不跨进程保存，版本标识带上实例标记，重启后不会与之前的版本混淆
+        self._instance = uuid.uuid4().hex[:12]
+        self._write_lock = threading.RLock()
+        # 保护索引的原地修改；事务进行期间索引不变，读取无需等待写锁
+        self._index_lock = threading.RLock()
+
+        if cards:
+            self.save_cards(cards)
+
+    def _accept(self, card: Card) -> bool:
+        """
+        按文件存储的加载规则校验卡片，无效卡片被跳过
+
+        Args:
+            card: 卡片对象
+
+        Returns:
+            bool: 是否有效
+        """
+        if validate_card_data(card.to_dict()):
+            return True
+        print(f"跳过无效的卡片数据: {card.to_dict()}")
+        return False
+
+    def _touch(self):
+        """记录一次写入"""
+        self._config['last_updated'] = datetime.now().isoformat()
+        self._config['total_cards'] = len(self._index)
+        self._config['generation'] += 1
+
+    @contextmanager
+    def transaction(self) -> Iterator[CardTransaction]:
+        """
+        卡片事务上下文管理器
+
+        正常退出时把净变更增量应用到索引，发生异常时不做任何修改。
+        应用变更期间持有索引锁，并发读取不会看到修改到一半的数据。
+
+        Yields:
+            CardTransaction: 事务工作集
+
+        Raises:
+            ValueError: 事务中写入了无效卡片（tx.put 时抛出，不提交任何变更）
+        """
+        with self._write_lock:
+            tx = CardTransaction(self._index)
+
+            yield tx
+
+            if tx.dirty:
+                with self._index_lock:
+                    self._index.apply(tx.net_changes())
+                    self._touch()
+            tx.committed = True
+
+    def load_cards(self) -> List[Card]:
+        """
+        加载所有卡片
+
+        Returns:
+            List[Card]: 卡片列表
+        """
+        with self._index_lock:
+            return list(self._index.sorted_cards())
+
+    def save_cards(self, cards: List[Card]) -> bool:
+        """
+        保存卡片列表（整体替换）
+
+        Args:
+            cards: 卡片列表
+
+        Returns:
+            bool: 是否保存成功
+        """
+        with self._write_lock:
+            index = CardIndex(card for card in cards if self._accept(card))
+            with self._index_lock:
+                self._index = index
+                self._touch()
+        return True
+
+    def generation(self) -> str:
+        """获取数据版本标识（实例标记与写入代数）"""
+        with self._index_lock:
+            return f"{self._instance}:{self._config['generation']}"
+
+    def last_updated(self) -> Optional[str]:
+        """获取最后修改时间"""
+        with self._index_lock:
+            return self._config['last_updated']
+
+    def count_cards(self) -> int:
+        """获取卡片数量"""
+        with self._index_lock:
+            return len(self._index)
+
+    def columns(self) -> CardColumns:
+        """获取列式快照（缓存到下次变更）"""
+        with self._index_lock:
+            return self._index.columns()
+
+    def suggester(self) -> NameSuggester:
+        """获取名称联想快照（缓存到下次变更）"""
+        with self._index_lock:
+            return self._index.suggester()
+
+    def search_candidates(self, query: str) -> Optional[Set[str]]:
+        """获取可能包含搜索关键词的卡片ID（倒排索引）"""
+        with self._index_lock:
+            return self._index.search_candidates(query)
+
+    def get_card_by_id(self, card_id: str) -> Optional[Card]:
+        """根据ID获取卡片"""
+        with self._index_lock:
+            return self._index.get(card_id)
+
+    def card_name_exists(self, name: str, exclude_id: str = None) -> bool:
+        """检查卡片名称是否已存在（按规范化名称比较）"""
+        with self._index_lock:
+            return self._index.name_exists(name, exclude_id)
+
+    def get_next_order(self) -> int:
+        """获取下一个排序号"""
+        with self._index_lock:
+            return self._index.next_order()
+
+    def snapshot(self, path: str) -> bool:
+        """
+        将当前数据按 cards.json 格式写入磁盘
+
+        Args:
+            path: 目标文件路径
+
+        Returns:
+            bool: 是否写入成功
+        """
+        with self._index_lock:
+            data = {
+                'cards': [card.to_dict() for card in self._index.sorted_cards()],
+                'config': dict(self._config)
+            }
+
+        tmp_path = None
+        try:
+            target_dir = os.path.dirname(path) or '.'
+            os.makedirs(target_dir, exist_ok=True)
+            fd, tmp_path = tempfile.mkstemp(prefix='.cards-', suffix='.tmp', dir=target_dir)
+            with os.fdopen(fd, 'wb') as f:
+                f.write(seal_document(data, pretty=True))
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(tmp_path, path)
+            tmp_path = None
+            return True
+        except Exception as e:
+            print(f"写入快照失败: {e}")
+            return False
+        finally:
+            if tmp_path and os.path.exists(tmp_path):
+                os.remove(tmp_path)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        获取数据统计信息
+
+        Returns:
+            Dict: 统计信息
+        """
+        return {
+            "total_cards": len(self._index),
+            "last_updated": self._config['last_updated'],
+            "version": self._config['version'],
+            "data_file_size": 0,
+            "storage": "memory",
+            "generation": self._config['generation']
+        }
@@ -0,0 +1,230 @@
+"""
+卡片搜索索引
+名称与描述的 n-gram 倒排索引（三元组 + 中日韩字符二元组），
+子串查询先求倒排表交集得到候选卡片，再逐张校验
+"""
+
+import marshal
+import re
+from typing import List, Dict, Optional, Set, Iterable, Sequence
+from .card import Card
+
+# 中日韩字符：汉字（含扩展A、兼容汉字）、假名、谚文音节
+_CJK_RUN = re.compile('[぀-ヿ㐀-䶿一-鿿가-힯豈-﫿]{2,}')
+
+
+def _is_cjk_pair(text: str) -> bool:
+    """判断两个字符是否都是中日韩字符"""
+    return len(text) == 2 and _CJK_RUN.fullmatch(text) is not None
+
+
+def text_grams(text: str) -> Set[str]:
+    """
+    提取文本（已转小写）的全部 n-gram
+
+    Args:
+        text: 小写文本
+
+    Returns:
+        Set[str]: 三元组，以及连续中日韩字符的二元组
+    """
+    grams = {text[i:i + 3] for i in range(len(text) - 2)}
+    for match in _CJK_RUN.finditer(text):
+        run = match.group()
+        grams.update(run[i:i + 2] for i in range(len(run) - 1))
+    return grams
+
+
+def query_grams(query: str) -> Optional[Set[str]]:
+    """
+    提取查询词（已转小写）用于检索的 n-gram
+
+    包含查询词的文本必然包含查询词的全部三元组；两个中日韩字符的查询使用二元组。
+
+    Args:
+        query: 小写查询词
+
+    Returns:
+        Optional[Set[str]]: n-gram 集合；查询词过短无法使用索引时为None
+    """
+    if len(query) >= 3:
+        return {query[i:i + 3] for i in range(len(query) - 2)}
+    if _is_cjk_pair(query):
+        return {query}
+    return None
+
+
+def card_grams(card: Card) -> Set[str]:
+    """提取卡片名称与描述的 n-gram（分别提取，不跨字段）"""
+    return text_grams(card.name.lower()) | text_grams(card.description.lower())
+
+
+def match_ranges(text: str, query: str) -> List[List[int]]:
+    """
+    查找查询词在文本中的全部不重叠出现位置（不区分大小写）
+
+    位置以 UTF-16 码元计，可直接用于 JavaScript 的字符串下标。
+
+    Args:
+        text: 原始文本
+        query: 小写查询词
+
+    Returns:
+        List[List[int]]: [[起始, 结束), ...]
+    """
+    if not query or not text:
+        return []
+
+    lowered = text.lower()
+    index = None
+    if len(lowered) != len(text):
+        # 个别字符转小写后长度变化（如 'İ'），建立小写文本到原文的位置映射
+        pieces, index = [], []
+        for i, char in enumerate(text):
+            lower = char.lower()
+            pieces.append(lower)
+            index.extend([i] * len(lower))
+        lowered = ''.join(pieces)
+
+    ranges = []
+    position = lowered.find(query)
+    while position != -1:
+        end = position + len(query)
+        if index is None:
+            ranges.append([position, end])
+        else:
+            ranges.append([index[position], index[end - 1] + 1])
+        position = lowered.find(query, end)
+
+    if ranges and max(text) > '￿':
+        # 基本多文种平面以外的字符在 UTF-16 中占两个码元
+        units = [0]
+        for char in text:
+            units.append(units[-1] + (2 if char > '￿' else 1))
+        ranges = [[units[start], units[end]] for start, end in ranges]
+    return ranges
+
+
+def card_matches(card: Card, query: str) -> Dict[str, List[List[int]]]:
+    """
+    获取查询词在卡片名称和描述中的出现位置
+
+    Args:
+        card: 卡片对象
+        query: 查询词（不区分大小写）
+
+    Returns:
+        Dict: {'name': [[起始, 结束), ...], 'description': [...]}
+    """
+    query = (query or '').strip().lower()
+    return {
+        'name': match_ranges(card.name, query),
+        'description': match_ranges(card.description, query)
+    }
+
+
+class SearchIndex:
+    """n-gram -> 卡片ID集合 的倒排索引，随卡片增删改增量更新"""
+
+    def __init__(self, cards: Iterable[Card] = ()):
+        """
+        初始化索引
+
+        Args:
+            cards: 初始卡片
+        """
+        self.postings: Dict[str, Set[str]] = {}
+        for card in cards:
+            self.add(card)
+
+    def to_state(self, positions: Dict[str, int]) -> bytes:
+        """
+        导出倒排表（用于持久化为索引文件）
+
+        卡片ID换成其在索引文件卡片列中的行号，比重复保存ID字符串小得多。
+        结果单独以 marshal 编码：加载索引文件时只是一段字节，首次搜索时才解码。
+
+        Args:
+            positions: 卡片ID -> 行号
+
+        Returns:
+            bytes: marshal 编码的 {n-gram: [行号, ...]}
+        """
+        return marshal.dumps({gram: [positions[card_id] for card_id in ids]
+                              for gram, ids in self.postings.items()})
+
+    @classmethod
+    def from_state(cls, state: bytes, ids: Sequence[str]) -> 'SearchIndex':
+        """
+        从导出的倒排表恢复索引，无需重新提取 n-gram
+
+        Args:
+            state: to_state() 的结果
+            ids: 行号对应的卡片ID
+
+        Returns:
+            SearchIndex: 恢复的索引
+        """
+        index = cls()
+        index.postings = {gram: {ids[row] for row in rows} for gram, rows in marshal.loads(state).items()}
+        return index
+
+    def add(self, card: Card):
+        """
+        将卡片加入索引
+
+        Args:
+            card: 卡片对象
+        """
+        postings = self.postings
+        for gram in card_grams(card):
+            ids = postings.get(gram)
+            if ids is None:
+                postings[gram] = {card.id}
+            else:
+                ids.add(card.id)
+
+    def remove(self, card: Card):
+        """
+        从索引中移除卡片
+
+        Args:
+            card: 卡片对象（需与加入索引时的名称、描述一致）
+        """
+        postings = self.postings
+        for gram in card_grams(card):
+            ids = postings.get(gram)
+            if ids is not None:
+                ids.discard(card.id)
+                if not ids:
+                    del postings[gram]
+
+    def candidates(self, query: str) -> Optional[Set[str]]:
+        """
+        获取可能包含查询词的卡片ID（倒排表交集，需再逐张校验）
+
+        Args:
+            query: 查询词（不区分大小写）
+
+        Returns:
+            Optional[Set[str]]: 候选卡片ID集合（新集合）；查询词过短无法使用索引时为None
+        """
+        grams = query_grams((query or '').strip().lower())
+        if grams is None:
+            return None
+
+        postings = []
+        for gram in grams:
+            ids = self.postings.get(gram)
+            if not ids:
+                return set()
+            postings.append(ids)
+
+        # 从最短的倒排表开始求交集
+        postings.sort(key=len)
+        result = set(postings[0])
+        for ids in postings[1:]:
+            result &= ids
+            if not result:
+                break
+        return result
@@ -0,0 +1,116 @@
+"""
+JSON 编解码
+按可用性选择 orjson、simplejson 或标准库 json，统一输出 UTF-8 字节。
+API 响应和数据文件共用这一实现，三种后端的输出都是合法且语义相同的 JSON。
+"""
+
+import json
+from typing import Any, Callable, Optional, Union
+
+try:
+    import orjson
+except ImportError:  # 未安装 orjson 时使用 simplejson 或标准库
+    orjson = None
+
+try:
+    import simplejson
+except ImportError:  # 未安装 simplejson 时使用标准库
+    simplejson = None
+
+BACKENDS = ('orjson', 'simplejson', 'json')
+
+
+def available_backend(preferred: str = 'auto') -> str:
+    """
+    确定实际使用的编码后端
+
+    Args:
+        preferred: auto（按 orjson、simplejson、json 的顺序选择已安装的）或指定的后端名
+
+    Returns:
+        str: 后端名；指定的后端未安装时退回 auto 的选择
+
+    Raises:
+        ValueError: 不支持的后端名
+    """
+    if preferred not in ('auto',) + BACKENDS:
+        raise ValueError(f"不支持的 JSON 后端: {preferred}")
+    if preferred == 'orjson' and orjson is not None:
+        return 'orjson'
+    if preferred == 'simplejson' and simplejson is not None:
+        return 'simplejson'
+    if preferred == 'json':
+        return 'json'
+    if orjson is not None:
+        return 'orjson'
+    return 'simplejson' if simplejson is not None else 'json'
+
+
+# 默认后端（未指定时使用）
+BACKEND = available_backend()
+
+
+def dumps(obj: Any, sort_keys: bool = False, ensure_ascii: bool = False, indent: bool = False,
+          default: Optional[Callable[[Any], Any]] = None, backend: str = None) -> bytes:
+    """
+    将对象编码为 JSON 字节
+
+    紧凑输出不含多余空白；缩进输出每级两个空格。
+
+    Args:
+        obj: 要编码的对象
+        sort_keys: 是否按键排序
+        ensure_ascii: 是否转义非 ASCII 字符
+        indent: 是否缩进输出
+        default: 无法直接编码的对象的转换函数
+        backend: 编码后端，None 表示 BACKEND
+
+    Returns:
+        bytes: UTF-8 编码的 JSON
+    """
+    backend = backend or BACKEND
+
+    # orjson 不支持转义非 ASCII 字符，需要时交给其他后端
+    if backend == 'orjson' and not ensure_ascii:
+        option = orjson.OPT_NON_STR_KEYS | orjson.OPT_PASSTHROUGH_DATETIME
+        if sort_keys:
+            option |= orjson.OPT_SORT_KEYS
+        if indent:
+            option |= orjson.OPT_INDENT_2
+        try:
+            return orjson.dumps(obj, default=default, option=option)
+        except orjson.JSONEncodeError:
+            # 超出 64 位的整数等 orjson 不支持的值，交给标准库
+            pass
+
+    module = simplejson if backend == 'simplejson' and simplejson is not None else json
+    text = module.dumps(obj, sort_keys=sort_keys, ensure_ascii=ensure_ascii, default=default,
+                        indent=2 if indent else None,
+                        separators=None if indent else (',', ':'))
+    return text.encode('utf-8')
+
+
+def loads(data: Union[bytes, str], backend: str = None) -> Any:
+    """
+    解码 JSON
+
+    Args:
+        data: JSON 字节或字符串
+        backend: 解码后端，None 表示 BACKEND
+
+    Returns:
+        Any: 解码结果
+
+    Raises:
+        json.JSONDecodeError: JSON 格式错误（各后端的异常统一转换为标准库异常）
+    """
+    backend = backend or BACKEND
+    if backend == 'orjson':
+        # orjson.JSONDecodeError 是 json.JSONDecodeError 的子类
+        return orjson.loads(data)
+    if backend == 'simplejson' and simplejson is not None:
+        try:
+            return simplejson.loads(data)
+        except simplejson.JSONDecodeError as e:
+            raise json.JSONDecodeError(e.msg, e.doc, e.pos)
+    return json.loads(data)
@@ -0,0 +1,160 @@
+"""
+索引文件
+将构建好的卡片索引持久化到数据文件旁（cards.idx），进程冷启动时直接加载
+"""
+
+import gc
+import json
+import marshal
+import mmap
+import os
+import tempfile
+import time
+from typing import Dict, Any, Optional, Tuple
+from .index import CardIndex
+
+# 索引文件格式版本，索引结构变化时递增，旧文件会被自动重建
+SIDECAR_VERSION = 4
+SIDECAR_FORMAT = 'pelerpanel-index'
+
+
+class IndexSidecar:
+    """
+    卡片索引文件（cards.idx）
+
+    文件结构:
+        第一行为 JSON 头部 {"format", "version", "marshal", "checksum"}，
+        其后是 marshal 编码的 {"config": {...}, "meta": {...}, "index": CardIndex.to_state()}，
+        meta 记录构建索引时的校验结果（跳过的无效卡片数等），index 中包含搜索用的倒排表。
+
+    头部中的 checksum 是数据文件内容的 BLAKE2 摘要，与当前数据文件不一致时视为失效。
+    marshal 只能编码基础类型，加载时不会执行任意代码；其格式随 Python 版本变化，
+    因此头部同时记录 marshal.version。
+    """
+
+    def __init__(self, path: str):
+        """
+        初始化索引文件
+
+        Args:
+            path: 索引文件路径
+        """
+        self.path = path
+        self.stats = {
+            'loads': 0,
+            'rebuilds': 0,
+            'errors': 0,
+            'last_load_ms': 0.0,
+            'last_save_ms': 0.0
+        }
+
+    def _header(self, checksum: str) -> Dict[str, Any]:
+        """生成文件头部"""
+        return {
+            'format': SIDECAR_FORMAT,
+            'version': SIDECAR_VERSION,
+            'marshal': marshal.version,
+            'checksum': checksum
+        }
+
+    def load(self, checksum: str) -> Optional[Tuple[CardIndex, Dict[str, Any], Dict[str, Any]]]:
+        """
+        加载与数据文件摘要匹配的索引
+
+        以内存映射方式读取，摘要不匹配时只解析头部一行。
+
+        Args:
+            checksum: 当前数据文件内容的摘要
+
+        Returns:
+            Optional[Tuple[CardIndex, Dict, Dict]]: (卡片索引, 配置信息, 构建信息)，
+            文件不存在、版本不符或摘要不匹配时为None
+        """
+        start = time.perf_counter()
+        # 解码时会一次性创建大量容器对象，暂停分代回收可以省去约一半的耗时
+        gc_enabled = gc.isenabled()
+        gc.disable()
+        try:
+            with open(self.path, 'rb') as f:
+                with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                    header = json.loads(mm.readline())
+                    if header != self._header(checksum):
+                        return None
+
+                    view = memoryview(mm)
+                    try:
+                        payload = marshal.loads(view[mm.tell():])
+                    finally:
+                        view.release()
+
+            index = CardIndex.from_state(payload['index'])
+        except FileNotFoundError:
+            return None
+        except Exception as e:
+            # 空文件无法映射，损坏的文件无法解码，均按失效处理
+            self.stats['errors'] += 1
+            print(f"加载索引文件失败: {e}")
+            return None
+        finally:
+            if gc_enabled:
+                gc.enable()
+
+        self.stats['loads'] += 1
+        self.stats['last_load_ms'] = (time.perf_counter() - start) * 1000
+        return index, payload['config'], payload['meta']
+
+    def save(self, checksum: str, index: CardIndex, config: Dict[str, Any],
+             meta: Dict[str, Any] = None) -> bool:
+        """
+        原子地写入索引文件
+
+        Args:
+            checksum: 索引对应的数据文件内容摘要
+            index: 卡片索引
+            config: 配置信息
+            meta: 构建信息（校验结果等）
+
+        Returns:
+            bool: 是否写入成功
+        """
+        start = time.perf_counter()
+        tmp_path = None
+        try:
+            header = json.dumps(self._header(checksum), separators=(',', ':')).encode('utf-8')
+            payload = marshal.dumps({'config': config, 'meta': meta or {}, 'index': index.to_state()})
+
+            fd, tmp_path = tempfile.mkstemp(prefix='.cards-', suffix='.idx.tmp',
+                                            dir=os.path.dirname(self.path) or '.')
+            with os.fdopen(fd, 'wb') as f:
+                f.write(header + b'\n')
+                f.write(payload)
+            os.replace(tmp_path, self.path)
+            tmp_path = None
+
+            self.stats['rebuilds'] += 1
+            self.stats['last_save_ms'] = (time.perf_counter() - start) * 1000
+            return True
+        except Exception as e:
+            self.stats['errors'] += 1
+            print(f"写入索引文件失败: {e}")
+            return False
+        finally:
+            if tmp_path and os.path.exists(tmp_path):
+                os.remove(tmp_path)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        获取索引文件统计信息
+
+        Returns:
+            Dict: 加载/重建次数及耗时
+        """
+        return {
+            "path": self.path,
+            "size": os.path.getsize(self.path) if os.path.exists(self.path) else 0,
+            "loads": self.stats['loads'],
+            "rebuilds": self.stats['rebuilds'],
+            "errors": self.stats['errors'],
+            "last_load_ms": round(self.stats['last_load_ms'], 3),
+            "last_save_ms": round(self.stats['last_save_ms'], 3)
+        }
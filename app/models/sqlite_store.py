@@ -0,0 +1,444 @@
+"""
+SQLite 存储后端
+以行为单位读写卡片，单卡修改只影响一行数据
+"""
+
+import os
+import sqlite3
+import threading
+from contextlib import contextmanager
+from datetime import datetime
+from typing import List, Dict, Any, Optional, Iterator, Tuple
+from .card import Card, ensure_valid_card
+from .index import normalize_name
+from .storage import StorageBackend
+
+SQLITE_URL_PREFIX = 'sqlite:///'
+
+# 卡片字段列，顺序与 Card 构造参数一致
+_CARD_COLUMNS = 'id, name, icon, url, description, "order", created_time'
+
+# 按 id 原地更新；不使用 INSERT OR REPLACE，避免名称冲突时静默删除另一行
+_UPSERT_SQL = f'''
+INSERT INTO cards ({_CARD_COLUMNS}, name_key) VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+ON CONFLICT (id) DO UPDATE SET
+    name = excluded.name,
+    name_key = excluded.name_key,
+    icon = excluded.icon,
+    url = excluded.url,
+    description = excluded.description,
+    "order" = excluded."order",
+    created_time = excluded.created_time
+'''
+
+_SCHEMA = '''
+CREATE TABLE IF NOT EXISTS cards (
+    id TEXT PRIMARY KEY,
+    name TEXT NOT NULL,
+    icon TEXT NOT NULL,
+    url TEXT NOT NULL,
+    description TEXT NOT NULL DEFAULT '',
+    "order" INTEGER NOT NULL,
+    created_time TEXT NOT NULL,
+    name_key TEXT NOT NULL DEFAULT ''
+);
+CREATE UNIQUE INDEX IF NOT EXISTS idx_cards_name ON cards (name);
+CREATE INDEX IF NOT EXISTS idx_cards_order_id ON cards ("order", id);
+CREATE TABLE IF NOT EXISTS meta (
+    key TEXT PRIMARY KEY,
+    value TEXT
+);
+'''
+
+
+def is_sqlite_url(data_path: str) -> bool:
+    """
+    判断数据路径是否为 SQLite 地址
+
+    Args:
+        data_path: 数据路径，如 sqlite:///./data/cards.db
+
+    Returns:
+        bool: 是否为 SQLite 地址
+    """
+    return bool(data_path) and data_path.startswith(SQLITE_URL_PREFIX)
+
+
+def _row_to_card(row: Tuple) -> Card:
+    """将查询结果行转换为卡片对象"""
+    return Card(*row)
+
+
+def _card_to_row(card: Card) -> Tuple:
+    """将卡片对象转换为插入参数（末尾为规范化名称）"""
+    return (card.id, card.name, card.icon, card.url,
+            card.description, card.order, card.created_time, normalize_name(card.name))
+
+
+class SQLiteTransaction:
+    """SQLite 事务，接口与 CardTransaction 一致，所有操作直接作用于数据库行"""
+
+    def __init__(self, conn: sqlite3.Connection):
+        """
+        初始化事务
+
+        Args:
+            conn: 已开启事务的数据库连接
+        """
+        self._conn = conn
+        self.changes: List[Tuple[str, Optional[Card]]] = []
+        self.committed = False
+
+    @property
+    def dirty(self) -> bool:
+        """事务内是否有未提交的变更"""
+        return bool(self.changes)
+
+    def get(self, card_id: str) -> Optional[Card]:
+        """根据ID获取卡片"""
+        row = self._conn.execute(
+            f'SELECT {_CARD_COLUMNS} FROM cards WHERE id = ?', (card_id,)
+        ).fetchone()
+        return _row_to_card(row) if row else None
+
+    def name_exists(self, name: str, exclude_id: str = None) -> bool:
+        """检查规范化名称是否已存在（走 name_key 索引）"""
+        row = self._conn.execute(
+            'SELECT 1 FROM cards WHERE name_key = ? AND id IS NOT ? LIMIT 1',
+            (normalize_name(name), exclude_id)
+        ).fetchone()
+        return row is not None
+
+    def next_order(self) -> int:
+        """获取下一个排序号（走 order 索引）"""
+        row = self._conn.execute('SELECT MAX("order") FROM cards').fetchone()
+        return (row[0] or 0) + 1
+
+    def put(self, card: Card):
+        """新增或替换单行卡片（原地更新），无效卡片抛出 ValueError"""
+        ensure_valid_card(card)
+        self._conn.execute(_UPSERT_SQL, _card_to_row(card))
+        self.changes.append(('put', card))
+
+    def delete(self, card_id: str) -> Optional[Card]:
+        """删除单行卡片，返回被删除的卡片"""
+        card = self.get(card_id)
+        if card is None:
+            return None
+        self._conn.execute('DELETE FROM cards WHERE id = ?', (card_id,))
+        self.changes.append(('delete', card))
+        return card
+
+    def set_order(self, card_id: str, order: int) -> bool:
+        """修改单张卡片的排序号"""
+        cursor = self._conn.execute(
+            'UPDATE cards SET "order" = ? WHERE id = ?', (order, card_id)
+        )
+        if cursor.rowcount == 0:
+            return False
+        self.changes.append(('put', self.get(card_id)))
+        return True
+
+    def renumber(self):
+        """将排序号整理为 1..n，只改写排序号实际变化的行"""
+        cursor = self._conn.execute('''
+            UPDATE cards SET "order" = ranked.rn
+            FROM (SELECT id, ROW_NUMBER() OVER (ORDER BY "order", id) AS rn FROM cards) AS ranked
+            WHERE cards.id = ranked.id AND cards."order" != ranked.rn
+        ''')
+        if cursor.rowcount:
+            self.changes.append(('renumber', None))
+
+    def cards(self) -> List[Card]:
+        """获取按order排序的全部卡片"""
+        rows = self._conn.execute(
+            f'SELECT {_CARD_COLUMNS} FROM cards ORDER BY "order", id'
+        ).fetchall()
+        return [_row_to_card(row) for row in rows]
+
+    def __len__(self) -> int:
+        return self._conn.execute('SELECT COUNT(*) FROM cards').fetchone()[0]
+
+
+class SQLiteDataManager(StorageBackend):
+    """SQLite 数据管理器，使用 WAL 模式，支持多进程并发读"""
+
+    def __init__(self, data_path: str = 'sqlite:///./data/cards.db'):
+        """
+        初始化数据管理器
+
+        Args:
+            data_path: SQLite 地址（sqlite:///相对路径 或 sqlite:////绝对路径）
+        """
+        self.data_path = data_path
+        self.db_path = data_path[len(SQLITE_URL_PREFIX):] if is_sqlite_url(data_path) else data_path
+        self.backup_dir = os.path.join(os.path.dirname(self.db_path) or '.', 'backup')
+
+        # 每个线程使用独立连接
+        self._local = threading.local()
+
+        self._ensure_directories()
+        self._init_schema()
+
+    def _ensure_directories(self):
+        """确保必要的目录存在"""
+        data_dir = os.path.dirname(self.db_path)
+        if data_dir and not os.path.exists(data_dir):
+            os.makedirs(data_dir)
+
+        if not os.path.exists(self.backup_dir):
+            os.makedirs(self.backup_dir)
+
+    def _connect(self) -> sqlite3.Connection:
+        """
+        获取当前线程的数据库连接
+
+        Returns:
+            sqlite3.Connection: 数据库连接（自动提交模式，事务手动管理）
+        """
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            conn = sqlite3.connect(self.db_path, isolation_level=None, timeout=30)
+            conn.execute('PRAGMA journal_mode=WAL')
+            conn.execute('PRAGMA synchronous=NORMAL')
+            self._local.conn = conn
+        return conn
+
+    def _init_schema(self):
+        """初始化表结构和元数据"""
+        conn = self._connect()
+        conn.executescript(_SCHEMA)
+        # 旧版本只按排序号建索引，已由 (排序号, 卡片ID) 索引取代
+        conn.execute('DROP INDEX IF EXISTS idx_cards_order')
+        self._migrate_name_key(conn)
+        conn.execute(
+            "INSERT OR IGNORE INTO meta (key, value) VALUES ('version', '1.0')"
+        )
+        conn.execute(
+            "INSERT OR IGNORE INTO meta (key, value) VALUES ('last_updated', ?)",
+            (datetime.now().isoformat(),)
+        )
+        conn.execute(
+            "INSERT OR IGNORE INTO meta (key, value) VALUES ('generation', '0')"
+        )
+
+    def _migrate_name_key(self, conn: sqlite3.Connection):
+        """
+        为旧数据库补充规范化名称列及索引
+
+        规范化规则（NFKC + casefold）无法用 SQL 表达，因此由 Python 回填。
+
+        Args:
+            conn: 数据库连接
+        """
+        def has_name_key() -> bool:
+            return any(row[1] == 'name_key' for row in conn.execute('PRAGMA table_info(cards)'))
+
+        if not has_name_key():
+            conn.execute('BEGIN IMMEDIATE')
+            try:
+                # 获取写锁后再检查一次，其他进程可能已完成迁移
+                if not has_name_key():
+                    conn.execute("ALTER TABLE cards ADD COLUMN name_key TEXT NOT NULL DEFAULT ''")
+                    rows = conn.execute('SELECT id, name FROM cards').fetchall()
+                    conn.executemany('UPDATE cards SET name_key = ? WHERE id = ?',
+                                     [(normalize_name(name), card_id) for card_id, name in rows])
+                conn.execute('COMMIT')
+            except BaseException:
+                conn.execute('ROLLBACK')
+                raise
+        conn.execute('CREATE INDEX IF NOT EXISTS idx_cards_name_key ON cards (name_key)')
+
+    @contextmanager
+    def transaction(self) -> Iterator[SQLiteTransaction]:
+        """
+        卡片事务上下文管理器
+
+        使用 BEGIN IMMEDIATE 在开始时获取写锁，保证"检查-修改"的原子性；
+        正常退出时提交，发生异常时回滚。
+
+        Yields:
+            SQLiteTransaction: 事务对象
+        """
+        conn = self._connect()
+        conn.execute('BEGIN IMMEDIATE')
+        tx = SQLiteTransaction(conn)
+        try:
+            yield tx
+            if tx.dirty:
+                conn.execute(
+                    "UPDATE meta SET value = ? WHERE key = 'last_updated'",
+                    (datetime.now().isoformat(),)
+                )
+                # 写入代数，其他进程据此判断缓存是否失效
+                conn.execute(
+                    "UPDATE meta SET value = CAST(value AS INTEGER) + 1 WHERE key = 'generation'"
+                )
+            conn.execute('COMMIT')
+            tx.committed = True
+        except BaseException:
+            conn.execute('ROLLBACK')
+            raise
+
+    def load_cards(self) -> List[Card]:
+        """
+        加载所有卡片
+
+        Returns:
+            List[Card]: 卡片列表
+        """
+        try:
+            rows = self._connect().execute(
+                f'SELECT {_CARD_COLUMNS} FROM cards ORDER BY "order", id'
+            ).fetchall()
+            return [_row_to_card(row) for row in rows]
+        except Exception as e:
+            print(f"加载卡片失败: {e}")
+            return []
+
+    def save_cards(self, cards: List[Card]) -> bool:
+        """
+        保存卡片列表（整体替换）
+
+        Args:
+            cards: 卡片列表
+
+        Returns:
+            bool: 是否保存成功
+        """
+        try:
+            with self.transaction() as tx:
+                self._connect().execute('DELETE FROM cards')
+                for card in cards:
+                    tx.put(card)
+            return tx.committed
+        except Exception as e:
+            print(f"保存卡片失败: {e}")
+            return False
+
+    def get_card_by_id(self, card_id: str) -> Optional[Card]:
+        """根据ID获取卡片"""
+        row = self._connect().execute(
+            f'SELECT {_CARD_COLUMNS} FROM cards WHERE id = ?', (card_id,)
+        ).fetchone()
+        return _row_to_card(row) if row else None
+
+    def cards_after(self, after: Optional[Tuple[int, str]], limit: int) -> List[Card]:
+        """
+        按 (order, id) 顺序取 keyset 游标之后的一页卡片（由 (排序号, 卡片ID) 索引直接定位）
+
+        与 JSON 和内存后端使用同一个键，游标卡片已不存在或改了排序号时从排在游标之后的第一张开始。
+        """
+        if after is None:
+            rows = self._connect().execute(
+                f'SELECT {_CARD_COLUMNS} FROM cards ORDER BY "order", id LIMIT ?', (limit,)
+            ).fetchall()
+        else:
+            order, card_id = after
+            rows = self._connect().execute(
+                f'''SELECT {_CARD_COLUMNS} FROM cards
+                WHERE ("order", id) > (?, ?)
+                ORDER BY "order", id LIMIT ?''',
+                (order, card_id, limit)
+            ).fetchall()
+        return [_row_to_card(row) for row in rows]
+
+    def generation(self) -> Optional[str]:
+        """
+        获取数据版本标识
+
+        由 meta 表中的写入代数（每次有变更的事务提交时加一）和最后修改时间组成，
+        数据库文件被替换、代数从零开始时也不会与之前的版本混淆。
+
+        Returns:
+            Optional[str]: 版本标识，读取失败时为None
+        """
+        try:
+            meta = dict(self._connect().execute(
+                "SELECT key, value FROM meta WHERE key IN ('generation', 'last_updated')"
+            ).fetchall())
+            return f"{meta.get('generation', 0)}:{meta.get('last_updated')}"
+        except Exception as e:
+            print(f"读取数据版本失败: {e}")
+            return None
+
+    def last_updated(self) -> Optional[str]:
+        """获取最后修改时间"""
+        try:
+            row = self._connect().execute("SELECT value FROM meta WHERE key = 'last_updated'").fetchone()
+            return row[0] if row else None
+        except Exception as e:
+            print(f"读取数据版本失败: {e}")
+            return None
+
+    def count_cards(self) -> int:
+        """获取卡片数量"""
+        try:
+            return self._connect().execute('SELECT COUNT(*) FROM cards').fetchone()[0]
+        except Exception as e:
+            print(f"读取卡片数量失败: {e}")
+            return 0
+
+    def card_name_exists(self, name: str, exclude_id: str = None) -> bool:
+        """检查卡片名称是否已存在（按规范化名称比较）"""
+        row = self._connect().execute(
+            'SELECT 1 FROM cards WHERE name_key = ? AND id IS NOT ? LIMIT 1',
+            (normalize_name(name), exclude_id)
+        ).fetchone()
+        return row is not None
+
+    def get_next_order(self) -> int:
+        """获取下一个排序号"""
+        row = self._connect().execute('SELECT MAX("order") FROM cards').fetchone()
+        return (row[0] or 0) + 1
+
+    def backup_data(self) -> bool:
+        """
+        使用 SQLite 在线备份接口备份数据库
+
+        Returns:
+            bool: 备份是否成功
+        """
+        try:
+            timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
+            backup_path = os.path.join(self.backup_dir, f"cards_backup_{timestamp}.db")
+            target = sqlite3.connect(backup_path)
+            try:
+                self._connect().backup(target)
+            finally:
+                target.close()
+            print(f"数据已备份到: {backup_path}")
+            return True
+        except Exception as e:
+            print(f"备份失败: {e}")
+            return False
+
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        获取数据统计信息
+
+        Returns:
+            Dict: 统计信息
+        """
+        try:
+            conn = self._connect()
+            total = conn.execute('SELECT COUNT(*) FROM cards').fetchone()[0]
+            meta = dict(conn.execute('SELECT key, value FROM meta').fetchall())
+
+            return {
+                "total_cards": total,
+                "last_updated": meta.get('last_updated'),
+                "version": meta.get('version', '1.0'),
+                "data_file_size": os.path.getsize(self.db_path) if os.path.exists(self.db_path) else 0,
+                "storage": "sqlite",
+                "generation": int(meta.get('generation', 0))
+            }
+        except Exception as e:
+            print(f"获取统计信息失败: {e}")
+            return {
+                "total_cards": 0,
+                "last_updated": None,
+                "version": "1.0",
+                "data_file_size": 0,
+                "storage": "sqlite"
+            }
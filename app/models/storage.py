@@ -0,0 +1,238 @@
+"""
+存储后端接口
+定义卡片数据存储需要实现的操作，数据管理器按 DATA_PATH 选择具体实现
+"""
+
+from abc import ABC, abstractmethod
+from contextlib import contextmanager
+from typing import List, Dict, Any, Optional, Set, Tuple, Iterator
+from .card import Card
+from .columns import CardColumns
+from .suggest import NameSuggester
+
+
+class DataValidationError(Exception):
+    """
+    数据文件中有无效的卡片且校验模式为 strict
+
+    读取接口不会把它当作普通的读取失败吞掉（返回空结果），而是继续抛出，
+    API 返回 500，避免在数据有问题时展示一个空的面板。
+    """
+
+
+class StorageBackend(ABC):
+    """卡片存储后端基类"""
+
+    # 列表查询是否使用列式快照（由 create_data_manager 按 DATA_COLUMNAR 设置）
+    columnar = True
+
+    @abstractmethod
+    def load_cards(self) -> List[Card]:
+        """
+        加载所有卡片
+
+        Returns:
+            List[Card]: 按order排序的卡片列表
+        """
+
+    @abstractmethod
+    def get_card_by_id(self, card_id: str) -> Optional[Card]:
+        """
+        根据ID获取卡片
+
+        Args:
+            card_id: 卡片ID
+
+        Returns:
+            Optional[Card]: 找到的卡片或None
+        """
+
+    @abstractmethod
+    def card_name_exists(self, name: str, exclude_id: str = None) -> bool:
+        """
+        检查卡片名称是否已存在
+
+        Args:
+            name: 要检查的名称
+            exclude_id: 排除的卡片ID（用于更新时检查）
+
+        Returns:
+            bool: 名称是否已存在
+        """
+
+    @abstractmethod
+    def get_next_order(self) -> int:
+        """
+        获取下一个排序号
+
+        Returns:
+            int: 下一个可用的排序号
+        """
+
+    @abstractmethod
+    def save_cards(self, cards: List[Card]) -> bool:
+        """
+        用给定列表整体替换卡片数据
+
+        Args:
+            cards: 卡片列表
+
+        Returns:
+            bool: 是否保存成功
+        """
+
+    @abstractmethod
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        获取数据统计信息
+
+        Returns:
+            Dict: 统计信息，至少包含 total_cards、last_updated、version
+        """
+
+    @abstractmethod
+    @contextmanager
+    def transaction(self) -> Iterator[Any]:
+        """
+        卡片事务上下文管理器
+
+        产出的事务对象需提供 get、name_exists、next_order、put、delete、
+        set_order、renumber 方法以及 dirty、committed 属性（参见 CardTransaction）。
+        正常退出时提交，发生异常时放弃全部变更。
+        """
+
+    def generation(self) -> Optional[str]:
+        """
+        获取数据版本标识，任何写入之后都会变化
+
+        同一份数据在不同进程中、重启之后得到相同的标识，可用作响应缓存键和 ETag：
+        写入使版本变化，旧缓存不再命中，无需显式清除。
+        默认不提供（返回None，调用方不缓存）。
+
+        Returns:
+            Optional[str]: 版本标识，不支持时为None
+        """
+        return None
+
+    def last_updated(self) -> Optional[str]:
+        """
+        获取最后修改时间
+
+        Returns:
+            Optional[str]: ISO 格式的本地时间，未知时为None
+        """
+        return self.get_stats().get('last_updated')
+
+    def count_cards(self) -> int:
+        """
+        获取卡片数量
+
+        默认取 get_stats() 中的 total_cards；能直接计数的后端应覆盖此方法，避免加载全部卡片。
+
+        Returns:
+            int: 卡片数量
+        """
+        return self.get_stats().get('total_cards', 0)
+
+    def columns(self) -> CardColumns:
+        """
+        获取当前卡片的列式快照，用于批量过滤、排序和分页
+
+        默认每次根据 load_cards() 重新构建；维护内存索引的后端会缓存到下次变更。
+
+        Returns:
+            CardColumns: 列式快照
+        """
+        return CardColumns(self.load_cards())
+
+    def cards_after(self, after: Optional[Tuple[int, str]], limit: int) -> List[Card]:
+        """
+        按 (order, id) 顺序取 keyset 游标之后的一页卡片
+
+        默认在列式快照上二分定位；维护内存索引的后端复用缓存的快照，
+        耗时与卡片总数无关。
+
+        Args:
+            after: 游标 (排序号, 卡片ID)，None 表示从第一张开始
+            limit: 最多返回的卡片数
+
+        Returns:
+            List[Card]: 卡片列表
+        """
+        columns = self.columns()
+        start = columns.seek(after)
+        return columns.cards[start:start + limit]
+
+    def suggester(self) -> NameSuggester:
+        """
+        获取名称联想快照
+
+        默认每次根据 load_cards() 重新构建；维护内存索引的后端会缓存到下次变更。
+
+        Returns:
+            NameSuggester: 名称联想快照
+        """
+        return NameSuggester(self.load_cards())
+
+    def search_candidates(self, query: str) -> Optional[Set[str]]:
+        """
+        获取可能包含搜索关键词的卡片ID，用于缩小 CardColumns.filter 的扫描范围
+
+        默认不提供（返回None，由 filter 扫描全部卡片）；维护内存索引的后端通过倒排索引实现。
+        候选集合可能多于真正匹配的卡片，但不会遗漏。
+
+        Args:
+            query: 搜索关键词
+
+        Returns:
+            Optional[Set[str]]: 候选卡片ID集合，无法使用索引时为None
+        """
+        return None
+
+    def upsert_card(self, card: Card) -> bool:
+        """
+        新增或替换单张卡片
+
+        Args:
+            card: 卡片对象
+
+        Returns:
+            bool: 是否保存成功
+        """
+        with self.transaction() as tx:
+            tx.put(card)
+        return tx.committed
+
+    def delete_card(self, card_id: str) -> bool:
+        """
+        删除单张卡片并整理排序号
+
+        Args:
+            card_id: 卡片ID
+
+        Returns:
+            bool: 是否删除成功（卡片不存在时为False）
+        """
+        with self.transaction() as tx:
+            if tx.delete(card_id) is None:
+                return False
+            tx.renumber()
+        return tx.committed
+
+    def reorder(self, orders: Dict[str, int]) -> bool:
+        """
+        批量修改卡片排序号
+
+        Args:
+            orders: 卡片ID到新排序号的映射
+
+        Returns:
+            bool: 是否保存成功（存在未知ID时为False且不做任何修改）
+        """
+        with self.transaction() as tx:
+            for card_id in orders:
+                if tx.get(card_id) is None:
+                    return False
+            for card_id, order in orders.items():
+                tx.set_order(card_id, order)
+        return tx.committed
@@ -0,0 +1,234 @@
+"""
+名称联想
+按规范化名称排序的前缀表（等价于一棵压缩的字典树），用于边输入边搜索和快速启动：
+前缀匹配用二分查找定位区间，没有足够结果时在同一张表上做有界编辑距离的模糊匹配。
+"""
+
+from bisect import bisect_left, bisect_right
+from heapq import nsmallest
+from typing import List, Dict, Tuple, Iterable
+from .card import Card, normalize_name
+
+# 前缀区间超过此大小时预先计算排名靠前的卡片，查询时不再逐个比较
+HEAVY_RANGE = 256
+# 单次联想返回数量上限
+MAX_SUGGESTIONS = 20
+# 单次模糊匹配最多计算的动态规划行数，名称高度相似（如大量编号名称）时限制耗时
+FUZZY_BUDGET = 512
+
+
+def _prefix_end(prefix: str) -> str:
+    """比所有以 prefix 开头的字符串都大的最小字符串（用于二分查找区间右端）"""
+    return prefix + '\U0010ffff'
+
+
+def max_distance(query: str) -> int:
+    """
+    模糊匹配允许的编辑距离
+
+    Args:
+        query: 规范化后的查询词
+
+    Returns:
+        int: 两个字符以内不做模糊匹配，五个字符以内允许1处错误，更长允许2处
+    """
+    if len(query) <= 2:
+        return 0
+    return 1 if len(query) <= 5 else 2
+
+
+class NameSuggester:
+    """
+    卡片名称联想的只读快照
+
+    行按 (规范化名称, 排序号) 排序，同一前缀的名称占据连续区间。
+    区间内按排序号排名（名称与查询词完全相同的优先）。
+    """
+
+    def __init__(self, cards: Iterable[Card]):
+        """
+        构建快照
+
+        Args:
+            cards: 卡片
+        """
+        entries = sorted((normalize_name(card.name), card.order, card.id, card.name) for card in cards)
+        self.keys: List[str] = [entry[0] for entry in entries]
+        self.orders: List[int] = [entry[1] for entry in entries]
+        self.ids: List[str] = [entry[2] for entry in entries]
+        self.names: List[str] = [entry[3] for entry in entries]
+        # 大区间 (起始行, 结束行) -> 排序号最小的若干行
+        self._top: Dict[Tuple[int, int], List[int]] = {}
+        self._build_top()
+
+    def __len__(self) -> int:
+        return len(self.keys)
+
+    def _build_top(self):
+        """
+        为超过 HEAVY_RANGE 的前缀区间预先计算排名
+
+        只在分叉处计算：区间的公共前缀由首尾两行决定，没有分叉的前缀与其子前缀区间相同。
+        """
+        keys, orders = self.keys, self.orders
+        stack = [(0, len(keys))]
+        while stack:
+            lo, hi = stack.pop()
+            if hi - lo <= HEAVY_RANGE:
+                continue
+            self._top[(lo, hi)] = nsmallest(MAX_SUGGESTIONS, range(lo, hi), key=orders.__getitem__)
+
+            # 首尾两行的公共前缀即整个区间的公共前缀
+            first, last = keys[lo], keys[hi - 1]
+            depth = 0
+            limit = min(len(first), len(last))
+            while depth < limit and first[depth] == last[depth]:
+                depth += 1
+            prefix = first[:depth]
+
+            # 名称恰好等于公共前缀的行排在最前，其余按下一个字符分组
+            start = bisect_right(keys, prefix, lo, hi)
+            while start < hi:
+                child = keys[start][:depth + 1]
+                end = bisect_left(keys, _prefix_end(child), start, hi)
+                stack.append((start, end))
+                start = end
+
+    def _ranked(self, lo: int, hi: int) -> List[int]:
+        """区间内按排序号排名的行（最多 MAX_SUGGESTIONS 个）"""
+        top = self._top.get((lo, hi))
+        if top is None:
+            top = nsmallest(MAX_SUGGESTIONS, range(lo, hi), key=self.orders.__getitem__)
+        return top
+
+    def _prefix_rows(self, query: str, limit: int) -> List[int]:
+        """前缀匹配的行，名称与查询词完全相同的优先"""
+        keys = self.keys
+        lo = bisect_left(keys, query)
+        hi = bisect_left(keys, _prefix_end(query), lo)
+        if lo >= hi:
+            return []
+
+        # 完全相同的名称位于区间开头，且已按排序号排列
+        exact_end = bisect_right(keys, query, lo, hi)
+        rows = list(range(lo, min(exact_end, lo + limit)))
+        for row in self._ranked(lo, hi):
+            if len(rows) >= limit:
+                break
+            if row >= exact_end:
+                rows.append(row)
+        return rows
+
+    def _fuzzy_ranges(self, query: str, distance: int, budget: int) -> Tuple[List[Tuple[int, int, int]], int]:
+        """
+        查找名称前缀与查询词编辑距离不超过 distance 的区间
+
+        在排序表上模拟字典树的深度优先遍历：相邻名称共享前缀的动态规划行，
+        某一前缀继续延长已不可能更接近查询词时用二分查找跳过整棵子树。
+        距离超过上限的格子统一记为 distance + 1。
+
+        Args:
+            query: 规范化后的查询词
+            distance: 最大编辑距离
+            budget: 最多计算的动态规划行数，用完时提前结束
+
+        Returns:
+            Tuple[List, int]: ([(编辑距离, 起始行, 结束行), ...], 剩余行数)，
+            区间可能嵌套，内层区间的距离更小
+        """
+        keys = self.keys
+        size = len(query)
+        far = distance + 1
+        rows = [[min(j, far) for j in range(size + 1)]]
+        # best[k]: 路径上前 k 个字符组成的各前缀中与查询词的最小距离
+        best = [size]
+        previous = ''
+        found = []
+
+        i, n = 0, len(keys)
+        while i < n and budget > 0:
+            key = keys[i]
+            # 复用与上一个名称公共前缀部分的动态规划行
+            common = 0
+            limit = min(len(previous), len(key), len(rows) - 1)
+            while common < limit and previous[common] == key[common]:
+                common += 1
+            del rows[common + 1:]
+            del best[common + 1:]
+            previous = key
+
+            depth = common
+            while depth < len(key):
+                char = key[depth]
+                above = rows[-1]
+                depth += 1
+                budget -= 1
+                # 只计算对角线两侧 distance 以内的格子，带外的距离必然超出上限
+                row = [far] * (size + 1)
+                row[0] = depth
+                for j in range(max(1, depth - distance), min(size, depth + distance) + 1):
+                    row[j] = min(row[j - 1] + 1, above[j] + 1,
+                                 above[j - 1] + (query[j - 1] != char))
+
+                if min(row) > distance or min(row) >= best[-1]:
+                    # 继续延长前缀不会更接近查询词，跳过整棵子树
+                    i = bisect_left(keys, _prefix_end(key[:depth]), i)
+                    break
+
+                rows.append(row)
+                best.append(min(best[-1], row[-1]))
+                if row[-1] < best[-2] and row[-1] <= distance:
+                    end = bisect_left(keys, _prefix_end(key[:depth]), i)
+                    found.append((row[-1], i, end))
+            else:
+                i += 1
+        return found, budget
+
+    def suggest(self, query: str, limit: int = 8) -> List[Dict[str, str]]:
+        """
+        名称联想
+
+        先取规范化名称以查询词开头的卡片；没有前缀匹配时，
+        改为查找名称前缀与查询词编辑距离在允许范围内的卡片（距离小的优先）。
+        同一档内按排序号排名。
+
+        Args:
+            query: 输入的查询词
+            limit: 返回数量（1 到 MAX_SUGGESTIONS）
+
+        Returns:
+            List[Dict]: [{'id': 卡片ID, 'name': 卡片名称}, ...]
+        """
+        query = normalize_name(query or '')
+        limit = max(1, min(limit, MAX_SUGGESTIONS))
+        if not query or not self.keys:
+            return []
+
+        rows = self._prefix_rows(query, limit)
+        distance = max_distance(query)
+        if not rows and distance:
+            # 逐步放宽编辑距离，近似结果足够时不再搜索更远的名称
+            budget = FUZZY_BUDGET
+            ranges = []
+            for bound in range(1, distance + 1):
+                # 预算在更远一档中途用完时，仍保留较近一档的完整结果
+                found, budget = self._fuzzy_ranges(query, bound, budget)
+                ranges.extend(found)
+                covered, covered_end = 0, 0
+                for _, lo, hi in found:
+                    if lo >= covered_end:
+                        covered += hi - lo
+                        covered_end = hi
+                if covered >= limit or budget <= 0:
+                    break
+
+            # 区间可能嵌套，同一行取最小距离
+            distances = {}
+            for dist, lo, hi in ranges:
+                for row in self._ranked(lo, hi):
+                    if distances.get(row, dist + 1) > dist:
+                        distances[row] = dist
+            candidates = sorted(distances, key=lambda row: (distances[row], self.orders[row]))
+            rows.extend(candidates[:limit - len(rows)])
+
+        return [{'id': self.ids[row], 'name': self.names[row]} for row in rows]
@@ -0,0 +1,192 @@
+"""
+卡片事务
+一次读取、一次提交的卡片工作集（Unit of Work）
+"""
+
+from typing import List, Dict, Optional, Set, Tuple
+from .card import Card, ensure_valid_card
+from .index import CardIndex, normalize_name
+
+
+class CardTransaction:
+    """
+    卡片事务工作集，在内存中累积变更，由数据管理器统一提交
+
+    工作集是叠加在只读 CardIndex 之上的变更层：开启事务不复制卡片集合，
+    查询先查本事务的变更再查基础索引，均为 O(1)。
+    """
+
+    def __init__(self, base: CardIndex):
+        """
+        初始化事务工作集
+
+        Args:
+            base: 事务开始时的卡片索引（不会被修改）
+        """
+        self._base = base
+        # 本事务修改过的卡片: id -> 最新卡片，None 表示已删除
+        self._local: Dict[str, Optional[Card]] = {}
+        self._deleted: Dict[str, Card] = {}
+        self._local_names: Dict[str, Set[str]] = {}
+        # 是否改动了基础索引中排序号最大的卡片（此时不能直接使用基础索引的最大值）
+        self._base_max_touched = False
+
+        # 变更记录: [('put' | 'delete', card), ...]
+        self.changes: List[Tuple[str, Card]] = []
+
+        # 提交结果，由数据管理器在事务结束时设置
+        self.committed = False
+
+    @property
+    def dirty(self) -> bool:
+        """事务内是否有未提交的变更"""
+        return bool(self.changes)
+
+    def get(self, card_id: str) -> Optional[Card]:
+        """
+        根据ID获取卡片
+
+        Args:
+            card_id: 卡片ID
+
+        Returns:
+            Optional[Card]: 找到的卡片或None
+        """
+        if card_id in self._local:
+            return self._local[card_id]
+        return self._base.get(card_id)
+
+    def name_exists(self, name: str, exclude_id: str = None) -> bool:
+        """
+        检查规范化后的名称是否已存在
+
+        Args:
+            name: 要检查的名称
+            exclude_id: 排除的卡片ID（用于更新时检查）
+
+        Returns:
+            bool: 名称是否已存在
+        """
+        key = normalize_name(name)
+        candidates = set(self._base.by_name.get(key, ())) | self._local_names.get(key, set())
+
+        # 以工作集中的最新状态为准，过滤掉已改名或已删除的卡片
+        for card_id in candidates:
+            if card_id == exclude_id:
+                continue
+            card = self.get(card_id)
+            if card is not None and normalize_name(card.name) == key:
+                return True
+        return False
+
+    def next_order(self) -> int:
+        """
+        获取下一个排序号
+
+        Returns:
+            int: 下一个可用的排序号
+        """
+        if self._base_max_touched:
+            return max((card.order for card in self.cards()), default=0) + 1
+
+        local_max = max((card.order for card in self._local.values() if card is not None), default=0)
+        return max(self._base.max_order, local_max) + 1
+
+    def _touch_base(self, card_id: str):
+        """记录对基础索引中卡片的修改"""
+        base_card = self._base.get(card_id)
+        if base_card is not None and base_card.order == self._base.max_order:
+            self._base_max_touched = True
+
+    def put(self, card: Card):
+        """
+        新增或替换卡片
+
+        Args:
+            card: 卡片对象
+
+        Raises:
+            ValueError: 卡片数据无效
+        """
+        ensure_valid_card(card)
+        self._touch_base(card.id)
+        self._local[card.id] = card
+        self._local_names.setdefault(normalize_name(card.name), set()).add(card.id)
+        self.changes.append(('put', card))
+
+    def delete(self, card_id: str) -> Optional[Card]:
+        """
+        删除卡片
+
+        Args:
+            card_id: 卡片ID
+
+        Returns:
+            Optional[Card]: 被删除的卡片，不存在时为None
+        """
+        card = self.get(card_id)
+        if card is None:
+            return None
+
+        self._touch_base(card_id)
+        self._local[card_id] = None
+        self._deleted[card_id] = card
+        self.changes.append(('delete', card))
+        return card
+
+    def set_order(self, card_id: str, order: int) -> bool:
+        """
+        修改卡片排序号
+
+        Args:
+            card_id: 卡片ID
+            order: 新的排序号
+
+        Returns:
+            bool: 卡片是否存在
+        """
+        card = self.get(card_id)
+        if card is None:
+            return False
+
+        if card.order != order:
+            self.put(card.replace(order=order))
+        return True
+
+    def renumber(self):
+        """按当前顺序将排序号重新整理为 1..n，仅改写发生变化的卡片"""
+        for i, card in enumerate(self.cards()):
+            if card.order != i + 1:
+                self.put(card.replace(order=i + 1))
+
+    def net_changes(self) -> List[Tuple[str, Card]]:
+        """
+        获取合并后的净变更，每张卡片只保留最终状态
+
+        Returns:
+            List[Tuple[str, Card]]: [('put', 最终卡片) | ('delete', 被删除的卡片), ...]
+        """
+        return [
+            ('put', card) if card is not None else ('delete', self._deleted[card_id])
+            for card_id, card in self._local.items()
+        ]
+
+    def cards(self) -> List[Card]:
+        """
+        获取事务内的卡片列表
+
+        Returns:
+            List[Card]: 按 (order, id) 排序的卡片列表
+        """
+        if not self._local:
+            return list(self._base.sorted_cards())
+
+        cards = [self._local.get(card.id, card) for card in self._base.by_id.values()]
+        cards.extend(card for card_id, card in self._local.items()
+                     if card is not None and card_id not in self._base)
+        return sorted((card for card in cards if card is not None), key=lambda x: (x.order, x.id))
+
+    def __len__(self) -> int:
+        added = sum(1 for card_id, card in self._local.items() if card is not None and card_id not in self._base)
+        removed = sum(1 for card_id, card in self._local.items() if card is None and card_id in self._base)
+        return len(self._base) + added - removed
@@ -0,0 +1,219 @@
+"""
+卡片访问统计
+记录每张卡片被打开的次数，用于按使用频率排序。
+计数保存在数据目录下的 usage.json，写入有节流，进程退出时补写；
+多个 worker 进程共享同一个统计文件，写入时合并各自的增量。
+"""
+
+import atexit
+import json
+import os
+import tempfile
+import threading
+import time
+from typing import Dict, Optional, Set, Tuple
+from .filelock import FileLock
+from .sqlite_store import is_sqlite_url, SQLITE_URL_PREFIX
+from .memory_store import is_memory_path
+
+USAGE_FILE = 'usage.json'
+
+
+def usage_path(data_path: str) -> Optional[str]:
+    """
+    根据数据路径确定访问统计文件的位置
+
+    Args:
+        data_path: 数据路径（JSON 文件、sqlite:/// 地址或 :memory:）
+
+    Returns:
+        Optional[str]: 统计文件路径，内存存储时为None（只保存在内存中）
+    """
+    if is_memory_path(data_path):
+        return None
+    if is_sqlite_url(data_path):
+        data_path = data_path[len(SQLITE_URL_PREFIX):]
+    return os.path.join(os.path.dirname(data_path) or '.', USAGE_FILE)
+
+
+class UsageCounter:
+    """
+    卡片访问计数（线程安全，多个进程可共享同一个统计文件）
+
+    每个进程只累积上次写入之后的增量，写入时在文件锁内重新读取统计文件、
+    加上增量后原子替换，不会覆盖其他进程的计数。统计文件被其他进程改写后
+    （按 mtime、大小和 inode 判断）读取时重新加载，各进程的 usage 排序一致。
+
+    generation 在每次计数变化时递增，依赖计数的缓存以此判断是否失效。
+    """
+
+    def __init__(self, path: Optional[str] = None, flush_interval: float = 5.0):
+        """
+        初始化计数器
+
+        Args:
+            path: 统计文件路径，None 表示不持久化
+            flush_interval: 两次写入统计文件的最短间隔（秒）
+        """
+        self.path = path
+        self.flush_interval = flush_interval
+        self._generation = 0
+        # 统计文件中的计数加上本进程尚未写入的增量
+        self._counts: Dict[str, int] = {}
+        self._pending: Dict[str, int] = {}
+        self._forgotten: Set[str] = set()
+        self._stat: Optional[Tuple[int, int, int]] = None
+        self._lock = threading.Lock()
+        self._last_flush = 0.0
+
+        if path:
+            self._file_lock = FileLock(path + '.lock')
+            with self._lock:
+                self._refresh()
+            atexit.register(self.flush)
+
+    @property
+    def generation(self) -> int:
+        """计数版本，统计文件被其他进程改写后同样递增"""
+        with self._lock:
+            self._refresh()
+            return self._generation
+
+    def _file_stat(self) -> Optional[Tuple[int, int, int]]:
+        """统计文件的 (mtime_ns, size, inode)，文件不存在时为None"""
+        try:
+            st = os.stat(self.path)
+        except FileNotFoundError:
+            return None
+        return st.st_mtime_ns, st.st_size, st.st_ino
+
+    def _read(self) -> Dict[str, int]:
+        """读取统计文件，文件不存在或损坏时返回空计数"""
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                counts = json.load(f)
+            return {str(card_id): int(count) for card_id, count in counts.items() if int(count) > 0}
+        except FileNotFoundError:
+            return {}
+        except Exception as e:
+            print(f"加载访问统计失败: {e}")
+            return {}
+
+    def _adopt(self, stored: Dict[str, int]):
+        """以统计文件中的计数为基础叠加本进程的增量（调用方持有 _lock）"""
+        counts = {card_id: count for card_id, count in stored.items() if card_id not in self._forgotten}
+        for card_id, delta in self._pending.items():
+            counts[card_id] = counts.get(card_id, 0) + delta
+        if counts != self._counts:
+            self._counts = counts
+            self._generation += 1
+
+    def _refresh(self):
+        """统计文件变化时重新加载（调用方持有 _lock）"""
+        if not self.path:
+            return
+        stat = self._file_stat()
+        if stat == self._stat:
+            return
+        self._stat = stat
+        self._adopt(self._read())
+
+    def hit(self, card_id: str) -> int:
+        """
+        记录一次访问
+
+        Args:
+            card_id: 卡片ID
+
+        Returns:
+            int: 该卡片的累计访问次数（包括其他进程已写入的访问）
+        """
+        with self._lock:
+            self._refresh()
+            count = self._counts.get(card_id, 0) + 1
+            self._counts[card_id] = count
+            if self.path:
+                self._pending[card_id] = self._pending.get(card_id, 0) + 1
+            self._generation += 1
+            due = time.monotonic() - self._last_flush >= self.flush_interval
+        if due:
+            self.flush()
+        return count
+
+    def forget(self, card_id: str):
+        """
+        删除卡片的访问记录
+
+        Args:
+            card_id: 卡片ID
+        """
+        with self._lock:
+            self._pending.pop(card_id, None)
+            if self.path:
+                self._forgotten.add(card_id)
+            if self._counts.pop(card_id, None) is not None:
+                self._generation += 1
+
+    def count(self, card_id: str) -> int:
+        """获取卡片的访问次数"""
+        with self._lock:
+            self._refresh()
+            return self._counts.get(card_id, 0)
+
+    def counts(self) -> Dict[str, int]:
+        """
+        获取全部访问次数
+
+        Returns:
+            Dict[str, int]: 卡片ID -> 访问次数（副本）
+        """
+        with self._lock:
+            self._refresh()
+            return dict(self._counts)
+
+    def flush(self) -> bool:
+        """
+        将本进程的增量合并进统计文件（没有变化时跳过）
+
+        在文件锁内重新读取统计文件，加上增量、去掉已删除卡片的记录后原子替换，
+        其他进程在两次读取之间写入的计数不会丢失。
+
+        Returns:
+            bool: 是否写入成功
+        """
+        if not self.path:
+            return True
+
+        with self._lock:
+            if not self._pending and not self._forgotten:
+                return True
+            self._last_flush = time.monotonic()
+
+            tmp_path = None
+            try:
+                directory = os.path.dirname(self.path) or '.'
+                os.makedirs(directory, exist_ok=True)
+                with self._file_lock:
+                    stored = self._read()
+                    for card_id in self._forgotten:
+                        stored.pop(card_id, None)
+                    for card_id, delta in self._pending.items():
+                        stored[card_id] = stored.get(card_id, 0) + delta
+
+                    fd, tmp_path = tempfile.mkstemp(prefix='.usage-', suffix='.tmp', dir=directory)
+                    with os.fdopen(fd, 'w', encoding='utf-8') as f:
+                        json.dump(stored, f, separators=(',', ':'))
+                    os.replace(tmp_path, self.path)
+                    tmp_path = None
+                    self._stat = self._file_stat()
+
+                self._pending = {}
+                self._forgotten = set()
+                self._adopt(stored)
+                return True
+            except Exception as e:
+                print(f"保存访问统计失败: {e}")
+                return False
+            finally:
+                if tmp_path and os.path.exists(tmp_path):
+                    os.remove(tmp_path)
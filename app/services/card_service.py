@@ -3,22 +3,46 @@
 处理卡片的业务逻辑操作
 """
 
-from typing import List, Optional, Dict, Any, Tuple
-from app.models import DataManager
+from typing import List, Optional, Dict, Any, Tuple, Sequence
+from app.models import create_data_manager
+from app.models.storage import DataValidationError
 from app.models.card import Card, validate_card_data
+from app.models.collation import collation_key
+from app.models.columns import SORT_KEYS
+from app.models.usage import UsageCounter, usage_path
 
 
 class CardService:
     """卡片管理服务类"""
 
-    def __init__(self, data_path: str = './data/cards.json'):
+    def __init__(self, data_path: str = './data/cards.json', storage_options: Dict[str, Any] = None):
         """
         初始化卡片服务
 
         Args:
-            data_path: 数据文件路径
+            data_path: 数据文件路径，sqlite:/// 开头时使用 SQLite 存储
+            storage_options: 存储后端选项（参见 create_data_manager）
         """
-        self.data_manager = DataManager(data_path)
+        self.data_manager = create_data_manager(data_path, **(storage_options or {}))
+        self.usage = UsageCounter(usage_path(data_path))
+
+    def generation(self) -> Optional[str]:
+        """
+        获取数据版本标识（参见 StorageBackend.generation），任何写入之后都会变化
+
+        Returns:
+            Optional[str]: 数据版本标识，存储后端不支持时为None
+        """
+        return self.data_manager.generation()
+
+    def last_updated(self) -> Optional[str]:
+        """
+        获取卡片数据的最后修改时间
+
+        Returns:
+            Optional[str]: ISO 格式的本地时间，未知时为None
+        """
+        return self.data_manager.last_updated()
 
     def get_all_cards(self, search_query: str = None) -> List[Card]:
         """
@@ -30,28 +54,131 @@ class CardService:
         Returns:
             List[Card]: 卡片列表，按order排序
         """
+        return list(self.query_cards(search_query))
+
+    def query_cards(self, search_query: str = None, sort_by: str = 'order',
+                    descending: bool = False) -> Sequence[Card]:
+        """
+        查询卡片：搜索过滤后排序
+
+        启用列式快照时在行号数组上完成过滤和排序，返回惰性序列，
+        切片（分页）后只为当前页取出卡片对象；存储后端提供倒排索引时，
+        搜索只校验索引给出的候选卡片。
+
+        Args:
+            search_query: 搜索关键词，搜索名称和描述（不区分大小写）
+            sort_by: 排序字段，order、name（中文按拼音）、created_time 或 usage（访问次数）
+            descending: 是否降序
+
+        Returns:
+            Sequence[Card]: 卡片序列
+        """
+        if sort_by not in SORT_KEYS:
+            raise ValueError(f"不支持的排序字段: {sort_by}")
+
         try:
+            if self.data_manager.columnar:
+                columns = self.data_manager.columns()
+                candidates = self.data_manager.search_candidates(search_query) if search_query else None
+                rows = columns.sort(columns.filter(search_query, candidates), sort_by, descending, self.usage)
+                return columns.view(rows)
+
             cards = self.data_manager.load_cards()
 
             # 如果有搜索查询，进行过滤
-            if search_query:
+            if search_query and search_query.strip():
                 search_query = search_query.strip().lower()
-                filtered_cards = []
+                cards = [card for card in cards
+                         if search_query in card.name.lower() or search_query in card.description.lower()]
+
+            if sort_by == 'name':
+                cards.sort(key=lambda x: collation_key(x.name), reverse=descending)
+            elif sort_by == 'usage':
+                counts = self.usage.counts()
+                cards.sort(key=lambda x: counts.get(x.id, 0), reverse=descending)
+            elif sort_by == 'created_time':
+                cards.sort(key=lambda x: x.created_time, reverse=descending)
+            elif descending:
+                cards.sort(key=lambda x: x.order, reverse=True)
+            return cards
 
-                for card in cards:
-                    # 搜索名称和描述
-                    if (search_query in card.name.lower() or
-                            search_query in card.description.lower()):
-                        filtered_cards.append(card)
+        except DataValidationError:
+            raise
+        except Exception as e:
+            print(f"获取卡片列表失败: {e}")
+            return []
 
-                return filtered_cards
+    def page_cards(self, after: Optional[Tuple[int, str]] = None, limit: int = 20,
+                   search_query: str = None) -> List[Card]:
+        """
+        keyset 分页：按 order 顺序取游标之后的卡片
 
-            return cards
+        没有搜索关键词时由存储后端根据排序号索引直接定位，耗时与卡片总数无关；
+        有搜索关键词时在过滤结果中二分定位。
+
+        Args:
+            after: 游标 (排序号, 卡片ID)，None 表示第一页
+            limit: 最多返回的卡片数
+            search_query: 搜索关键词
+
+        Returns:
+            List[Card]: 卡片列表
+        """
+        try:
+            if search_query and search_query.strip():
+                columns = self.data_manager.columns()
+                rows = columns.filter(search_query, self.data_manager.search_candidates(search_query))
+                return list(columns.view(columns.after(rows, after)[:limit]))
 
+            return self.data_manager.cards_after(after, limit)
+
+        except DataValidationError:
+            raise
         except Exception as e:
             print(f"获取卡片列表失败: {e}")
             return []
 
+    def record_visit(self, card_id: str) -> Tuple[bool, str, int]:
+        """
+        记录一次卡片访问（用于按使用频率排序）
+
+        Args:
+            card_id: 卡片ID
+
+        Returns:
+            Tuple[bool, str, int]: (是否成功, 消息, 累计访问次数)
+        """
+        try:
+            if self.data_manager.get_card_by_id(card_id) is None:
+                return False, "卡片不存在", 0
+            return True, "访问已记录", self.usage.hit(card_id)
+        except DataValidationError:
+            raise
+        except Exception as e:
+            print(f"记录卡片访问失败: {e}")
+            return False, f"记录卡片访问失败: {e}", 0
+
+    def suggest_cards(self, query: str, limit: int = 8) -> List[Dict[str, str]]:
+        """
+        卡片名称联想（边输入边搜索、快速启动）
+
+        规范化名称前缀匹配，结果不足时补充编辑距离相近的名称，按排序号排名。
+
+        Args:
+            query: 输入的查询词
+            limit: 返回数量上限
+
+        Returns:
+            List[Dict]: [{'id': 卡片ID, 'name': 卡片名称}, ...]
+        """
+        try:
+            return self.data_manager.suggester().suggest(query, limit)
+        except DataValidationError:
+            raise
+        except Exception as e:
+            print(f"获取名称联想失败: {e}")
+            return []
+
     def get_card_by_id(self, card_id: str) -> Optional[Card]:
         """
         根据ID获取单个卡片
@@ -64,6 +191,8 @@ class CardService:
         """
         try:
             return self.data_manager.get_card_by_id(card_id)
+        except DataValidationError:
+            raise
         except Exception as e:
             print(f"根据ID获取卡片失败: {e}")
             return None
@@ -89,33 +218,28 @@ class CardService:
             if not validation_result:
                 return False, validation_message, None
 
-            # 检查名称是否重复
-            if self.data_manager.card_name_exists(name):
-                return False, f"卡片名称 '{name}' 已存在", None
-
-            # 获取下一个排序号
-            next_order = self.data_manager.get_next_order()
-
-            # 创建卡片
-            new_card = Card.create(
-                name=name.strip(),
-                icon=icon.strip(),
-                url=url.strip(),
-                description=description.strip(),
-                order=next_order
-            )
-
-            # 保存到数据库
-            cards = self.data_manager.load_cards()
-            cards.append(new_card)
-
-            success = self.data_manager.save_cards(cards)
+            with self.data_manager.transaction() as tx:
+                # 检查名称是否重复
+                if tx.name_exists(name.strip()):
+                    return False, f"卡片名称 '{name}' 已存在", None
 
-            if success:
+                # 创建卡片，排序号取事务内的下一个可用值
+                new_card = Card.create(
+                    name=name.strip(),
+                    icon=icon.strip(),
+                    url=url.strip(),
+                    description=description.strip(),
+                    order=tx.next_order()
+                )
+                tx.put(new_card)
+
+            if tx.committed:
                 return True, "卡片创建成功", new_card
             else:
                 return False, "保存卡片失败", None
 
+        except DataValidationError:
+            raise
         except Exception as e:
             error_msg = f"创建卡片时发生错误: {e}"
             print(error_msg)
@@ -137,63 +261,57 @@ class CardService:
             Tuple[bool, str, Optional[Card]]: (是否成功, 消息, 更新后的卡片)
         """
         try:
-            # 查找要更新的卡片
-            existing_card = self.data_manager.get_card_by_id(card_id)
-            if not existing_card:
-                return False, "卡片不存在", None
-
-            # 准备更新数据
-            update_data = {}
-
-            # 处理需要更新的字段
-            if name is not None:
-                name = name.strip()
-                if not name:
-                    return False, "卡片名称不能为空", None
-
-                # 检查名称重复（排除当前卡片）
-                if self.data_manager.card_name_exists(name, exclude_id=card_id):
-                    return False, f"卡片名称 '{name}' 已存在", None
-
-                update_data['name'] = name
-
-            if icon is not None:
-                icon = icon.strip()
-                if not icon:
-                    return False, "图标不能为空", None
-                update_data['icon'] = icon
-
-            if url is not None:
-                url = url.strip()
-                if not url:
-                    return False, "链接不能为空", None
-                update_data['url'] = url
-
-            if description is not None:
-                update_data['description'] = description.strip()
-
-            # 如果没有要更新的内容
-            if not update_data:
-                return False, "没有要更新的内容", existing_card
-
-            # 创建更新后的卡片
-            updated_card = existing_card.update(**update_data)
-
-            # 更新卡片列表
-            cards = self.data_manager.load_cards()
-            for i, card in enumerate(cards):
-                if card.id == card_id:
-                    cards[i] = updated_card
-                    break
-
-            # 保存更新
-            success = self.data_manager.save_cards(cards)
-
-            if success:
+            with self.data_manager.transaction() as tx:
+                # 查找要更新的卡片
+                existing_card = tx.get(card_id)
+                if not existing_card:
+                    return False, "卡片不存在", None
+
+                # 准备更新数据
+                update_data = {}
+
+                # 处理需要更新的字段
+                if name is not None:
+                    name = name.strip()
+                    if not name:
+                        return False, "卡片名称不能为空", None
+
+                    # 检查名称重复（排除当前卡片）
+                    if tx.name_exists(name, exclude_id=card_id):
+                        return False, f"卡片名称 '{name}' 已存在", None
+
+                    update_data['name'] = name
+
+                if icon is not None:
+                    icon = icon.strip()
+                    if not icon:
+                        return False, "图标不能为空", None
+                    update_data['icon'] = icon
+
+                if url is not None:
+                    url = url.strip()
+                    if not url:
+                        return False, "链接不能为空", None
+                    update_data['url'] = url
+
+                if description is not None:
+                    update_data['description'] = description.strip()
+
+                # 如果没有要更新的内容
+                if not update_data:
+                    return False, "没有要更新的内容", existing_card
+
+                # 创建更新后的卡片
+                updated_card = existing_card.update(**update_data)
+                tx.put(updated_card)
+
+            if tx.committed:
                 return True, "卡片更新成功", updated_card
             else:
                 return False, "保存更新失败", None
 
+        except DataValidationError:
+            raise
         except Exception as e:
             error_msg = f"更新卡片时发生错误: {e}"
             print(error_msg)
@@ -210,33 +328,23 @@ class CardService:
             Tuple[bool, str]: (是否成功, 消息)
         """
         try:
-            # 检查卡片是否存在
-            existing_card = self.data_manager.get_card_by_id(card_id)
-            if not existing_card:
-                return False, "卡片不存在"
-
-            # 获取所有卡片并移除指定卡片
-            cards = self.data_manager.load_cards()
-            original_count = len(cards)
-
-            cards = [card for card in cards if card.id != card_id]
-
-            if len(cards) == original_count:
-                return False, "未找到要删除的卡片"
+            with self.data_manager.transaction() as tx:
+                # 移除指定卡片
+                existing_card = tx.delete(card_id)
+                if not existing_card:
+                    return False, "卡片不存在"
 
-            # 重新调整排序号
-            for i, card in enumerate(cards):
-                if card.order != i + 1:
-                    cards[i] = card.update(order=i + 1)
+                # 重新调整排序号
+                tx.renumber()
 
-            # 保存更新后的卡片列表
-            success = self.data_manager.save_cards(cards)
-
-            if success:
+            if tx.committed:
+                self.usage.forget(card_id)
                 return True, f"卡片 '{existing_card.name}' 删除成功"
             else:
                 return False, "保存删除结果失败"
 
+        except DataValidationError:
+            raise
         except Exception as e:
             error_msg = f"删除卡片时发生错误: {e}"
             print(error_msg)
@@ -256,42 +364,27 @@ class CardService:
             if not card_orders:
                 return False, "排序数据为空"
 
-            # 加载现有卡片
-            cards = self.data_manager.load_cards()
-
-            # 创建ID到卡片的映射
-            card_map = {card.id: card for card in cards}
-
-            # 验证所有ID都存在
-            for item in card_orders:
-                if 'id' not in item or 'order' not in item:
-                    return False, "排序数据格式错误"
-
-                card_id = item['id']
-                if card_id not in card_map:
-                    return False, f"卡片ID {card_id} 不存在"
-
-            # 更新排序
-            updated_cards = []
-            for item in card_orders:
-                card_id = item['id']
-                new_order = item['order']
-
-                original_card = card_map[card_id]
-                updated_card = original_card.update(order=new_order)
-                updated_cards.append(updated_card)
+            with self.data_manager.transaction() as tx:
+                # 验证所有ID都存在
+                for item in card_orders:
+                    if 'id' not in item or 'order' not in item:
+                        return False, "排序数据格式错误"
 
-            # 按order排序
-            updated_cards.sort(key=lambda x: x.order)
+                    card_id = item['id']
+                    if tx.get(card_id) is None:
+                        return False, f"卡片ID {card_id} 不存在"
 
-            # 保存更新
-            success = self.data_manager.save_cards(updated_cards)
+                # 更新排序（未出现在排序数据中的卡片保持不变）
+                for item in card_orders:
+                    tx.set_order(item['id'], item['order'])
 
-            if success:
+            if tx.committed:
                 return True, "卡片排序更新成功"
             else:
                 return False, "保存排序结果失败"
 
+        except DataValidationError:
+            raise
         except Exception as e:
             error_msg = f"重排序卡片时发生错误: {e}"
             print(error_msg)
@@ -322,6 +415,8 @@ class CardService:
 
             return True, "名称可用"
 
+        except DataValidationError:
+            raise
         except Exception as e:
             error_msg = f"验证名称时发生错误: {e}"
             print(error_msg)
@@ -351,6 +446,8 @@ class CardService:
 
             return stats
 
+        except DataValidationError:
+            raise
         except Exception as e:
             print(f"获取服务统计信息失败: {e}")
             return {"error": str(e)}
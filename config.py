@@ -20,13 +20,54 @@ class Config:
     ADMIN_PASSWORD = os.environ.get('ADMIN_PASSWORD') or 'admin123'
 
     # 数据文件配置
+    # JSON 文件路径，或 SQLite 地址（如 sqlite:///./data/cards.db、sqlite:////var/lib/peler/cards.db）
     DATA_PATH = os.environ.get('DATA_PATH') or './data/cards.json'
 
+    # JSON 存储预写日志：变更追加到 cards.wal，超过阈值后在后台合并回 cards.json
+    # （备份只在合并时生成，见 BACKUP_* 配置）
+    DATA_JOURNAL = os.environ.get('DATA_JOURNAL', 'false').lower() in ('true', '1', 'yes', 'on')
+    DATA_JOURNAL_MAX_BYTES = int(os.environ.get('DATA_JOURNAL_MAX_BYTES', str(1024 * 1024)))
+    DATA_JOURNAL_MAX_RECORDS = int(os.environ.get('DATA_JOURNAL_MAX_RECORDS', '1000'))
+
+    # JSON 存储索引文件：将构建好的索引保存为 cards.idx，数据文件未变时冷启动直接加载
+    DATA_INDEX_SIDECAR = os.environ.get('DATA_INDEX_SIDECAR', 'true').lower() in ('true', '1', 'yes', 'on')
+
+    # JSON 存储加载校验：lenient 跳过无效卡片，strict 遇到无效卡片时拒绝加载（避免下次写入时丢弃它们）
+    DATA_VALIDATION = os.environ.get('DATA_VALIDATION', 'lenient')
+
+    # JSON 存储缩进输出（便于手工查看和编辑），关闭后紧凑输出，文件更小、写入更快
+    DATA_JSON_PRETTY = os.environ.get('DATA_JSON_PRETTY', 'true').lower() in ('true', '1', 'yes', 'on')
+
+    # 列表查询使用列式快照（安装 NumPy 时向量化过滤与排序），关闭后逐张卡片处理
+    DATA_COLUMNAR = os.environ.get('DATA_COLUMNAR', 'true').lower() in ('true', '1', 'yes', 'on')
+
+    # 列表响应缓存：按查询参数和数据版本缓存序列化好的响应体（LRU），条数为0时关闭
+    RESPONSE_CACHE_SIZE = int(os.environ.get('RESPONSE_CACHE_SIZE', '256'))
+    RESPONSE_CACHE_MAX_BYTES = int(os.environ.get('RESPONSE_CACHE_MAX_BYTES', str(16 * 1024 * 1024)))
+
+    # 响应压缩：按 Accept-Encoding 对大于阈值的文本类响应做 gzip/deflate 压缩，
+    # 启动时为静态文件生成 .gz 文件直接发送
+    COMPRESSION_ENABLED = os.environ.get('COMPRESSION_ENABLED', 'true').lower() in ('true', '1', 'yes', 'on')
+    COMPRESSION_MIN_SIZE = int(os.environ.get('COMPRESSION_MIN_SIZE', '1024'))
+    COMPRESSION_LEVEL = int(os.environ.get('COMPRESSION_LEVEL', '6'))
+    COMPRESSION_CACHE_SIZE = int(os.environ.get('COMPRESSION_CACHE_SIZE', '128'))
+
+    # 备份配置：后台生成按内容去重的压缩快照（gzip 或 lzma），并按保留策略自动清理
+    # 直接写入时每次保存前备份；启用预写日志时只在合并日志时备份，两次合并之间的修改不单独备份
+    BACKUP_COMPRESSION = os.environ.get('BACKUP_COMPRESSION', 'gzip')
+    BACKUP_KEEP_LAST = int(os.environ.get('BACKUP_KEEP_LAST', '20'))
+    BACKUP_KEEP_HOURLY = int(os.environ.get('BACKUP_KEEP_HOURLY', '24'))  # 小时
+    BACKUP_KEEP_DAILY = int(os.environ.get('BACKUP_KEEP_DAILY', '30'))  # 天
+
+    # 就绪检查：后台按此间隔（秒）检查数据文件、备份和缓存状态，/api/health/ready 返回最近的结果
+    HEALTH_CHECK_INTERVAL = float(os.environ.get('HEALTH_CHECK_INTERVAL', '5'))
+
     # 安全配置
     MAX_LOGIN_ATTEMPTS = int(os.environ.get('MAX_LOGIN_ATTEMPTS', '5'))
     LOCKOUT_DURATION = int(os.environ.get('LOCKOUT_DURATION', '300'))  # 5分钟
 
-    # 应用配置
+    # JSON 响应配置：编码后端 auto（按 orjson、simplejson、json 的顺序选择已安装的）或指定后端
+    JSON_BACKEND = os.environ.get('JSON_BACKEND', 'auto')
     JSON_AS_ASCII = False
     JSON_SORT_KEYS = True
 
@@ -50,6 +91,33 @@ class Config:
         if Config.LOCKOUT_DURATION < 60:
             errors.append("LOCKOUT_DURATION 不能少于60秒")
 
+        if Config.DATA_JOURNAL_MAX_BYTES < 1 or Config.DATA_JOURNAL_MAX_RECORDS < 1:
+            errors.append("DATA_JOURNAL_MAX_BYTES 和 DATA_JOURNAL_MAX_RECORDS 必须大于0")
+
+        if Config.DATA_VALIDATION not in ('lenient', 'strict'):
+            errors.append("DATA_VALIDATION 必须是 lenient 或 strict")
+
+        if Config.JSON_BACKEND not in ('auto', 'orjson', 'simplejson', 'json'):
+            errors.append("JSON_BACKEND 必须是 auto、orjson、simplejson 或 json")
+
+        if Config.RESPONSE_CACHE_SIZE < 0 or Config.RESPONSE_CACHE_MAX_BYTES < 0:
+            errors.append("RESPONSE_CACHE_SIZE 和 RESPONSE_CACHE_MAX_BYTES 不能小于0")
+
+        if not 1 <= Config.COMPRESSION_LEVEL <= 9:
+            errors.append("COMPRESSION_LEVEL 必须在1-9之间")
+
+        if Config.COMPRESSION_MIN_SIZE < 0 or Config.COMPRESSION_CACHE_SIZE < 0:
+            errors.append("COMPRESSION_MIN_SIZE 和 COMPRESSION_CACHE_SIZE 不能小于0")
+
+        if Config.BACKUP_COMPRESSION not in ('gzip', 'lzma'):
+            errors.append("BACKUP_COMPRESSION 必须是 gzip 或 lzma")
+
+        if Config.BACKUP_KEEP_LAST < 1:
+            errors.append("BACKUP_KEEP_LAST 必须大于0")
+
+        if Config.HEALTH_CHECK_INTERVAL <= 0:
+            errors.append("HEALTH_CHECK_INTERVAL 必须大于0")
+
         return errors
 
 
@@ -71,6 +139,9 @@ class ProductionConfig(Config):
     MAX_LOGIN_ATTEMPTS = int(os.environ.get('MAX_LOGIN_ATTEMPTS', '3'))
     LOCKOUT_DURATION = int(os.environ.get('LOCKOUT_DURATION', '600'))  # 10分钟
 
+    # 生产环境不排序键，按字段定义顺序输出
+    JSON_SORT_KEYS = False
+
 
 class TestingConfig(Config):
     """测试环境配置"""
@@ -129,6 +200,12 @@ def print_config_info(config_class=None):
     print(f"环境: {getattr(config_class, 'FLASK_ENV', 'unknown')}")
     print(f"调试模式: {getattr(config_class, 'DEBUG', False)}")
     print(f"数据文件路径: {config_class.DATA_PATH}")
+    print(f"预写日志: {'启用' if config_class.DATA_JOURNAL else '关闭'}")
+    print(f"加载校验: {config_class.DATA_VALIDATION}")
+    print(f"JSON 后端: {config_class.JSON_BACKEND}")
+    print(f"响应压缩: {'启用' if config_class.COMPRESSION_ENABLED else '关闭'}")
+    print(f"响应缓存: {config_class.RESPONSE_CACHE_SIZE} 条 / {config_class.RESPONSE_CACHE_MAX_BYTES} 字节")
+    print(f"就绪检查间隔: {config_class.HEALTH_CHECK_INTERVAL}秒")
     print(f"最大登录尝试次数: {config_class.MAX_LOGIN_ATTEMPTS}")
     print(f"锁定时长: {config_class.LOCKOUT_DURATION}秒")
 
@@ -0,0 +1,337 @@
+"""
+性能基准脚本
+对比数据层关键路径在大量卡片下的耗时
+
+用法:
+    python scripts/benchmark.py [卡片数量]
+"""
+
+import json
+import sys
+import os
+import tempfile
+import time
+import tracemalloc
+
+# 添加项目根目录到路径
+project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, project_root)
+
+from app.models import DataManager, MemoryDataManager, create_data_manager
+from app.models import columns as columns_module
+from flask import Flask, jsonify
+from app.api.utils import paginate_data, jsonify_cards, success_response
+from app.json_provider import FastJSONProvider
+from app.models.card import Card, card_serializer
+from app.models.columns import CardColumns
+from app.models.index import CardIndex
+from app.models.usage import UsageCounter
+
+
+def make_cards(count):
+    """
+    生成测试卡片
+
+    Args:
+        count: 卡片数量
+
+    Returns:
+        list: 卡片列表
+    """
+    return [
+        Card.create(name=f"服务{i}", icon="bi-server", url=f"http://localhost/{i}",
+                    description=f"测试服务{i}", order=i)
+        for i in range(1, count + 1)
+    ]
+
+
+def timeit(func, repeat):
+    """
+    多次执行并返回平均耗时
+
+    Args:
+        func: 被测函数
+        repeat: 执行次数
+
+    Returns:
+        float: 平均耗时（微秒）
+    """
+    start = time.perf_counter()
+    for _ in range(repeat):
+        func()
+    return (time.perf_counter() - start) / repeat * 1e6
+
+
+def bench_lookups(cards, repeat=20):
+    """线性扫描与索引查找对比"""
+    print(f"\n查找: {len(cards)} 张卡片，每项执行 {repeat} 次")
+    print("-" * 60)
+
+    target = cards[-1]
+    index = CardIndex(cards)
+
+    def scan_by_id():
+        return next((card for card in cards if card.id == target.id), None)
+
+    def scan_name():
+        return any(card.name == target.name for card in cards)
+
+    def scan_max_order():
+        return max(card.order for card in cards) + 1
+
+    cases = [
+        ("按ID获取", scan_by_id, lambda: index.get(target.id)),
+        ("名称查重", scan_name, lambda: index.name_exists(target.name)),
+        ("下一个排序号", scan_max_order, index.next_order),
+    ]
+    for label, scan, lookup in cases:
+        scan_us = timeit(scan, repeat)
+        index_us = timeit(lookup, repeat * 100)
+        print(f"   {label:<8} 线性扫描 {scan_us:>10.1f} us   索引 {index_us:>6.2f} us   "
+              f"加速 {scan_us / index_us:>8.0f}x")
+
+    start = time.perf_counter()
+    for i in range(repeat):
+        index.put(target.update(name=f"改名{i}"))
+    print(f"   增量更新索引: {(time.perf_counter() - start) / repeat * 1e6:.2f} us/次")
+
+
+def bench_card(count, repeat=3):
+    """卡片对象的内存占用与常用操作耗时"""
+    print(f"\n卡片对象: {count} 张卡片")
+    print("-" * 60)
+
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    cards = make_cards(count)
+    rows = [card.to_dict() for card in cards]
+    rows_size = tracemalloc.get_traced_memory()[0]
+    # 只统计卡片对象本身，先释放中间生成的字典
+    del rows
+    after = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    print(f"   内存占用: {(after - before) / count:.0f} 字节/张（含字段字符串）"
+          f"，to_dict 结果 {(rows_size - after) / count:.0f} 字节/张")
+
+    data = [card.to_dict() for card in cards]
+    cases = [
+        ("to_dict", lambda: [card.to_dict() for card in cards]),
+        ("from_dict", lambda: [Card.from_dict(item) for item in data]),
+        ("update", lambda: [card.update(order=card.order + 1) for card in cards]),
+    ]
+    for label, func in cases:
+        total_us = min(timeit(func, 1) for _ in range(repeat))
+        print(f"   {label:<10} {total_us / 1000:>8.1f} ms/{count}张   {total_us / count:>6.2f} us/次")
+
+
+def bench_listing(cards, repeat=5):
+    """列表查询：逐张处理与列式快照对比（搜索 + 排序 + 取第一页）"""
+    print(f"\n列表查询: {len(cards)} 张卡片，NumPy {'已安装' if columns_module.np is not None else '未安装'}")
+    print("-" * 60)
+
+    manager = MemoryDataManager(cards=cards)
+
+    def python_path(query, key):
+        items = manager.load_cards()
+        if query:
+            items = [card for card in items if query in card.name.lower() or query in card.description.lower()]
+        if key != 'order':
+            items.sort(key=lambda x: getattr(x, key))
+        return paginate_data([card.to_dict() for card in items], 1, 20)
+
+    def columnar_path(query, key):
+        columns = manager.columns()
+        page = paginate_data(columns.view(columns.sort(columns.filter(query), key)), 1, 20)
+        page['items'] = [card.to_dict() for card in page['items']]
+        return page
+
+    manager.columns()
+    for query, key in ((None, 'order'), ('服务9', 'order'), ('服务', 'name'), (None, 'created_time')):
+        python_ms = min(timeit(lambda: python_path(query, key), 1) for _ in range(repeat)) / 1000
+        columnar_ms = min(timeit(lambda: columnar_path(query, key), 1) for _ in range(repeat)) / 1000
+        label = f"search={query or '-'} sort={key}"
+        print(f"   {label:<28} 逐张 {python_ms:>8.1f} ms   列式 {columnar_ms:>7.1f} ms")
+
+
+def bench_sort(cards, repeat=20):
+    """排序：首次计算排列与同一快照上复用缓存排列对比（取第一页）"""
+    print(f"\n排序: {len(cards)} 张卡片，每项执行 {repeat} 次")
+    print("-" * 60)
+
+    usage = UsageCounter()
+    for card in cards[::7]:
+        usage.hit(card.id)
+
+    for key, descending in (('name', False), ('created_time', True), ('usage', True)):
+        def first_sort():
+            columns = CardColumns(cards)
+            return columns.view(columns.sort(columns.filter(None), key, descending, usage))[:20]
+
+        columns = CardColumns(cards)
+        columns.sort(columns.filter(None), key, descending, usage)
+        first_ms = min(timeit(first_sort, 1) for _ in range(3)) / 1000
+        cached_us = timeit(lambda: list(columns.view(columns.sort(columns.filter(None), key, descending, usage))[:20]),
+                           repeat)
+        print(f"   sort={key:<13} {'desc' if descending else 'asc':<5} 首次 {first_ms:>8.1f} ms   缓存 {cached_us:>8.1f} us")
+
+
+def bench_search(sizes, repeat=20):
+    """搜索：扫描全部搜索文本与倒排索引对比，索引的耗时只随匹配数量变化"""
+    print(f"\n搜索: 扫描与倒排索引对比，每项执行 {repeat} 次")
+    print("-" * 60)
+
+    for size in sizes:
+        manager = MemoryDataManager(cards=make_cards(size))
+        columns = manager.columns()
+        start = time.perf_counter()
+        manager.search_candidates('服务1')
+        build_ms = (time.perf_counter() - start) * 1000
+        print(f"   {size} 张卡片，构建倒排索引 {build_ms:.1f} ms")
+
+        # 预热：构建ID到行号的映射
+        columns.filter('服务1', manager.search_candidates('服务1'))
+        for query in (f"服务{size // 2}", 'localhost', '测试服'):
+            scan_us = timeit(lambda: columns.filter(query), repeat)
+            index_us = timeit(lambda: columns.filter(query, manager.search_candidates(query)), repeat)
+            matched = len(columns.filter(query))
+            print(f"      {query:<12} 命中 {matched:>7}   扫描 {scan_us:>10.1f} us   索引 {index_us:>10.1f} us")
+
+
+def bench_keyset(sizes, repeat=200):
+    """深分页：页码分页与 keyset 游标分页对比（取最后一页附近的 20 张并序列化）"""
+    print(f"\n深分页: 每项执行 {repeat} 次")
+    print("-" * 60)
+
+    for size in sizes:
+        cards = make_cards(size)
+        with tempfile.TemporaryDirectory() as temp_dir:
+            sqlite = create_data_manager('sqlite:///' + os.path.join(temp_dir, 'cards.db'))
+            sqlite.save_cards(cards)
+            for label, manager in (("内存", MemoryDataManager(cards=cards)), ("SQLite", sqlite)):
+                last_page = size // 20
+                target = cards[(last_page - 1) * 20 - 1]
+                after = (target.order, target.id)
+                manager.columns()
+
+                def offset_page():
+                    page = paginate_data(manager.columns().view(range(size)), last_page, 20)
+                    return [card.to_dict() for card in page['items']]
+
+                def keyset():
+                    return [card.to_dict() for card in manager.cards_after(after, 20)]
+
+                assert offset_page() == keyset()
+                offset_us = timeit(offset_page, repeat // 10)
+                keyset_us = timeit(keyset, repeat)
+                print(f"   {size:>7} 张 {label:<7} 页码分页 {offset_us:>10.1f} us   游标分页 {keyset_us:>7.1f} us")
+
+
+def bench_projection(count, repeat=5):
+    """字段投影：完整字段与只取部分字段的序列化耗时和 JSON 体积"""
+    print(f"\n字段投影: {count} 张卡片")
+    print("-" * 60)
+
+    cards = make_cards(count)
+    for fields in (None, ['id', 'name', 'icon', 'url'], ['id', 'name']):
+        serialize = card_serializer(fields)
+        us = min(timeit(lambda: json.dumps([serialize(card) for card in cards], ensure_ascii=False), 1)
+                 for _ in range(repeat))
+        size = len(json.dumps([serialize(card) for card in cards], ensure_ascii=False).encode('utf-8'))
+        label = ','.join(fields) if fields else '全部字段'
+        print(f"   {label:<20} 序列化 {us / 1000:>7.1f} ms   {size / 1024:>8.1f} KB")
+
+
+def bench_fragments(count, repeat=5):
+    """列表响应：默认 JSON 提供者、FastJSONProvider 与拼接缓存的 JSON 片段对比（后两者输出逐字节一致）"""
+    print(f"\n列表响应: {count} 张卡片")
+    print("-" * 60)
+
+    default_app = Flask(__name__)
+    app = Flask(__name__)
+    # 生产环境设置：不排序键、不转义非 ASCII 字符、紧凑输出
+    app.json = FastJSONProvider(app)
+    app.json.sort_keys = False
+    app.json.ensure_ascii = False
+    cards = make_cards(count)
+    message = f"获取卡片列表成功，共{count}张卡片"
+
+    def current():
+        return jsonify(success_response(data={'items': [card.to_dict() for card in cards], 'total': count},
+                                        message=message)).get_data()
+
+    def fragments():
+        return jsonify_cards({'items': cards, 'total': count}, message).get_data()
+
+    with default_app.app_context():
+        default_ms = min(timeit(current, 1) for _ in range(repeat)) / 1000
+        default_size = len(current())
+    with app.app_context():
+        current_ms = min(timeit(current, 1) for _ in range(repeat)) / 1000
+        start = time.perf_counter()
+        body = fragments()
+        cold_ms = (time.perf_counter() - start) * 1000
+        assert body == current()
+        warm_ms = min(timeit(fragments, 1) for _ in range(repeat)) / 1000
+    print(f"   默认提供者          {default_ms:>8.1f} ms   {default_size / 1024:.1f} KB")
+    print(f"   FastJSONProvider    {current_ms:>8.1f} ms   {len(body) / 1024:.1f} KB   ({app.json.backend})")
+    print(f"   片段（首次生成）    {cold_ms:>8.1f} ms")
+    print(f"   片段（已缓存）      {warm_ms:>8.1f} ms")
+
+
+def bench_suggest(cards, repeat=100):
+    """名称联想：前缀匹配与模糊匹配的单次耗时"""
+    print(f"\n名称联想: {len(cards)} 张卡片，每项执行 {repeat} 次")
+    print("-" * 60)
+
+    manager = MemoryDataManager(cards=cards)
+    start = time.perf_counter()
+    suggester = manager.suggester()
+    print(f"   构建前缀表 {(time.perf_counter() - start) * 1000:.1f} ms")
+
+    last = cards[-1].name
+    # 删掉第一个字符，只能通过模糊匹配找到
+    typo = last[1:]
+    for label, query in (("短前缀", "服"), ("长前缀", last[:-1]), ("拼写错误", typo), ("无结果", "zzzz")):
+        us = timeit(lambda: suggester.suggest(query), repeat)
+        names = [item['name'] for item in suggester.suggest(query)][:3]
+        print(f"   {label:<8} {query:<12} {us:>8.1f} us   {names}")
+
+
+def bench_cold_start(cards):
+    """冷启动：完整解析构建索引与加载索引文件对比"""
+    print(f"\n冷启动: {len(cards)} 张卡片")
+    print("-" * 60)
+
+    with tempfile.TemporaryDirectory() as temp_dir:
+        data_path = os.path.join(temp_dir, 'cards.json')
+        DataManager(data_path, index_sidecar=False).save_cards(cards)
+
+        for label, sidecar in (("无索引文件", False), ("首次构建并写入索引文件", True), ("加载索引文件", True)):
+            manager = DataManager(data_path, index_sidecar=sidecar)
+            start = time.perf_counter()
+            manager.get_next_order()
+            print(f"   {label:<14} {(time.perf_counter() - start) * 1000:>10.1f} ms")
+
+
+def main():
+    """主函数"""
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 100000
+    print("=" * 60)
+    print("PelerPanel 性能基准")
+    print("=" * 60)
+
+    bench_card(count)
+    cards = make_cards(count)
+    bench_lookups(cards)
+    bench_listing(cards)
+    bench_sort(cards)
+    bench_search(sorted({count // 100, count // 10, count}))
+    bench_keyset(sorted({count // 100, count}))
+    bench_projection(count // 10)
+    bench_fragments(count)
+    bench_suggest(cards)
+    bench_cold_start(cards)
+
+
+if __name__ == "__main__":
+    main()
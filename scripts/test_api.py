@@ -86,6 +86,31 @@ class APITester:
 
         return False
 
+    def test_liveness_readiness(self):
+        """测试存活检查和就绪检查接口"""
+        success, response, error = self.make_request('GET', '/health/live')
+        if not success or response.status_code != 200:
+            self.log_test("存活检查", False, f"请求失败: {error or response.status_code}")
+            return False
+
+        success, response, error = self.make_request('GET', '/health/ready')
+        if not success:
+            self.log_test("就绪检查", False, f"请求失败: {error}")
+            return False
+
+        try:
+            data = response.json().get('data', {})
+        except ValueError:
+            self.log_test("就绪检查", False, "响应格式错误")
+            return False
+
+        if response.status_code == 200 and data.get('status') == 'ready':
+            self.log_test("就绪检查", True, f"快照时长 {data.get('age_seconds')} 秒")
+            return True
+
+        self.log_test("就绪检查", False, f"HTTP状态码: {response.status_code}", data.get('data'))
+        return False
+
     def test_get_docs(self):
         """测试获取API文档"""
         success, response, error = self.make_request('GET', '/docs')
@@ -158,6 +183,30 @@ class APITester:
 
         return False
 
+    def test_sort_cards(self):
+        """测试按名称排序"""
+        success, response, error = self.make_request('GET', '/cards', params={'sort': 'name', 'dir': 'desc'})
+
+        if not success:
+            self.log_test("排序卡片", False, f"请求失败: {error}")
+            return False
+
+        if response.status_code == 200:
+            try:
+                data = response.json()
+                if data.get('success'):
+                    items = data.get('data', {}).get('items', [])
+                    self.log_test("排序卡片", True, f"排序成功，返回{len(items)}张卡片")
+                    return True
+                else:
+                    self.log_test("排序卡片", False, data.get('message'))
+            except ValueError:
+                self.log_test("排序卡片", False, "响应格式错误")
+        else:
+            self.log_test("排序卡片", False, f"HTTP状态码: {response.status_code}")
+
+        return False
+
     def test_auth_status(self):
         """测试认证状态"""
         success, response, error = self.make_request('GET', '/auth/status')
@@ -441,9 +490,11 @@ class APITester:
 
         tests = [
             self.test_health_check,
+            self.test_liveness_readiness,
             self.test_get_docs,
             self.test_get_cards,
             self.test_search_cards,
+            self.test_sort_cards,
             self.test_auth_status,
             self.test_get_icons,
             self.test_validate_name,
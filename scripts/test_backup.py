@@ -0,0 +1,72 @@
+"""
+备份引擎测试脚本
+检查快照按卡片内容去重：修改时间、写入代数等每次保存都变化的字段不影响去重
+"""
+
+import sys
+import os
+import tempfile
+
+# 添加项目根目录到路径
+project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, project_root)
+
+from app.models import DataManager
+from app.models.backup import content_digest
+from app.models.card import Card
+
+
+def test_content_digest():
+    """只有配置块中的易变字段不同时摘要相同"""
+    print("=" * 60)
+    print("开始测试快照摘要")
+    print("=" * 60)
+
+    first = b'{"cards":[{"id":"a"}],"config":{"version":"1.0","last_updated":"t1","generation":1,"content_hash":"x"}}'
+    second = b'{"cards": [{"id": "a"}], "config": {"version": "1.0", "last_updated": "t2", "generation": 2, "content_hash": "y"}}'
+    changed = b'{"cards":[{"id":"b"}],"config":{"version":"1.0","last_updated":"t1","generation":1,"content_hash":"x"}}'
+
+    print(f"   易变字段不同: {content_digest(first) == content_digest(second)}")
+    assert content_digest(first) == content_digest(second)
+    print(f"   卡片不同: {content_digest(first) != content_digest(changed)}")
+    assert content_digest(first) != content_digest(changed)
+    # 无法解析的文件按原始字节计算，不抛出异常
+    assert content_digest(b'{bad') != content_digest(b'{bad!')
+
+
+def test_same_cards_stored_once():
+    """两次保存相同的卡片只产生一个快照对象"""
+    print("=" * 60)
+    print("开始测试备份去重")
+    print("=" * 60)
+
+    with tempfile.TemporaryDirectory() as temp_dir:
+        manager = DataManager(os.path.join(temp_dir, 'cards.json'))
+        cards = [Card.create(name=f"服务{i}", icon="bi-server", url=f"http://localhost:{8000 + i}",
+                             description="", order=i) for i in range(1, 4)]
+
+        # 每次保存前备份被替换的文件：第一次备份的是初始化时创建的空文件，
+        # 后两次备份的文件卡片相同，只是 last_updated、generation 不同
+        for _ in range(3):
+            assert manager.save_cards(cards)
+        assert manager.backup_engine.flush(10)
+
+        objects = os.listdir(manager.backup_engine.objects_dir)
+        stats = manager.backup_engine.get_stats()
+        print(f"   快照对象: {len(objects)}，去重命中: {stats['dedup_hits']}，时间线: {stats['snapshots']}")
+        assert len(objects) == 2
+        assert stats['dedup_hits'] == 1
+        assert stats['snapshots'] == 2
+
+        # 卡片变化后生成新的快照对象
+        cards[0] = cards[0].update(name="服务1-更新")
+        assert manager.save_cards(cards)
+        assert manager.save_cards(cards)
+        assert manager.backup_engine.flush(10)
+        print(f"   修改后快照对象: {len(os.listdir(manager.backup_engine.objects_dir))}")
+        assert len(os.listdir(manager.backup_engine.objects_dir)) == len(objects) + 1
+
+
+if __name__ == "__main__":
+    test_content_digest()
+    test_same_cards_stored_once()
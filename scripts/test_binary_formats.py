@@ -0,0 +1,54 @@
+"""
+二进制响应格式测试脚本
+检查按 Accept 协商的 MessagePack 和 CBOR 响应
+"""
+
+import sys
+import os
+
+# 添加项目根目录到路径
+project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, project_root)
+
+from test_card_routes import create_test_app, login, create_cards
+from test_fragments import expected_payload
+from app.api import formats
+
+
+def test_binary_formats():
+    """Accept 协商 MessagePack 和 CBOR，结构与 JSON 响应相同，响应带 Vary: Accept"""
+    print("=" * 60)
+    print("开始测试二进制响应格式")
+    print("=" * 60)
+
+    app = create_test_app()
+    client = app.test_client()
+    login(app, client)
+    card = create_cards(client, 3)[0]
+
+    response = client.get('/api/cards')
+    payload = expected_payload(response)
+    assert 'Accept' in response.headers['Vary']
+
+    for fmt, mimetype in (('msgpack', 'application/msgpack'), ('msgpack', 'application/x-msgpack'),
+                          ('cbor', 'application/cbor')):
+        packed = client.get('/api/cards', headers={'Accept': mimetype})
+        print(f"   {mimetype}: {packed.content_type}，{len(packed.data)} 字节")
+        assert packed.content_type == formats.MIMETYPES[fmt]
+        assert 'Accept' in packed.headers['Vary']
+        assert packed.data == formats.encode(payload, fmt)
+
+    # 单个卡片和错误响应同样转换
+    # 通用转换按 JSON 响应的内容（键已排序）编码
+    single = client.get(f"/api/cards/{card['id']}", headers={'Accept': 'application/cbor'})
+    assert single.data == formats.encode(client.get(f"/api/cards/{card['id']}").get_json(), 'cbor')
+    missing = client.get('/api/cards/no-such-card', headers={'Accept': 'application/msgpack'})
+    assert missing.status_code == 404 and missing.content_type == 'application/msgpack'
+
+    # JSON 权重更高或未指明时仍返回 JSON
+    assert client.get('/api/cards', headers={'Accept': 'application/json, application/msgpack;q=0.5'}).is_json
+    assert client.get('/api/cards', headers={'Accept': '*/*'}).is_json
+
+
+if __name__ == "__main__":
+    test_binary_formats()
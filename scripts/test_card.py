@@ -0,0 +1,120 @@
+"""
+卡片模型测试脚本
+检查卡片不可修改、replace 生成带新片段的新对象，以及缓存的片段不会在修改后继续使用
+"""
+
+import sys
+import os
+import json
+from dataclasses import FrozenInstanceError
+
+# 添加项目根目录到路径
+project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, project_root)
+
+from test_card_routes import create_test_app, login, create_cards
+from app.models.card import Card, card_fragments, card_serializer, encode_fragment
+
+
+def make_card():
+    """生成测试卡片"""
+    return Card.create(name="Grafana", icon="bi-graph-up", url="http://localhost:3000",
+                       description="监控面板", order=1)
+
+
+def test_card_is_immutable():
+    """给字段赋值、删除字段或添加新属性都抛出 FrozenInstanceError"""
+    print("=" * 60)
+    print("开始测试卡片不可修改")
+    print("=" * 60)
+
+    card = make_card()
+    for name, value in (('name', "改名"), ('order', 2), ('_json', None), ('extra', 1)):
+        try:
+            setattr(card, name, value)
+        except FrozenInstanceError as e:
+            print(f"   {name}: {e}")
+        else:
+            raise AssertionError(f"给 {name} 赋值应抛出 FrozenInstanceError")
+
+    try:
+        del card.url
+    except FrozenInstanceError:
+        pass
+    else:
+        raise AssertionError("删除字段应抛出 FrozenInstanceError")
+    assert card.name == "Grafana" and card.order == 1 and card.url == "http://localhost:3000"
+
+
+def test_replace_returns_new_card():
+    """replace 返回新对象，原卡片和它缓存的片段不变，新卡片的片段按新内容生成"""
+    print("=" * 60)
+    print("开始测试 replace")
+    print("=" * 60)
+
+    card = make_card()
+    fragment = card.to_json()
+    assert card.to_json() is fragment
+
+    renamed = card.replace(name="Prometheus", order=2)
+    print(f"   原卡片: {card}，新卡片: {renamed}")
+    assert renamed is not card
+    assert renamed._json is None
+    assert (renamed.id, renamed.created_time) == (card.id, card.created_time)
+    assert json.loads(renamed.to_json()) == renamed.to_dict()
+    assert json.loads(renamed.to_json())['name'] == "Prometheus"
+
+    assert card.name == "Grafana" and card.to_json() is fragment
+    assert json.loads(fragment)['name'] == "Grafana"
+
+    # update 忽略未知字段，replace 拒绝未知字段
+    assert card.update(name="Loki", unknown=1).name == "Loki"
+    try:
+        card.replace(unknown=1)
+    except TypeError:
+        pass
+    else:
+        raise AssertionError("replace 未知字段应抛出 TypeError")
+
+
+def test_fragments_do_not_outlive_replace():
+    """批量片段和字段投影都按修改后的卡片生成，不会复用修改前缓存的片段"""
+    print("=" * 60)
+    print("开始测试片段缓存失效")
+    print("=" * 60)
+
+    cards = [make_card(), make_card().replace(name="Loki", order=2)]
+    before = card_fragments(cards)
+    assert [card._json is not None for card in cards] == [True, True]
+
+    updated = [cards[0].replace(description="日志"), cards[1]]
+    after = card_fragments(updated)
+    assert after[1] is before[1]
+    assert after[0] != before[0]
+    assert [json.loads(data) for data in after] == [card.to_dict() for card in updated]
+    assert after[0] == encode_fragment(updated[0].to_dict())
+
+    # 序列化函数按字段组合缓存，取值来自传入的卡片
+    serialize = card_serializer(['name', 'description'])
+    assert card_serializer(['description', 'name']) is serialize
+    assert serialize(updated[0]) == {'name': "Grafana", 'description': "日志"}
+
+    # 接口：列表响应拼接缓存的片段，修改后的卡片返回新内容
+    app = create_test_app()
+    client = app.test_client()
+    login(app, client)
+    card = create_cards(client, 2)[0]
+    assert client.get('/api/cards').get_json()['data']['items'][0]['name'] == "服务1"
+
+    assert client.put(f"/api/cards/{card['id']}", json={'name': "服务1-更新"}).status_code == 200
+    full = client.get('/api/cards').get_json()['data']['items'][0]
+    projected = client.get('/api/cards?fields=name').get_json()['data']['items'][0]
+    print(f"   修改后: {full['name']}，投影: {projected}")
+    assert full['name'] == "服务1-更新"
+    assert projected == {'name': "服务1-更新"}
+
+
+if __name__ == "__main__":
+    test_card_is_immutable()
+    test_replace_returns_new_card()
+    test_fragments_do_not_outlive_replace()
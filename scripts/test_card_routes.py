@@ -0,0 +1,68 @@
+"""
+卡片接口测试脚本
+使用 Flask 测试客户端检查卡片接口的 HTTP 行为（不需要启动服务器）
+"""
+
+import sys
+import os
+import importlib.util
+
+# 添加项目根目录到路径
+project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, project_root)
+
+
+def create_test_app():
+    """创建使用内存存储的测试应用（app.py 与 app 包同名，按文件路径加载）"""
+    spec = importlib.util.spec_from_file_location('peler_main', os.path.join(project_root, 'app.py'))
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module.create_app('testing')
+
+
+def login(app, client):
+    """以管理员身份登录"""
+    response = client.post('/api/auth', json={'password': app.config['ADMIN_PASSWORD']})
+    assert response.status_code == 200
+
+
+def create_cards(client, count):
+    """创建测试卡片，返回卡片列表"""
+    cards = []
+    for i in range(1, count + 1):
+        response = client.post('/api/cards', json={
+            'name': f"服务{i}", 'icon': 'bi-server', 'url': f"http://localhost:{8000 + i}",
+            'description': f"测试服务{i}"
+        })
+        assert response.status_code == 201, response.get_json()
+        cards.append(response.get_json()['data'])
+    return cards
+
+
+def test_visit_requires_auth():
+    """访问记录接口需要管理员认证，匿名请求不改变计数"""
+    print("=" * 60)
+    print("开始测试访问记录接口")
+    print("=" * 60)
+
+    app = create_test_app()
+    client = app.test_client()
+    login(app, client)
+    card = create_cards(client, 1)[0]
+    client.post('/api/logout')
+
+    anonymous = app.test_client()
+    response = anonymous.post(f"/api/cards/{card['id']}/visit")
+    print(f"   匿名访问记录: {response.status_code}")
+    assert response.status_code == 401
+
+    login(app, client)
+    response = client.post(f"/api/cards/{card['id']}/visit")
+    print(f"   管理员访问记录: {response.status_code} {response.get_json()['data']}")
+    assert response.status_code == 200
+    assert response.get_json()['data']['visits'] == 1
+    assert client.post('/api/cards/no-such-card/visit').status_code == 404
+
+
+if __name__ == "__main__":
+    test_visit_requires_auth()
@@ -0,0 +1,91 @@
+"""
+列式视图测试脚本
+检查安装 NumPy 时的向量化实现与纯 Python 实现的过滤、排序和游标定位结果完全一致
+"""
+
+import sys
+import os
+import random
+
+import pytest
+
+# 添加项目根目录到路径
+project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, project_root)
+
+from app.models import columns
+from app.models.card import Card
+from app.models.columns import CardColumns, SORT_KEYS
+from app.models.search import SearchIndex
+from app.models.usage import UsageCounter
+
+WORDS = ["Grafana", "监控", "Prometheus", "日志", "Backup", "服务", "nginx"]
+QUERIES = ['', 'grafana', 'GRAF', '监控', 'o', 'x', '服务1', 'backup 服', 'missing']
+
+
+def make_cards(rng, count, odd_created=False):
+    """
+    生成排序号和创建时间有重复的随机卡片（按 (order, id) 排序）
+
+    Args:
+        rng: 随机数生成器
+        count: 卡片数量
+        odd_created: 是否包含无法转换为时间戳的创建时间（走按字符串比较的分支）
+    """
+    cards = []
+    for i in range(count):
+        created = f"2024-01-{rng.randint(1, 9):02d}T08:00:00"
+        if odd_created and i % 7 == 0:
+            created = f"第{rng.randint(1, 3)}天"
+        cards.append(Card(id=f"card-{i:03d}", name=f"{rng.choice(WORDS)} {rng.choice(WORDS)}{i}",
+                          icon="bi-server", url=f"http://localhost:{8000 + i}",
+                          description=rng.choice(WORDS + ['']), order=rng.randint(1, count // 3),
+                          created_time=created))
+    return sorted(cards, key=lambda card: (card.order, card.id))
+
+
+def collect(cards, usage, cursors):
+    """在当前实现（由 columns.np 决定）上计算一组过滤、排序和游标结果，统一转换为列表"""
+    view = CardColumns(cards)
+    search = SearchIndex(cards)
+    result = {}
+    for query in QUERIES:
+        rows = view.filter(query)
+        result[('filter', query)] = list(rows)
+        result[('candidates', query)] = list(view.filter(query, search.candidates(query)))
+        for key in SORT_KEYS:
+            for descending in (False, True):
+                result[('sort', query, key, descending)] = list(view.sort(rows, key, descending, usage))
+        for cursor in cursors:
+            result[('after', query, cursor)] = list(view.after(rows, cursor))
+    for cursor in cursors:
+        result[('seek', cursor)] = view.seek(cursor)
+    return result
+
+
+@pytest.mark.parametrize('odd_created', [False, True])
+def test_numpy_matches_pure_python(monkeypatch, odd_created):
+    """NumPy 与纯 Python 实现的 filter、sort、seek、after 结果一致"""
+    pytest.importorskip('numpy')
+    print("=" * 60)
+    print("开始测试 NumPy 与纯 Python 实现一致")
+    print("=" * 60)
+
+    rng = random.Random(12)
+    cards = make_cards(rng, 90, odd_created)
+    usage = UsageCounter()
+    for _ in range(120):
+        usage.hit(rng.choice(cards).id)
+
+    # 游标覆盖存在的卡片、已删除的卡片、同排序号中间的位置和越界的排序号
+    cursors = [None, (0, ''), (cards[-1].order + 1, '')]
+    cursors += [(card.order, card.id) for card in rng.sample(cards, 10)]
+    cursors += [(card.order, card.id + '-deleted') for card in rng.sample(cards, 5)]
+
+    vectorized = collect(cards, usage, cursors)
+    monkeypatch.setattr(columns, 'np', None)
+    pure = collect(cards, usage, cursors)
+
+    mismatched = [key for key in pure if pure[key] != vectorized[key]]
+    print(f"   {len(pure)} 项结果，不一致: {mismatched[:5]}")
+    assert not mismatched
@@ -0,0 +1,78 @@
+"""
+响应压缩测试脚本
+检查静态文件预压缩，以及压缩中间件的协商和 Vary 头
+"""
+
+import sys
+import os
+import gzip
+import tempfile
+
+# 添加项目根目录到路径
+project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, project_root)
+
+from test_card_routes import create_test_app, login, create_cards
+from app.compression import precompress_static
+
+
+def test_precompress_static():
+    """预压缩生成 .gz 文件，未变化的文件不重复生成，单个文件失败只计数"""
+    print("=" * 60)
+    print("开始测试静态文件预压缩")
+    print("=" * 60)
+
+    with tempfile.TemporaryDirectory() as temp_dir:
+        with open(os.path.join(temp_dir, 'main.js'), 'w') as f:
+            f.write('console.log("PelerPanel");\n' * 100)
+        with open(os.path.join(temp_dir, 'small.css'), 'w') as f:
+            f.write('body{}')
+        # 指向不存在文件的链接：读取时抛出 OSError
+        os.symlink(os.path.join(temp_dir, 'missing.js'), os.path.join(temp_dir, 'broken.js'))
+
+        result = precompress_static(temp_dir, min_size=1024)
+        print(f"   首次预压缩: {result}")
+        assert result == {'created': 1, 'errors': 1}
+        assert os.path.exists(os.path.join(temp_dir, 'main.js.gz'))
+        assert not os.path.exists(os.path.join(temp_dir, 'small.css.gz'))
+        assert not [name for name in os.listdir(temp_dir) if name.startswith('.precompress-')]
+
+        result = precompress_static(temp_dir, min_size=1024)
+        print(f"   再次预压缩: {result}")
+        assert result == {'created': 0, 'errors': 1}
+
+
+def test_gzip_negotiation():
+    """按 Accept-Encoding 压缩，未协商时不压缩，两种情况都带 Vary: Accept-Encoding"""
+    print("=" * 60)
+    print("开始测试响应压缩协商")
+    print("=" * 60)
+
+    app = create_test_app()
+    client = app.test_client()
+    login(app, client)
+    create_cards(client, 12)
+
+    plain = client.get('/api/cards')
+    assert len(plain.data) > app.config['COMPRESSION_MIN_SIZE']
+    assert 'Content-Encoding' not in plain.headers
+    assert 'Accept-Encoding' in plain.headers['Vary']
+
+    compressed = client.get('/api/cards', headers={'Accept-Encoding': 'gzip, deflate'})
+    print(f"   gzip: {len(plain.data)} -> {len(compressed.data)} 字节，Vary: {compressed.headers['Vary']}")
+    assert compressed.headers['Content-Encoding'] == 'gzip'
+    assert 'Accept-Encoding' in compressed.headers['Vary'] and 'Accept' in compressed.headers['Vary']
+    assert gzip.decompress(compressed.data) == plain.data
+    # 压缩后的响应使用弱 ETag，条件请求仍能命中
+    assert compressed.headers['ETag'] == f"W/{plain.headers['ETag']}"
+    assert client.get('/api/cards', headers={'Accept-Encoding': 'gzip',
+                                             'If-None-Match': compressed.headers['ETag']}).status_code == 304
+
+    refused = client.get('/api/cards', headers={'Accept-Encoding': 'gzip;q=0, identity'})
+    assert 'Content-Encoding' not in refused.headers and refused.data == plain.data
+    assert client.get('/api/cards', headers={'Accept-Encoding': 'deflate'}).headers['Content-Encoding'] == 'deflate'
+
+
+if __name__ == "__main__":
+    test_precompress_static()
+    test_gzip_negotiation()
@@ -0,0 +1,52 @@
+"""
+条件请求测试脚本
+检查卡片接口的 ETag 与 If-None-Match
+"""
+
+import sys
+import os
+
+# 添加项目根目录到路径
+project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, project_root)
+
+from test_card_routes import create_test_app, login, create_cards
+
+
+def test_conditional_get():
+    """ETag 随数据版本和响应格式变化，If-None-Match 命中时返回 304"""
+    print("=" * 60)
+    print("开始测试条件请求")
+    print("=" * 60)
+
+    app = create_test_app()
+    client = app.test_client()
+    login(app, client)
+    card = create_cards(client, 2)[0]
+
+    response = client.get('/api/cards')
+    etag = response.headers['ETag']
+    print(f"   ETag: {etag}")
+    not_modified = client.get('/api/cards', headers={'If-None-Match': etag})
+    print(f"   If-None-Match: {not_modified.status_code}")
+    assert not_modified.status_code == 304
+    assert not_modified.data == b''
+
+    # 不同的查询参数和响应格式各有自己的 ETag
+    assert client.get('/api/cards?fields=id').headers['ETag'] != etag
+    assert client.get('/api/cards', headers={'Accept': 'application/msgpack'}).headers['ETag'] != etag
+
+    single = client.get(f"/api/cards/{card['id']}")
+    assert client.get(f"/api/cards/{card['id']}",
+                      headers={'If-None-Match': single.headers['ETag']}).status_code == 304
+
+    # 写入之后旧的 ETag 失效
+    assert client.put(f"/api/cards/{card['id']}", json={'name': "服务1-更新"}).status_code == 200
+    response = client.get('/api/cards', headers={'If-None-Match': etag})
+    print(f"   写入后: {response.status_code}")
+    assert response.status_code == 200
+    assert response.headers['ETag'] != etag
+
+
+if __name__ == "__main__":
+    test_conditional_get()
@@ -0,0 +1,41 @@
+"""
+字段投影测试脚本
+检查 fields 参数只返回指定的字段
+"""
+
+import sys
+import os
+
+# 添加项目根目录到路径
+project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, project_root)
+
+from test_card_routes import create_test_app, login, create_cards
+
+
+def test_fields_projection():
+    """fields 只返回指定的字段，未指定时返回全部字段"""
+    print("=" * 60)
+    print("开始测试字段投影")
+    print("=" * 60)
+
+    app = create_test_app()
+    client = app.test_client()
+    login(app, client)
+    card = create_cards(client, 2)[0]
+
+    items = client.get('/api/cards?fields=id,name').get_json()['data']['items']
+    print(f"   列表: {items[0]}")
+    assert [set(item) for item in items] == [{'id', 'name'}] * 2
+    assert items[0] == {'id': card['id'], 'name': card['name']}
+
+    data = client.get(f"/api/cards/{card['id']}?fields=url").get_json()['data']
+    print(f"   单个卡片: {data}")
+    assert data == {'url': card['url']}
+
+    full = client.get('/api/cards').get_json()['data']['items'][0]
+    assert full == card
+
+
+if __name__ == "__main__":
+    test_fields_projection()
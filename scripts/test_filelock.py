@@ -0,0 +1,75 @@
+"""
+跨进程写锁测试脚本
+多个进程同时通过事务写同一个数据文件，检查没有丢失的写入和重复的排序号
+"""
+
+import sys
+import os
+import json
+import tempfile
+import multiprocessing
+
+# 添加项目根目录到路径
+project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, project_root)
+
+from app.models import DataManager
+from app.models.card import Card
+
+CARDS_PER_WORKER = 25
+
+
+def add_cards(path, worker, count):
+    """
+    在独立进程中逐张添加卡片，每张卡片一个事务（排序号取事务内的下一个排序号）
+
+    Args:
+        path: 数据文件路径
+        worker: 进程编号，用于生成不重复的名称
+        count: 添加的卡片数量
+    """
+    manager = DataManager(path)
+    for i in range(count):
+        with manager.transaction() as tx:
+            tx.put(Card.create(name=f"进程{worker}-服务{i}", icon="bi-server",
+                               url=f"http://localhost:{8000 + i}", description="", order=tx.next_order()))
+        if not tx.committed:
+            raise RuntimeError(f"进程{worker} 第{i}次提交失败")
+    manager.backup_engine.flush(30)
+
+
+def test_concurrent_transactions():
+    """两个进程各添加 N 张卡片，文件中最终有 2N 张卡片且排序号互不重复"""
+    print("=" * 60)
+    print("开始测试跨进程事务")
+    print("=" * 60)
+
+    with tempfile.TemporaryDirectory() as temp_dir:
+        path = os.path.join(temp_dir, 'cards.json')
+        manager = DataManager(path)
+        assert manager.save_cards([])
+        assert manager.backup_engine.flush(10)
+
+        context = multiprocessing.get_context('spawn')
+        workers = [context.Process(target=add_cards, args=(path, worker, CARDS_PER_WORKER))
+                   for worker in range(2)]
+        for process in workers:
+            process.start()
+        for process in workers:
+            process.join(120)
+        assert [process.exitcode for process in workers] == [0, 0]
+
+        with open(path, 'r', encoding='utf-8') as f:
+            cards = json.load(f)['cards']
+        orders = sorted(card['order'] for card in cards)
+        print(f"   卡片数: {len(cards)}，排序号: {orders[0]}..{orders[-1]}")
+        assert len(cards) == 2 * CARDS_PER_WORKER
+        assert len({card['id'] for card in cards}) == len(cards)
+        assert orders == list(range(1, 2 * CARDS_PER_WORKER + 1))
+
+        # 已有实例读到其他进程写入的全部卡片
+        assert manager.count_cards() == 2 * CARDS_PER_WORKER
+
+
+if __name__ == "__main__":
+    test_concurrent_transactions()
@@ -0,0 +1,63 @@
+"""
+片段拼接测试脚本
+检查用缓存片段拼接的卡片列表响应与 jsonify 逐字节一致
+"""
+
+import sys
+import os
+
+# 添加项目根目录到路径
+project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, project_root)
+
+from flask.json.provider import DefaultJSONProvider
+from test_card_routes import create_test_app, login, create_cards
+from app.api import get_response_cache
+from app.api.utils import success_response
+from app.models.card import Card
+
+
+def expected_payload(response):
+    """按 jsonify(success_response(...)) 的方式重建卡片列表响应的内容（卡片字段按 to_dict 的顺序）"""
+    data = response.get_json()
+    items = [Card.from_dict(item).to_dict() for item in data['data']['items']]
+    return success_response(data={'items': items, 'total': data['data']['total']}, message=data['message'])
+
+
+def test_fragment_splice_matches_jsonify():
+    """拼接缓存片段生成的列表响应与 jsonify 逐字节一致"""
+    print("=" * 60)
+    print("开始测试片段拼接")
+    print("=" * 60)
+
+    app = create_test_app()
+    client = app.test_client()
+    login(app, client)
+    create_cards(client, 5)
+    app.json.compact = True
+
+    with app.app_context():
+        cache = get_response_cache()
+        for ensure_ascii in (False, True):
+            app.json.ensure_ascii = ensure_ascii
+            cache.clear()
+            response = client.get('/api/cards')
+
+            # 改造之前的 jsonify：Flask 默认提供者，相同的排序和转义设置
+            provider = DefaultJSONProvider(app)
+            provider.compact = True
+            provider.sort_keys = True
+            provider.ensure_ascii = ensure_ascii
+            expected = provider.response(expected_payload(response)).get_data()
+            print(f"   ensure_ascii={ensure_ascii}: {response.data == expected}，{len(response.data)} 字节")
+            assert response.data == expected
+
+        # 安装默认提供者时使用 encode_fragment 拼接，结果同样一致
+        app.json = provider
+        cache.clear()
+        response = client.get('/api/cards')
+        assert response.data == provider.response(expected_payload(response)).get_data()
+
+
+if __name__ == "__main__":
+    test_fragment_splice_matches_jsonify()
@@ -0,0 +1,76 @@
+"""
+预写日志测试脚本
+检查日志模式下的回放和合并：其他实例回放日志读到变更，合并后日志清空，快照包含全部变更
+"""
+
+import sys
+import os
+import json
+import tempfile
+
+# 添加项目根目录到路径
+project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, project_root)
+
+from app.models import DataManager
+from app.models.card import Card
+
+
+def make_cards(count):
+    """生成测试卡片"""
+    return [Card.create(name=f"服务{i}", icon="bi-server", url=f"http://localhost:{8000 + i}",
+                        description=f"测试服务{i}", order=i) for i in range(1, count + 1)]
+
+
+def test_journal_replay_and_compaction():
+    """日志模式下其他实例回放日志读到变更；合并后日志清空，快照包含全部变更"""
+    print("=" * 60)
+    print("开始测试预写日志")
+    print("=" * 60)
+
+    with tempfile.TemporaryDirectory() as temp_dir:
+        path = os.path.join(temp_dir, 'cards.json')
+        writer = DataManager(path, journal=True, journal_max_records=1000)
+        reader = DataManager(path, journal=True, journal_max_records=1000)
+
+        cards = make_cards(3)
+        for card in cards:
+            with writer.transaction() as tx:
+                tx.put(card)
+            assert tx.committed
+
+        # 快照中还没有卡片，其他实例从日志回放
+        with open(path, 'r', encoding='utf-8') as f:
+            assert json.load(f)['cards'] == []
+        assert [card.id for card in reader.load_cards()] == [card.id for card in cards]
+
+        # 日志只是变长时增量回放
+        with writer.transaction() as tx:
+            tx.delete(cards[0].id)
+        replays = reader.get_cache_stats()['wal_replays']
+        assert [card.id for card in reader.load_cards()] == [card.id for card in cards[1:]]
+        assert reader.get_cache_stats()['wal_replays'] == replays + 1
+        print(f"   日志: {writer.get_journal_stats()}")
+        assert writer.get_journal_stats()['records'] == 4
+
+        generation = writer.generation()
+        assert writer.compact()
+        stats = writer.get_journal_stats()
+        print(f"   合并后: {stats}")
+        assert stats['size'] == 0 and stats['compactions'] == 1
+        with open(path, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+        assert [card['id'] for card in data['cards']] == [card.id for card in cards[1:]]
+        assert data['config']['generation'] == 4
+
+        # 合并不改变数据版本中的代数，新实例和已有实例读到相同的内容
+        assert writer.generation().split(':')[0] == generation.split(':')[0]
+        fresh = DataManager(path, journal=True)
+        assert [card.id for card in fresh.load_cards()] == [card.id for card in cards[1:]]
+        assert [card.id for card in reader.load_cards()] == [card.id for card in cards[1:]]
+        # 等待异步备份写完再删除临时目录
+        assert writer.backup_engine.flush(10)
+
+
+if __name__ == "__main__":
+    test_journal_replay_and_compaction()
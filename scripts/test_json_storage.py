@@ -0,0 +1,84 @@
+"""
+JSON 文件存储测试脚本
+检查读缓存：缓存有效时不重新解析，外部修改数据文件后读到新内容
+"""
+
+import sys
+import os
+import json
+import tempfile
+
+# 添加项目根目录到路径
+project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, project_root)
+
+from app.models import DataManager
+from app.models.card import Card
+
+
+def make_cards(count):
+    """生成测试卡片"""
+    return [Card.create(name=f"服务{i}", icon="bi-server", url=f"http://localhost:{8000 + i}",
+                        description=f"测试服务{i}", order=i) for i in range(1, count + 1)]
+
+
+def edit_externally(path, edit, replace=True):
+    """
+    模拟外部编辑数据文件
+
+    Args:
+        path: 数据文件路径
+        edit: 修改文档的函数
+        replace: True 时写临时文件再重命名（编辑器的保存方式），否则原地重写
+    """
+    with open(path, 'r', encoding='utf-8') as f:
+        data = json.load(f)
+    edit(data)
+    target = path + '.edit' if replace else path
+    with open(target, 'w', encoding='utf-8') as f:
+        json.dump(data, f, ensure_ascii=False, indent=4)
+    if replace:
+        os.replace(target, path)
+
+
+def test_read_cache_sees_external_writes():
+    """读缓存命中时不重新解析；文件被外部修改（重命名或原地重写）后读到新内容"""
+    print("=" * 60)
+    print("开始测试读缓存")
+    print("=" * 60)
+
+    with tempfile.TemporaryDirectory() as temp_dir:
+        path = os.path.join(temp_dir, 'cards.json')
+        manager = DataManager(path)
+        assert manager.save_cards(make_cards(3))
+
+        manager.load_cards()
+        generation = manager.generation()
+        hits = manager.get_cache_stats()['hits']
+        manager.load_cards()
+        assert manager.get_cache_stats()['hits'] == hits + 1
+
+        def rename_first(data):
+            data['cards'][0]['name'] = "外部修改"
+
+        edit_externally(path, rename_first)
+        names = [card.name for card in manager.load_cards()]
+        stats = manager.get_cache_stats()
+        print(f"   重命名保存后: {names[0]}，缓存: {stats}")
+        assert names[0] == "外部修改"
+        assert stats['reloads'] == 1
+        assert manager.generation() != generation
+
+        def drop_last(data):
+            data['cards'].pop()
+
+        edit_externally(path, drop_last, replace=False)
+        print(f"   原地重写后: {manager.count_cards()} 张")
+        assert manager.count_cards() == 2
+        assert manager.get_card_by_id(manager.load_cards()[0].id).name == "外部修改"
+        # 等待异步备份写完再删除临时目录
+        assert manager.backup_engine.flush(10)
+
+
+if __name__ == "__main__":
+    test_read_cache_sees_external_writes()
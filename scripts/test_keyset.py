@@ -0,0 +1,102 @@
+"""
+keyset 分页测试脚本
+检查卡片列表接口的游标翻页，以及各存储后端在排序号相同时使用同一个 (order, id) 顺序
+"""
+
+import sys
+import os
+import tempfile
+
+# 添加项目根目录到路径
+project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, project_root)
+
+from test_card_routes import create_test_app, login, create_cards
+from app.models import DataManager, create_data_manager
+from app.models.card import Card
+
+
+def test_keyset_cursor():
+    """按游标逐页读取得到完整且不重复的列表，翻页期间新建的卡片出现在后续页"""
+    print("=" * 60)
+    print("开始测试 keyset 分页")
+    print("=" * 60)
+
+    app = create_test_app()
+    client = app.test_client()
+    login(app, client)
+    cards = create_cards(client, 7)
+
+    seen = []
+    response = client.get('/api/cards?limit=3')
+    while True:
+        data = response.get_json()['data']
+        seen.extend(item['id'] for item in data['items'])
+        print(f"   本页: {len(data['items'])} 张，游标: {data['cursor']}")
+        if not data['cursor']['has_next']:
+            assert data['cursor']['next'] is None
+            break
+        if len(seen) == 3:
+            # 新卡片排在末尾，已读的页不变，后续页包含它
+            response = client.post('/api/cards', json={'name': "新服务", 'icon': 'bi-server',
+                                                       'url': 'http://localhost:9000'})
+            assert response.status_code == 201
+            cards.append(response.get_json()['data'])
+        response = client.get(f"/api/cards?limit=3&after={data['cursor']['next']}")
+        assert response.status_code == 200
+    assert seen == [card['id'] for card in cards]
+
+    assert client.get('/api/cards?after=abc').status_code == 400
+    assert client.get('/api/cards?limit=0').status_code == 400
+    assert client.get('/api/cards?limit=3&sort=name').status_code == 400
+
+
+def read_pages(manager, limit):
+    """按游标逐页读取全部卡片ID"""
+    ids, after = [], None
+    while True:
+        page = manager.cards_after(after, limit)
+        ids.extend(card.id for card in page)
+        if len(page) < limit:
+            return ids
+        after = (page[-1].order, page[-1].id)
+
+
+def test_tied_orders_across_backends():
+    """排序号相同的卡片在 JSON、SQLite 与内存后端中都按ID排列，游标翻页结果一致"""
+    print("=" * 60)
+    print("开始测试相同排序号的分页")
+    print("=" * 60)
+
+    # 写入顺序与ID顺序相反，排序号有重复
+    cards = [Card(id=f"card-{i:02d}", name=f"服务{i}", icon="bi-server", url=f"http://localhost:{8000 + i}",
+                  description="", order=order, created_time="2024-01-01T00:00:00")
+             for i, order in reversed(list(enumerate([1, 1, 1, 2, 2, 3, 3, 3, 3])))]
+    expected = [card.id for card in sorted(cards, key=lambda card: (card.order, card.id))]
+
+    with tempfile.TemporaryDirectory() as temp_dir:
+        for data_path in (os.path.join(temp_dir, 'cards.json'),
+                          'sqlite:///' + os.path.join(temp_dir, 'cards.db'),
+                          ':memory:'):
+            manager = create_data_manager(data_path)
+            assert manager.save_cards(cards)
+
+            assert [card.id for card in manager.load_cards()] == expected
+            for limit in (1, 2, 4):
+                pages = read_pages(manager, limit)
+                print(f"   {type(manager).__name__} 每页 {limit}: {pages == expected}")
+                assert pages == expected
+
+            # 游标卡片被删除（不整理排序号）后，从排在它之后的同排序号卡片继续
+            with manager.transaction() as tx:
+                tx.delete('card-06')
+            page = manager.cards_after((3, 'card-06'), 2)
+            assert [card.id for card in page] == ['card-07', 'card-08']
+
+            if isinstance(manager, DataManager):
+                assert manager.backup_engine.flush(10)
+
+
+if __name__ == "__main__":
+    test_keyset_cursor()
+    test_tied_orders_across_backends()
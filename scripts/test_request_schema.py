@@ -0,0 +1,151 @@
+"""
+请求模式测试脚本
+向每个声明了查询参数或请求体模式的接口发送不合法的请求，检查状态码和错误提示
+"""
+
+import sys
+import os
+import importlib.util
+
+# 添加项目根目录到路径
+project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, project_root)
+
+from app.api.schema import compile_query, compile_body
+
+
+def create_test_app():
+    """创建使用内存存储的测试应用（app.py 与 app 包同名，按文件路径加载）"""
+    spec = importlib.util.spec_from_file_location('peler_main', os.path.join(project_root, 'app.py'))
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module.create_app('testing')
+
+
+def expect_error(response, message):
+    """检查响应为 400 且错误提示与预期一致"""
+    data = response.get_json()
+    print(f"   {response.status_code} {data.get('message')}")
+    assert response.status_code == 400, response.status_code
+    assert data['success'] is False
+    assert data['message'] == message, data['message']
+
+
+def test_compiled_validators():
+    """校验函数本身：转换、默认值、范围和错误提示"""
+    print("=" * 60)
+    print("开始测试模式校验函数")
+    print("=" * 60)
+
+    validate = compile_query({
+        'page': {'type': int, 'default': 1, 'min': 1},
+        'flag': {'type': bool},
+        'q': {'type': str, 'required': True}
+    })
+    assert validate({'q': ' x ', 'flag': 'Yes'}) == {'page': 1, 'flag': True, 'q': 'x'}
+    for args, message in [
+        ({}, "缺少必填参数: q"),
+        ({'q': 'x', 'page': 'abc'}, "参数 page 类型错误: invalid literal for int() with base 10: 'abc'"),
+        ({'q': 'x', 'page': '0'}, "参数 page不能小于1")
+    ]:
+        try:
+            validate(args)
+        except ValueError as e:
+            print(f"   {args} -> {e}")
+            assert str(e) == message
+        else:
+            raise AssertionError(f"{args} 应校验失败")
+
+    validate = compile_body({
+        'name': {'type': str, 'required': True, 'max': 3},
+        'note': {'type': str},
+        'tags': {'type': list, 'default': []}
+    })
+    assert validate({'name': 'abc', 'extra': 1}) == {'name': 'abc', 'tags': []}
+    assert validate({'name': 'abc', 'note': None}) == {'name': 'abc', 'note': None, 'tags': []}
+    for data, message in [
+        ([], "请求数据必须是对象格式"),
+        ({'name': None}, "缺少必填字段: name"),
+        ({'name': 1}, "name必须是字符串"),
+        ({'name': 'abcd'}, "name长度不能大于3"),
+        ({'name': 'a', 'tags': 'x'}, "tags必须是数组格式")
+    ]:
+        try:
+            validate(data)
+        except ValueError as e:
+            print(f"   {data} -> {e}")
+            assert str(e) == message
+        else:
+            raise AssertionError(f"{data} 应校验失败")
+
+    # 模式本身的拼写错误在导入时发现
+    try:
+        compile_body({'name': {'typ': str}})
+    except ValueError as e:
+        print(f"   模式错误: {e}")
+    else:
+        raise AssertionError("未知配置项应报错")
+
+
+def test_routes_reject_bad_requests():
+    """每个声明了模式的接口都拒绝不合法的请求"""
+    print("=" * 60)
+    print("开始测试接口请求校验")
+    print("=" * 60)
+
+    app = create_test_app()
+    client = app.test_client()
+
+    print("\n1. 查询参数")
+    print("-" * 30)
+    expect_error(client.get('/api/cards?page=abc'),
+                 "参数 page 类型错误: invalid literal for int() with base 10: 'abc'")
+    expect_error(client.get('/api/cards?sort=color'),
+                 "参数 sort 的值必须是以下之一: ['order', 'name', 'created_time', 'usage']")
+    expect_error(client.get('/api/cards?dir=up'), "参数 dir 的值必须是以下之一: ['asc', 'desc']")
+    expect_error(client.get('/api/cards?fields=id,colour'), "不支持的字段: colour")
+    expect_error(client.get('/api/cards/suggest?limit=x'),
+                 "参数 limit 类型错误: invalid literal for int() with base 10: 'x'")
+    expect_error(client.get('/api/cards/some-id?fields=bogus'), "不支持的字段: bogus")
+    assert client.get('/api/icons?search=home').status_code == 200
+
+    print("\n2. 请求体（无需认证的接口）")
+    print("-" * 30)
+    expect_error(client.post('/api/auth', json={}), "缺少必填字段: password")
+    expect_error(client.post('/api/auth', json={'password': 123}), "password必须是字符串")
+    response = client.post('/api/auth', data='{bad', content_type='application/json')
+    print(f"   {response.status_code} {response.get_json()['message']}")
+    assert response.status_code == 400 and response.get_json()['message'].startswith("JSON格式错误")
+    expect_error(client.post('/api/validate-name', json=['x']), "请求数据必须是对象格式")
+    expect_error(client.post('/api/validate-name', json={'exclude_id': 'x'}), "缺少必填字段: name")
+    expect_error(client.post('/api/validate-name', json={'name': 'x', 'exclude_id': 5}), "exclude_id必须是字符串")
+
+    print("\n3. 请求体（需要认证的接口）")
+    print("-" * 30)
+    login = client.post('/api/auth', json={'password': app.config['ADMIN_PASSWORD']})
+    assert login.status_code == 200
+
+    expect_error(client.post('/api/cards', json={'name': 'x'}), "缺少必填字段: icon, url")
+    expect_error(client.post('/api/cards', json={'name': 'x', 'icon': 'bi-x', 'url': ['u']}), "url必须是字符串")
+    expect_error(client.put('/api/cards/some-id', json={'name': 5}), "name必须是字符串")
+    expect_error(client.put('/api/cards/some-id', json=[1]), "请求数据必须是对象格式")
+
+    # 排序接口的提示与改为模式声明之前一致
+    for body, message in [
+        ({}, "缺少必填字段: orders"),
+        ({'orders': 'x'}, "orders必须是数组格式"),
+        ({'orders': []}, "orders不能为空"),
+        ({'orders': [1]}, "orders[0]必须是对象格式"),
+        ({'orders': [{'id': 'a', 'order': 1}, {'id': 'b'}]}, "orders[1]必须包含id和order字段"),
+        ({'orders': [{'id': 'a', 'order': 0}]}, "orders[0].order必须是大于0的整数"),
+        ({'orders': [{'id': 'a', 'order': '2'}]}, "orders[0].order必须是大于0的整数"),
+        ({'orders': [{'id': 'a', 'order': True}]}, "orders[0].order必须是大于0的整数")
+    ]:
+        expect_error(client.post('/api/cards/reorder', json=body), message)
+
+    print("\n接口请求校验测试完成！")
+
+
+if __name__ == "__main__":
+    test_compiled_validators()
+    test_routes_reject_bad_requests()
@@ -0,0 +1,135 @@
+"""
+响应缓存测试脚本
+检查 LRU 命中与淘汰，以及卡片列表接口的缓存键随数据版本、访问统计和查询参数变化
+"""
+
+import sys
+import os
+
+# 添加项目根目录到路径
+project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, project_root)
+
+from test_card_routes import create_test_app, login, create_cards
+from app.api import get_card_service, get_response_cache
+from app.cache import ResponseCache
+
+
+def test_lru_hits_and_eviction():
+    """命中时移到最近使用的位置，超过条数或字节数上限时淘汰最久未使用的条目"""
+    print("=" * 60)
+    print("开始测试 LRU 缓存")
+    print("=" * 60)
+
+    cache = ResponseCache(max_entries=2, max_bytes=1024)
+    cache.put('a', b'aaa')
+    cache.put('b', b'bbb')
+    assert cache.get('a') == b'aaa'
+    assert cache.get('missing') is None
+
+    # b 最久未使用，按条数淘汰
+    cache.put('c', b'ccc')
+    stats = cache.get_stats()
+    print(f"   按条数淘汰: {stats}")
+    assert cache.get('b') is None
+    assert cache.get('a') == b'aaa' and cache.get('c') == b'ccc'
+    assert stats['evictions'] == 1 and stats['entries'] == 2 and stats['bytes'] == 6
+
+    cache = ResponseCache(max_entries=10, max_bytes=10)
+    cache.put('x', b'1234')
+    cache.put('y', b'1234')
+    cache.get('x')
+    cache.put('z', b'1234')
+    stats = cache.get_stats()
+    print(f"   按字节淘汰: {stats}")
+    assert cache.get('y') is None and cache.get('x') == b'1234'
+    assert stats['bytes'] == 8 and stats['evictions'] == 1
+
+    # 替换同一个键时按新长度计数；超过总上限的响应不缓存，也不挤掉已有条目
+    cache.put('x', b'12')
+    assert cache.get_stats()['bytes'] == 6
+    cache.put('big', b'0' * 11)
+    assert cache.get('big') is None and cache.get('z') == b'1234'
+    assert cache.get_stats()['rejected'] == 1
+
+    disabled = ResponseCache(max_entries=0)
+    disabled.put('a', b'aaa')
+    assert not disabled.enabled and disabled.get('a') is None
+
+
+def test_cards_cache_key():
+    """缓存命中返回相同内容；写入或访问统计变化后不再命中；不同参数和格式不共用条目"""
+    print("=" * 60)
+    print("开始测试卡片列表缓存键")
+    print("=" * 60)
+
+    app = create_test_app()
+    client = app.test_client()
+    login(app, client)
+    cards = create_cards(client, 3)
+
+    # 只在取对象时进入应用上下文：保持上下文会让各请求共用 g 中协商好的响应格式
+    with app.app_context():
+        cache = get_response_cache()
+        card_service = get_card_service()
+    cache.clear()
+
+    first = client.get('/api/cards')
+    hits = cache.stats['hits']
+    second = client.get('/api/cards')
+    assert cache.stats['hits'] == hits + 1
+    assert second.data == first.data
+
+    # 每个变体第一次请求都未命中，内容与清空缓存后重新生成的一致
+    variants = [
+        ('/api/cards?fields=id', {}),
+        ('/api/cards?fields=name', {}),
+        ('/api/cards?fields=id,name', {}),
+        ('/api/cards?sort=name', {}),
+        ('/api/cards?sort=name&dir=desc', {}),
+        ('/api/cards?sort=created_time', {}),
+        ('/api/cards?sort=usage', {}),
+        ('/api/cards?per_page=2', {}),
+        ('/api/cards?limit=2', {}),
+        ('/api/cards?search=服务', {}),
+        ('/api/cards', {'Accept': 'application/msgpack'}),
+        ('/api/cards', {'Accept': 'application/cbor'}),
+    ]
+    bodies = {}
+    for url, headers in variants:
+        misses = cache.stats['misses']
+        response = client.get(url, headers=headers)
+        assert response.status_code == 200
+        assert cache.stats['misses'] == misses + 1, url
+        bodies[(url, tuple(headers.items()))] = response.data
+    print(f"   {len(variants)} 个变体: {cache.get_stats()['entries']} 条缓存")
+
+    cache.clear()
+    for url, headers in variants:
+        assert client.get(url, headers=headers).data == bodies[(url, tuple(headers.items()))], url
+
+    # 写入之后数据版本变化，读到新内容
+    client.get('/api/cards')
+    generation = card_service.generation()
+    assert client.put(f"/api/cards/{cards[0]['id']}", json={'name': "服务1-更新"}).status_code == 200
+    assert card_service.generation() != generation
+    misses = cache.stats['misses']
+    names = [item['name'] for item in client.get('/api/cards').get_json()['data']['items']]
+    print(f"   写入后: {names}")
+    assert cache.stats['misses'] == misses + 1
+    assert names[0] == "服务1-更新"
+
+    # 访问统计变化时数据版本不变，按 usage 排序的缓存同样失效
+    before = client.get('/api/cards?sort=usage').get_json()['data']['items']
+    generation = card_service.generation()
+    for _ in range(2):
+        assert client.post(f"/api/cards/{cards[2]['id']}/visit").status_code == 200
+    assert card_service.generation() == generation
+    after = client.get('/api/cards?sort=usage').get_json()['data']['items']
+    print(f"   访问后首位: {after[0]['name']}")
+    assert after[0]['id'] == cards[2]['id'] and after != before
+
+
+if __name__ == "__main__":
+    test_lru_hits_and_eviction()
+    test_cards_cache_key()
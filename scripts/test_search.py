@@ -0,0 +1,171 @@
+"""
+搜索索引测试脚本
+用随机卡片和查询词比对倒排索引候选过滤与逐张子串扫描的结果，并检查前端高亮依赖的匹配位置
+"""
+
+import sys
+import os
+import random
+
+# 添加项目根目录到路径
+project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, project_root)
+
+from app.models.card import Card
+from app.models.columns import CardColumns
+from app.models.search import SearchIndex, card_matches, match_ranges
+
+# 拉丁字母（含大小写）、汉字、转小写后变长的字符和基本多文种平面以外的字符
+ALPHABET = "abcdAB" + "监控日志服务" + "İ" + "🚀" + " "
+
+
+def random_text(rng, low, high):
+    """生成随机文本"""
+    return ''.join(rng.choice(ALPHABET) for _ in range(rng.randint(low, high)))
+
+
+def make_cards(rng, count):
+    """生成名称和描述随机的卡片（按 order 排序）"""
+    return [Card(id=f"card-{i:03d}", name=random_text(rng, 3, 10), icon="bi-server",
+                 url=f"http://localhost:{8000 + i}", description=random_text(rng, 0, 8),
+                 order=i + 1, created_time="2024-01-01T08:00:00")
+            for i in range(count)]
+
+
+def random_queries(rng, cards, count):
+    """从卡片文本中截取子串（长度 1 到 5），再加上随机生成的查询词"""
+    queries = []
+    for _ in range(count):
+        card = rng.choice(cards)
+        text = rng.choice((card.name, card.description or card.name)).lower()
+        length = rng.randint(1, 5)
+        start = rng.randint(0, max(len(text) - length, 0))
+        queries.append(text[start:start + length])
+        queries.append(random_text(rng, 1, 4).lower())
+    # 两个汉字的查询使用二元组
+    queries += ['监控', '日志', '服务', '控日', '志监']
+    return [query for query in queries if query.strip() == query and query]
+
+
+def scan(cards, query):
+    """逐张扫描：名称或描述包含查询词的卡片ID"""
+    return {card.id for card in cards if query in card.name.lower() or query in card.description.lower()}
+
+
+def check_parity(cards, index, queries):
+    """候选集合不遗漏匹配的卡片，按候选校验后的结果与逐张扫描一致"""
+    columns = CardColumns(cards)
+    short = 0
+    for query in queries:
+        expected = scan(cards, query)
+        candidates = index.candidates(query)
+        if candidates is None:
+            # 过短的查询词不能使用索引，顺序扫描
+            assert len(query) < 3
+            short += 1
+        else:
+            assert expected <= candidates, query
+        rows = columns.filter(query, candidates)
+        assert {cards[row].id for row in rows} == expected, query
+    return short
+
+
+def test_candidates_match_scan():
+    """随机查询：倒排索引候选过滤与逐张扫描一致，包括短查询、中文二元组和建索引后改名的卡片"""
+    print("=" * 60)
+    print("开始测试搜索索引与逐张扫描一致")
+    print("=" * 60)
+
+    rng = random.Random(7)
+    cards = make_cards(rng, 200)
+    index = SearchIndex(cards)
+    queries = random_queries(rng, cards, 300)
+
+    short = check_parity(cards, index, queries)
+    cjk_pairs = [query for query in queries if len(query) == 2 and index.candidates(query) is not None]
+    print(f"   {len(queries)} 个查询，短查询 {short} 个，中文二元组 {len(cjk_pairs)} 个")
+    assert short and cjk_pairs
+
+    # 建索引之后改名、改描述的卡片：增量更新索引，旧内容不再命中
+    for position in rng.sample(range(len(cards)), 40):
+        old = cards[position]
+        new = old.replace(name=random_text(rng, 3, 10), description=random_text(rng, 0, 8))
+        index.remove(old)
+        index.add(new)
+        cards[position] = new
+    check_parity(cards, index, queries + random_queries(rng, cards, 100))
+    assert index.postings == SearchIndex(cards).postings
+
+    renamed = cards[0].replace(name="Grafana 监控")
+    index.remove(cards[0])
+    index.add(renamed)
+    cards[0] = renamed
+    assert renamed.id in index.candidates('grafana') and renamed.id in index.candidates('监控')
+    check_parity(cards, index, ['graf', 'grafana', '监控', 'a 监'])
+
+
+def highlight(text, ranges):
+    """
+    按 static/js/main.js 的 highlightSearchTerm 拼接高亮结果，返回高亮片段和去掉标记后的文本
+
+    JavaScript 字符串按 UTF-16 码元下标切片，这里同样在 UTF-16 编码上切片。
+    """
+    units = text.encode('utf-16-le')
+
+    def piece(start, end):
+        return units[start * 2:end * 2].decode('utf-16-le')
+
+    highlighted, plain, last = [], '', 0
+    for start, end in ranges:
+        highlighted.append(piece(start, end))
+        plain += piece(last, start) + piece(start, end)
+        last = end
+    return highlighted, plain + piece(last, len(units) // 2)
+
+
+def test_match_ranges_for_highlight():
+    """匹配位置按 UTF-16 码元计、递增且不重叠，按位置切出的片段就是查询词"""
+    print("=" * 60)
+    print("开始测试高亮位置")
+    print("=" * 60)
+
+    rng = random.Random(11)
+    cards = make_cards(rng, 100)
+    checked = 0
+    for query in random_queries(rng, cards, 200):
+        for card in cards:
+            for text in (card.name, card.description):
+                ranges = match_ranges(text, query)
+                lowered = text.lower()
+                assert len(ranges) == lowered.count(query)
+                if not ranges:
+                    continue
+                checked += 1
+
+                previous = 0
+                for start, end in ranges:
+                    assert previous <= start < end <= len(text.encode('utf-16-le')) // 2
+                    previous = end
+
+                highlighted, plain = highlight(text, ranges)
+                assert plain == text
+                for segment in highlighted:
+                    if len(segment.lower()) == len(segment):
+                        assert segment.lower() == query
+                    else:
+                        # 转小写后变长的字符（İ）整体高亮
+                        assert query in segment.lower()
+    print(f"   校验 {checked} 段文本")
+    assert checked
+
+    # 接口返回的 matches 与按名称、描述分别计算的一致
+    card = Card.create(name="🚀 Grafana grafana", icon="bi-graph-up", url="http://localhost:3000",
+                       description="监控 GRAFANA")
+    matches = card_matches(card, " GrafANA ")
+    assert matches == {'name': [[3, 10], [11, 18]], 'description': [[3, 10]]}
+    assert highlight(card.name, matches['name'])[0] == ["Grafana", "grafana"]
+
+
+if __name__ == "__main__":
+    test_candidates_match_scan()
+    test_match_ranges_for_highlight()
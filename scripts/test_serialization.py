@@ -0,0 +1,100 @@
+"""
+JSON 编解码测试脚本
+检查 orjson、simplejson、标准库 json 三种后端的输出一致，以及后端未安装或不支持时的回退
+"""
+
+import sys
+import os
+import json
+from datetime import datetime
+
+# 添加项目根目录到路径
+project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, project_root)
+
+from app.models import serialization
+from app.models.card import Card
+
+SAMPLE = {
+    'success': True,
+    'message': "获取卡片列表成功",
+    'data': {
+        'items': [Card.create(name="服务1", icon="bi-server", url="http://localhost:8001",
+                              description="引号\"与换行\n", order=1).to_dict()],
+        'total': 1,
+        'cursor': None
+    }
+}
+
+
+def test_backends_agree():
+    """三种后端（未安装的按回退后的后端）紧凑输出逐字节一致，缩进输出语义相同"""
+    print("=" * 60)
+    print("开始测试 JSON 后端")
+    print("=" * 60)
+
+    print(f"   默认后端: {serialization.BACKEND}，simplejson: {serialization.simplejson is not None}")
+    expected = json.dumps(SAMPLE, sort_keys=True, ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+    for backend in serialization.BACKENDS:
+        for ensure_ascii in (False, True):
+            output = serialization.dumps(SAMPLE, sort_keys=True, ensure_ascii=ensure_ascii, backend=backend)
+            reference = json.dumps(SAMPLE, sort_keys=True, ensure_ascii=ensure_ascii,
+                                   separators=(',', ':')).encode('utf-8')
+            assert output == reference, (backend, ensure_ascii)
+        indented = serialization.dumps(SAMPLE, sort_keys=True, indent=True, backend=backend)
+        assert json.loads(indented) == SAMPLE
+        assert serialization.loads(expected, backend=backend) == SAMPLE
+        assert serialization.loads(expected.decode('utf-8'), backend=backend) == SAMPLE
+        print(f"   {backend}: {len(expected)} 字节一致")
+
+
+def test_fallbacks():
+    """不支持的值、未安装的后端和格式错误的输入"""
+    print("=" * 60)
+    print("开始测试 JSON 后端回退")
+    print("=" * 60)
+
+    # orjson 不支持的超大整数交给标准库
+    big = {'value': 2 ** 70}
+    for backend in serialization.BACKENDS:
+        assert serialization.dumps(big, backend=backend) == b'{"value":1180591620717411303424}'
+
+    # 无法直接编码的对象使用 default 转换
+    moment = datetime(2024, 1, 2, 3, 4, 5)
+    for backend in serialization.BACKENDS:
+        output = serialization.dumps({'time': moment}, default=lambda value: value.isoformat(), backend=backend)
+        assert json.loads(output) == {'time': '2024-01-02T03:04:05'}, backend
+
+    # 格式错误时各后端都抛出标准库的 JSONDecodeError
+    for backend in serialization.BACKENDS:
+        try:
+            serialization.loads(b'{"cards": [', backend=backend)
+        except json.JSONDecodeError as e:
+            print(f"   {backend}: {type(e).__name__}")
+        else:
+            raise AssertionError(f"{backend} 应抛出 JSONDecodeError")
+
+    # 指定的后端未安装时回退到自动选择的后端
+    assert serialization.available_backend('json') == 'json'
+    if serialization.simplejson is None:
+        assert serialization.available_backend('simplejson') == serialization.available_backend('auto')
+    saved = serialization.orjson
+    serialization.orjson = None
+    try:
+        fallback = serialization.available_backend('orjson')
+        print(f"   没有 orjson 时: {fallback}")
+        assert fallback == ('simplejson' if serialization.simplejson is not None else 'json')
+    finally:
+        serialization.orjson = saved
+
+    try:
+        serialization.available_backend('ujson')
+    except ValueError as e:
+        print(f"   {e}")
+    else:
+        raise AssertionError("不支持的后端名应报错")
+
+
+if __name__ == "__main__":
+    test_backends_agree()
+    test_fallbacks()
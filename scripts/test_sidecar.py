@@ -0,0 +1,161 @@
+"""
+索引文件测试脚本
+检查 cards.idx：摘要一致时直接加载（含搜索倒排表），数据文件被外部修改后重建，
+本进程提交和合并日志之后重新保存，冷启动不需要重建索引
+"""
+
+import sys
+import os
+import json
+import tempfile
+
+# 添加项目根目录到路径
+project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, project_root)
+
+from app.models import DataManager
+from app.models.card import Card
+from app.models.search import SearchIndex
+
+
+def make_cards(count):
+    """生成测试卡片"""
+    return [Card.create(name=f"服务{i}", icon="bi-server", url=f"http://localhost:{8000 + i}",
+                        description=f"测试服务{i}", order=i) for i in range(1, count + 1)]
+
+
+def edit_externally(path, edit, replace=True):
+    """
+    模拟外部编辑数据文件
+
+    Args:
+        path: 数据文件路径
+        edit: 修改文档的函数
+        replace: True 时写临时文件再重命名（编辑器的保存方式），否则原地重写
+    """
+    with open(path, 'r', encoding='utf-8') as f:
+        data = json.load(f)
+    edit(data)
+    target = path + '.edit' if replace else path
+    with open(target, 'w', encoding='utf-8') as f:
+        json.dump(data, f, ensure_ascii=False, indent=4)
+    if replace:
+        os.replace(target, path)
+
+
+def test_sidecar_invalidation():
+    """摘要一致时加载索引文件；数据文件被外部修改后重建索引，不使用过期内容"""
+    print("=" * 60)
+    print("开始测试索引文件")
+    print("=" * 60)
+
+    with tempfile.TemporaryDirectory() as temp_dir:
+        path = os.path.join(temp_dir, 'cards.json')
+        writer = DataManager(path)
+        assert writer.save_cards(make_cards(3))
+        writer.load_cards()
+        assert os.path.exists(os.path.join(temp_dir, 'cards.idx'))
+
+        cold = DataManager(path)
+        assert len(cold.load_cards()) == 3
+        print(f"   冷启动: {cold.sidecar.get_stats()}")
+        assert cold.sidecar.stats['loads'] == 1
+        assert cold.sidecar.stats['rebuilds'] == 0
+
+        def rename_first(data):
+            data['cards'][0]['name'] = "外部修改"
+
+        edit_externally(path, rename_first)
+        edited = DataManager(path)
+        names = [card.name for card in edited.load_cards()]
+        print(f"   外部修改后: {names[0]}，{edited.sidecar.get_stats()}")
+        assert names[0] == "外部修改"
+        assert edited.sidecar.stats['loads'] == 0
+        assert edited.sidecar.stats['rebuilds'] == 1
+
+        # 损坏的索引文件按失效处理
+        with open(os.path.join(temp_dir, 'cards.idx'), 'wb') as f:
+            f.write(b'not an index')
+        assert [card.name for card in DataManager(path).load_cards()] == names
+        # 等待异步备份写完再删除临时目录
+        assert writer.backup_engine.flush(10)
+
+
+def test_search_postings_persisted():
+    """搜索倒排表随索引文件保存，冷启动后首次搜索直接恢复，结果与重新构建一致"""
+    print("=" * 60)
+    print("开始测试索引文件中的搜索倒排表")
+    print("=" * 60)
+
+    with tempfile.TemporaryDirectory() as temp_dir:
+        path = os.path.join(temp_dir, 'cards.json')
+        cards = make_cards(20) + [Card.create(name="Grafana 监控面板", icon="bi-graph-up", url="http://localhost:3000",
+                                              description="Metrics", order=21)]
+        writer = DataManager(path)
+        assert writer.save_cards(cards)
+
+        cold = DataManager(path)
+        index, _ = cold._load_snapshot()
+        assert cold.sidecar.stats['loads'] == 1
+        # 只读不搜索时倒排表保持未解码
+        assert index._search is None and index._search_state is not None
+
+        rebuilt = SearchIndex(cards)
+        for query in ('grafana', '监控', '服务1', 'metrics', 'xyz'):
+            found = cold.search_candidates(query)
+            print(f"   {query}: {sorted(found) == sorted(rebuilt.candidates(query))}")
+            assert found == rebuilt.candidates(query)
+        assert index._search_state is None
+        assert index._search.postings == rebuilt.postings
+
+        # 恢复后的倒排表随修改增量更新
+        with cold.transaction() as tx:
+            tx.put(cards[20].update(name="Prometheus"))
+        assert cold.search_candidates('grafana') == set()
+        assert cold.search_candidates('prometheus') == {cards[20].id}
+        assert writer.backup_engine.flush(10) and cold.backup_engine.flush(10)
+
+
+def test_sidecar_saved_after_commit():
+    """本进程提交或合并日志之后索引文件仍与数据文件一致，冷启动直接加载"""
+    print("=" * 60)
+    print("开始测试提交后保存索引文件")
+    print("=" * 60)
+
+    with tempfile.TemporaryDirectory() as temp_dir:
+        path = os.path.join(temp_dir, 'cards.json')
+        writer = DataManager(path)
+        cards = make_cards(3)
+        assert writer.save_cards(cards)
+
+        with writer.transaction() as tx:
+            tx.put(cards[0].update(name="提交后修改"))
+        assert tx.committed
+
+        cold = DataManager(path)
+        names = [card.name for card in cold.load_cards()]
+        print(f"   提交后冷启动: {names}，{cold.sidecar.get_stats()}")
+        assert names[0] == "提交后修改"
+        assert cold.sidecar.stats['loads'] == 1 and cold.sidecar.stats['rebuilds'] == 0
+        assert cold.search_candidates('提交后') == {cards[0].id}
+
+        journal_path = os.path.join(temp_dir, 'journal', 'cards.json')
+        os.makedirs(os.path.dirname(journal_path))
+        assert writer.backup_engine.flush(10)
+        writer = DataManager(journal_path, journal=True)
+        for card in cards:
+            with writer.transaction() as tx:
+                tx.put(card)
+        assert writer.compact()
+        assert writer.backup_engine.flush(10)
+
+        cold = DataManager(journal_path, journal=True)
+        print(f"   合并后冷启动: {len(cold.load_cards())} 张，{cold.sidecar.get_stats()}")
+        assert [card.id for card in cold.load_cards()] == [card.id for card in cards]
+        assert cold.sidecar.stats['loads'] == 1 and cold.sidecar.stats['rebuilds'] == 0
+
+
+if __name__ == "__main__":
+    test_sidecar_invalidation()
+    test_search_postings_persisted()
+    test_sidecar_saved_after_commit()
@@ -0,0 +1,132 @@
+"""
+存储后端测试脚本
+对 JSON、SQLite 与内存后端执行相同的增删改查流程并比对结果
+"""
+
+import sys
+import os
+import tempfile
+
+# 添加项目根目录到路径
+project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, project_root)
+
+from app.models import DataManager, create_data_manager
+from app.models.card import Card
+
+
+def make_cards():
+    """生成测试卡片（各后端使用同一组卡片，排序号相同时按ID排列的结果可比）"""
+    return [
+        Card.create(name=f"服务{i}", icon="bi-server", url=f"http://localhost:{8000 + i}",
+                    description=f"测试服务{i}", order=i)
+        for i in range(1, 6)
+    ]
+
+
+def run_backend_flow(data_path, cards):
+    """
+    在指定后端上执行一组增删改查操作
+
+    Args:
+        data_path: 数据路径
+        cards: 初始卡片
+
+    Returns:
+        list: 最终的 (名称, 排序号) 列表
+    """
+    manager = create_data_manager(data_path)
+    print(f"\n后端: {type(manager).__name__} ({data_path})")
+    print("-" * 30)
+
+    print(f"   整体保存: {manager.save_cards(cards)}")
+    print(f"   卡片数量: {len(manager.load_cards())}")
+    print(f"   名称'服务3'存在: {manager.card_name_exists('服务3')}")
+    # 名称按规范化后比较：忽略首尾空白、大小写与全半角差异
+    normalized_exists = manager.card_name_exists(' 服务３ ')
+    print(f"   名称' 服务３ '存在: {normalized_exists}")
+    assert normalized_exists
+    print(f"   下一个排序号: {manager.get_next_order()}")
+
+    updated = cards[1].update(name="服务2-更新")
+    print(f"   单卡更新: {manager.upsert_card(updated)}")
+    print(f"   按ID获取: {manager.get_card_by_id(cards[1].id)}")
+
+    print(f"   删除卡片: {manager.delete_card(cards[0].id)}")
+    print(f"   删除不存在的卡片: {manager.delete_card('non-existent-id')}")
+    print(f"   重新排序: {manager.reorder({cards[4].id: 1, cards[2].id: 4})}")
+    # 名称联想：前缀匹配，没有前缀匹配时按编辑距离模糊匹配
+    suggestions = [item['name'] for item in manager.suggester().suggest('服务2')]
+    print(f"   名称联想'服务2': {suggestions}")
+    assert suggestions == ['服务2-更新']
+    assert [item['name'] for item in manager.suggester().suggest('服务2-更薪')] == ['服务2-更新']
+
+    # keyset 分页：游标之后的卡片与完整列表的对应部分一致
+    loaded = manager.load_cards()
+    page = manager.cards_after((loaded[1].order, loaded[1].id), 2)
+    print(f"   游标分页: {[card.name for card in page]}")
+    assert [card.id for card in page] == [card.id for card in loaded[2:4]]
+
+    # 卡片数量直接由后端计数，与完整列表一致
+    print(f"   卡片计数: {manager.count_cards()}")
+    assert manager.count_cards() == len(loaded)
+
+    result = [(card.name, card.order) for card in manager.load_cards()]
+    for name, order in result:
+        print(f"   {order}. {name}")
+    print(f"   统计: {manager.get_stats()}")
+    # JSON 后端异步备份，等待写完再删除临时目录
+    if isinstance(manager, DataManager):
+        assert manager.backup_engine.flush(10)
+    return result
+
+
+def test_storage_backends():
+    """JSON、SQLite 与内存后端行为应一致"""
+    print("=" * 60)
+    print("开始测试存储后端")
+    print("=" * 60)
+
+    with tempfile.TemporaryDirectory() as temp_dir:
+        cards = make_cards()
+        json_result = run_backend_flow(os.path.join(temp_dir, 'cards.json'), cards)
+        sqlite_result = run_backend_flow('sqlite:///' + os.path.join(temp_dir, 'cards.db'), cards)
+        memory_result = run_backend_flow(':memory:', cards)
+
+    print(f"\n结果一致: {json_result == sqlite_result == memory_result}")
+    assert json_result == sqlite_result == memory_result
+
+
+def test_transaction_rejects_invalid_cards():
+    """事务写入无效卡片时三个后端都抛出 ValueError，且不提交任何变更"""
+    print("=" * 60)
+    print("开始测试事务拒绝无效卡片")
+    print("=" * 60)
+
+    with tempfile.TemporaryDirectory() as temp_dir:
+        for data_path in (os.path.join(temp_dir, 'cards.json'),
+                          'sqlite:///' + os.path.join(temp_dir, 'cards.db'),
+                          ':memory:'):
+            manager = create_data_manager(data_path)
+            valid = Card.create(name="服务1", icon="bi-server", url="http://localhost:8001",
+                                description="", order=1)
+            invalid = Card.create(name="服务2", icon="bi-server", url="", description="", order=2)
+            generation = manager.generation()
+
+            try:
+                with manager.transaction() as tx:
+                    tx.put(valid)
+                    tx.put(invalid)
+            except ValueError as e:
+                print(f"   {data_path}: {e}")
+            else:
+                raise AssertionError(f"{data_path} 应拒绝无效卡片")
+
+            assert not tx.committed
+            assert manager.load_cards() == []
+            assert manager.generation() == generation
+
+
+if __name__ == "__main__":
+    test_storage_backends()
+    test_transaction_rejects_invalid_cards()
@@ -0,0 +1,68 @@
+"""
+名称联想接口测试脚本
+使用 Flask 测试客户端检查 /api/cards/suggest 的前缀匹配、大小写折叠、模糊匹配和中文联想
+"""
+
+import sys
+import os
+
+# 添加项目根目录到路径
+project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, project_root)
+
+from test_card_routes import create_test_app, login
+
+NAMES = ["Grafana", "Grafana Agent", "Prometheus", "GitLab", "监控面板", "监控告警", "日志平台"]
+
+
+def suggest(client, q, limit=None):
+    """请求名称联想，返回联想出的名称列表"""
+    params = {'q': q} if limit is None else {'q': q, 'limit': limit}
+    response = client.get('/api/cards/suggest', query_string=params)
+    assert response.status_code == 200, response.get_json()
+    data = response.get_json()['data']
+    assert all(set(item) == {'id', 'name'} for item in data['items'])
+    return [item['name'] for item in data['items']]
+
+
+def test_suggest_cards():
+    """前缀匹配按排序号排列；不区分大小写和全半角；拼错时模糊匹配；中文按前缀联想"""
+    print("=" * 60)
+    print("开始测试名称联想")
+    print("=" * 60)
+
+    app = create_test_app()
+    client = app.test_client()
+    login(app, client)
+    for i, name in enumerate(NAMES, 1):
+        response = client.post('/api/cards', json={'name': name, 'icon': 'bi-server',
+                                                   'url': f"http://localhost:{8000 + i}"})
+        assert response.status_code == 201
+    # 联想不需要登录
+    client.post('/api/logout')
+
+    print(f"   前缀 'gr': {suggest(client, 'gr')}")
+    assert suggest(client, 'gr') == ["Grafana", "Grafana Agent"]
+    assert suggest(client, 'g') == ["Grafana", "Grafana Agent", "GitLab"]
+    assert suggest(client, 'gr', limit=1) == ["Grafana"]
+
+    # 大小写、全角字符和首尾空白折叠后比较
+    assert suggest(client, 'GRAF') == ["Grafana", "Grafana Agent"]
+    assert suggest(client, ' ｐｒｏ ') == ["Prometheus"]
+
+    # 没有前缀匹配时按编辑距离模糊匹配
+    print(f"   模糊 'grafna': {suggest(client, 'grafna')}")
+    assert suggest(client, 'grafna')[0] == "Grafana"
+    assert suggest(client, 'promethues') == ["Prometheus"]
+    assert suggest(client, 'xyz') == []
+
+    print(f"   中文 '监控': {suggest(client, '监控')}")
+    assert suggest(client, '监控') == ["监控面板", "监控告警"]
+    assert suggest(client, '日') == ["日志平台"]
+    assert suggest(client, '') == []
+
+    assert client.get('/api/cards/suggest?q=gr&limit=0').status_code == 400
+
+
+if __name__ == "__main__":
+    test_suggest_cards()
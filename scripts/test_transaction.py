@@ -0,0 +1,163 @@
+"""
+卡片事务测试脚本
+检查事务只写入一次、异常时不留下任何变更，以及事务内的查询能看到尚未提交的修改
+"""
+
+import sys
+import os
+import tempfile
+
+# 添加项目根目录到路径
+project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, project_root)
+
+from app.models import DataManager
+from app.models.card import Card
+
+
+def make_cards(count):
+    """生成测试卡片"""
+    return [Card.create(name=f"服务{i}", icon="bi-server", url=f"http://localhost:{8000 + i}",
+                        description=f"测试服务{i}", order=i) for i in range(1, count + 1)]
+
+
+def read_file(path):
+    """读取数据文件的原始字节"""
+    with open(path, 'rb') as f:
+        return f.read()
+
+
+def test_single_write_per_transaction(monkeypatch):
+    """多张卡片的增删改在一个事务中只写一次文件"""
+    print("=" * 60)
+    print("开始测试事务写入次数")
+    print("=" * 60)
+
+    with tempfile.TemporaryDirectory() as temp_dir:
+        path = os.path.join(temp_dir, 'cards.json')
+        manager = DataManager(path)
+        cards = make_cards(5)
+        assert manager.save_cards(cards)
+
+        writes = []
+        write_json = manager._write_json
+
+        def counting_write(data):
+            writes.append(len(data['cards']))
+            return write_json(data)
+
+        monkeypatch.setattr(manager, '_write_json', counting_write)
+
+        with manager.transaction() as tx:
+            tx.put(cards[0].update(name="服务1-更新"))
+            tx.delete(cards[1].id)
+            tx.delete(cards[2].id)
+            for i in range(6, 9):
+                tx.put(Card.create(name=f"服务{i}", icon="bi-server", url=f"http://localhost:{8000 + i}",
+                                   description="", order=tx.next_order()))
+            tx.renumber()
+        print(f"   写入次数: {len(writes)}，卡片数: {writes}")
+        assert tx.committed
+        assert writes == [6]
+        assert [card.order for card in manager.load_cards()] == list(range(1, 7))
+
+        # 没有变更的事务不写入
+        with manager.transaction() as tx:
+            tx.get(cards[0].id)
+        assert tx.committed and len(writes) == 1
+        assert manager.backup_engine.flush(10)
+
+
+def test_exception_leaves_no_changes():
+    """事务块内抛出异常时，文件和内存索引都保持原样"""
+    print("=" * 60)
+    print("开始测试事务回滚")
+    print("=" * 60)
+
+    with tempfile.TemporaryDirectory() as temp_dir:
+        path = os.path.join(temp_dir, 'cards.json')
+        manager = DataManager(path)
+        cards = make_cards(3)
+        assert manager.save_cards(cards)
+
+        raw = read_file(path)
+        loaded = manager.load_cards()
+        generation = manager.generation()
+
+        try:
+            with manager.transaction() as tx:
+                tx.put(cards[0].update(name="不应保存"))
+                tx.delete(cards[1].id)
+                tx.put(Card.create(name="新服务", icon="bi-server", url="http://localhost:9000",
+                                   description="", order=tx.next_order()))
+                raise RuntimeError("事务中途失败")
+        except RuntimeError as e:
+            print(f"   捕获异常: {e}")
+        else:
+            raise AssertionError("异常应传出事务块")
+
+        assert not tx.committed
+        assert read_file(path) == raw
+        assert manager.generation() == generation
+        assert manager.load_cards() == loaded
+        assert manager.get_card_by_id(cards[0].id).name == "服务1"
+        assert manager.card_name_exists("服务2") and not manager.card_name_exists("新服务")
+        assert manager.get_next_order() == 4
+        # 之后的事务基于未被污染的索引
+        with manager.transaction() as tx:
+            assert tx.get(cards[1].id) == cards[1]
+            assert tx.next_order() == 4
+        assert manager.backup_engine.flush(10)
+
+
+def test_queries_see_staged_changes():
+    """事务内的 next_order 和 name_exists 以工作集中的最新状态为准"""
+    print("=" * 60)
+    print("开始测试事务内查询")
+    print("=" * 60)
+
+    with tempfile.TemporaryDirectory() as temp_dir:
+        path = os.path.join(temp_dir, 'cards.json')
+        manager = DataManager(path)
+        cards = make_cards(3)
+        assert manager.save_cards(cards)
+
+        with manager.transaction() as tx:
+            assert tx.next_order() == 4
+            tx.put(Card.create(name="新服务", icon="bi-server", url="http://localhost:9000",
+                               description="", order=tx.next_order()))
+            assert tx.next_order() == 5
+            # 名称按规范化后比较
+            assert tx.name_exists(" 新服务 ")
+
+            # 删除排序号最大的卡片后，下一个排序号随之回退
+            new_card = tx.cards()[-1]
+            tx.delete(new_card.id)
+            assert tx.next_order() == 4
+            assert not tx.name_exists("新服务")
+
+            tx.put(cards[2].update(name="服务3-更新"))
+            assert not tx.name_exists("服务3")
+            assert tx.name_exists("服务3-更新")
+            assert not tx.name_exists("服务3-更新", exclude_id=cards[2].id)
+
+            tx.delete(cards[2].id)
+            print(f"   删除最后一张后下一个排序号: {tx.next_order()}")
+            assert tx.next_order() == 3
+            assert not tx.name_exists("服务3-更新")
+
+            # 提交前事务外看不到修改
+            assert manager.card_name_exists("服务3")
+        assert tx.committed
+        assert not manager.card_name_exists("服务3")
+        assert manager.get_next_order() == 3
+        assert manager.backup_engine.flush(10)
+
+
+if __name__ == "__main__":
+    import pytest
+
+    with pytest.MonkeyPatch.context() as mp:
+        test_single_write_per_transaction(mp)
+    test_exception_leaves_no_changes()
+    test_queries_see_staged_changes()
@@ -0,0 +1,66 @@
+"""
+访问统计测试脚本
+检查多个进程（各自的 UsageCounter）共享同一个统计文件时计数不丢失、排序一致
+"""
+
+import sys
+import os
+import json
+import tempfile
+
+# 添加项目根目录到路径
+project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, project_root)
+
+from app.models.usage import UsageCounter
+
+
+def test_counters_share_file():
+    """两个计数器写同一个统计文件：写入合并增量，读取时看到对方已写入的计数"""
+    print("=" * 60)
+    print("开始测试共享访问统计")
+    print("=" * 60)
+
+    with tempfile.TemporaryDirectory() as temp_dir:
+        path = os.path.join(temp_dir, 'usage.json')
+        # 节流间隔足够长，只有显式 flush 时写入
+        first = UsageCounter(path, flush_interval=3600)
+        second = UsageCounter(path, flush_interval=3600)
+
+        for _ in range(3):
+            first.hit('a')
+        first.hit('b')
+        for _ in range(2):
+            second.hit('b')
+        second.hit('c')
+
+        assert first.flush() and second.flush()
+        with open(path, 'r', encoding='utf-8') as f:
+            stored = json.load(f)
+        print(f"   统计文件: {stored}")
+        assert stored == {'a': 3, 'b': 3, 'c': 1}
+
+        # 先写入的一方读取时重新加载，两边看到相同的计数
+        generation = first.generation
+        assert first.counts() == second.counts() == stored
+        assert first.count('c') == 1
+
+        second.hit('a')
+        assert second.flush()
+        assert first.generation != generation
+        assert first.counts()['a'] == 4
+
+        # 删除的卡片在写入时从统计文件中去掉，未写入的增量继续累加
+        first.forget('b')
+        second.hit('c')
+        assert first.flush() and second.flush()
+        with open(path, 'r', encoding='utf-8') as f:
+            stored = json.load(f)
+        print(f"   删除后: {stored}")
+        assert stored == {'a': 4, 'c': 2}
+        assert first.counts() == second.counts() == stored
+        assert not [name for name in os.listdir(temp_dir) if name.startswith('.usage-')]
+
+
+if __name__ == "__main__":
+    test_counters_share_file()
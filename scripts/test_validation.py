@@ -0,0 +1,155 @@
+"""
+加载校验测试脚本
+检查内容摘要（本程序写入的文件免逐卡校验），以及严格校验模式下数据文件包含无效卡片时拒绝加载，
+接口返回 500 而不是空的面板
+"""
+
+import sys
+import os
+import json
+import tempfile
+import importlib.util
+
+# 添加项目根目录到路径
+project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, project_root)
+
+from app.models import DataManager
+from app.models.card import Card
+from app.models.storage import DataValidationError
+from app.models.checksum import CONTENT_HASH_KEY, seal_document, verify_document
+
+
+def make_cards(count):
+    """生成测试卡片"""
+    return [Card.create(name=f"服务{i}", icon="bi-server", url=f"http://localhost:{8000 + i}",
+                        description=f"测试服务{i}", order=i) for i in range(1, count + 1)]
+
+
+def edit_externally(path, edit, replace=True):
+    """
+    模拟外部编辑数据文件
+
+    Args:
+        path: 数据文件路径
+        edit: 修改文档的函数
+        replace: True 时写临时文件再重命名（编辑器的保存方式），否则原地重写
+    """
+    with open(path, 'r', encoding='utf-8') as f:
+        data = json.load(f)
+    edit(data)
+    target = path + '.edit' if replace else path
+    with open(target, 'w', encoding='utf-8') as f:
+        json.dump(data, f, ensure_ascii=False, indent=4)
+    if replace:
+        os.replace(target, path)
+
+
+def test_content_hash_seal():
+    """写入的文件带内容摘要，免逐卡校验；任何字节被修改后摘要不一致，逐卡校验"""
+    print("=" * 60)
+    print("开始测试内容摘要")
+    print("=" * 60)
+
+    for pretty in (False, True):
+        data = {'cards': [card.to_dict() for card in make_cards(2)], 'config': {'version': '1.0'}}
+        raw = seal_document(data, pretty=pretty)
+        digest, trusted = verify_document(raw)
+        print(f"   pretty={pretty}: {digest} {trusted}")
+        assert trusted
+        assert data['config'][CONTENT_HASH_KEY] == digest
+        assert json.loads(raw)['config'][CONTENT_HASH_KEY] == digest
+
+        tampered = raw.replace('服务1'.encode('utf-8'), '服务9'.encode('utf-8'), 1)
+        assert verify_document(tampered)[1] is False
+        assert verify_document(raw.replace(digest.encode('ascii'), b'0' * len(digest)))[1] is False
+    # 没有摘要的旧文件
+    assert verify_document(b'{"cards": [], "config": {}}')[1] is False
+
+    with tempfile.TemporaryDirectory() as temp_dir:
+        path = os.path.join(temp_dir, 'cards.json')
+        writer = DataManager(path)
+        assert writer.save_cards(make_cards(2))
+        # 等待异步备份写完再删除临时目录
+        assert writer.backup_engine.flush(10)
+
+        manager = DataManager(path, index_sidecar=False)
+        manager.load_cards()
+        assert manager.get_validation_stats()['trusted_loads'] == 1
+
+        def rename_first(data):
+            data['cards'][0]['name'] = "外部修改"
+
+        edit_externally(path, rename_first)
+        manager.load_cards()
+        stats = manager.get_validation_stats()
+        print(f"   外部修改后: {stats}")
+        assert stats['validated_loads'] == 1
+
+
+def write_corrupted_file(path):
+    """写入一个包含一张有效卡片和一张缺少 url 的无效卡片的数据文件（没有内容摘要，逐卡校验）"""
+    valid = Card.create(name="服务1", icon="bi-server", url="http://localhost:8001",
+                        description="", order=1).to_dict()
+    invalid = {'id': 'broken', 'name': "服务2", 'icon': 'bi-server', 'order': 2}
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump({'cards': [valid, invalid], 'config': {'version': '1.0'}}, f, ensure_ascii=False)
+
+
+def test_strict_load_fails():
+    """严格模式下读取接口抛出 DataValidationError，宽松模式跳过无效卡片"""
+    print("=" * 60)
+    print("开始测试严格校验加载")
+    print("=" * 60)
+
+    with tempfile.TemporaryDirectory() as temp_dir:
+        path = os.path.join(temp_dir, 'cards.json')
+        write_corrupted_file(path)
+
+        lenient = DataManager(path, index_sidecar=False)
+        print(f"   宽松模式加载: {len(lenient.load_cards())} 张，{lenient.get_validation_stats()}")
+        assert len(lenient.load_cards()) == 1
+        # 跳过的数量记入统计
+        assert lenient.get_validation_stats()['invalid_cards'] == 1
+
+        strict = DataManager(path, index_sidecar=False, validation='strict')
+        for accessor in (strict.load_cards, strict.count_cards, strict.get_stats):
+            try:
+                accessor()
+            except DataValidationError as e:
+                print(f"   {accessor.__name__}: {e}")
+            else:
+                raise AssertionError(f"{accessor.__name__} 应抛出 DataValidationError")
+
+
+def test_strict_api_returns_service_error():
+    """严格模式下接口返回 500 service_error"""
+    print("=" * 60)
+    print("开始测试严格校验接口响应")
+    print("=" * 60)
+
+    spec = importlib.util.spec_from_file_location('peler_main', os.path.join(project_root, 'app.py'))
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    app = module.create_app('testing')
+
+    with tempfile.TemporaryDirectory() as temp_dir:
+        path = os.path.join(temp_dir, 'cards.json')
+        write_corrupted_file(path)
+        app.config['DATA_PATH'] = path
+        app.config['DATA_VALIDATION'] = 'strict'
+        module.init_services(app)
+
+        client = app.test_client()
+        for url in ('/api/cards', '/api/cards/suggest?q=服务', '/api/stats'):
+            response = client.get(url)
+            data = response.get_json()
+            print(f"   {url}: {response.status_code} {data.get('error')}")
+            assert response.status_code == 500
+            assert data['error'] == 'service_error'
+
+
+if __name__ == "__main__":
+    test_content_hash_seal()
+    test_strict_load_fails()
+    test_strict_api_returns_service_error()
@@ -159,12 +159,12 @@ function renderListView(cards, searchQuery) {
  * 创建卡片HTML
  */
 function createCardHtml(card, searchQuery = '') {
-    const highlightedName = highlightSearchTerm(card.name, searchQuery);
-    const highlightedDesc = highlightSearchTerm(card.description, searchQuery);
+    const highlightedName = highlightSearchTerm(card.name, searchQuery, card.matches && card.matches.name);
+    const highlightedDesc = highlightSearchTerm(card.description, searchQuery, card.matches && card.matches.description);
 
     return `
         <div class="col-xl-3 col-lg-4 col-md-6 col-sm-12" data-card-id="${card.id}">
-            <div class="card service-card shadow-sm h-100" onclick="openService('${card.url}')">
+            <div class="card service-card shadow-sm h-100" onclick="openService('${card.url}', '${card.id}')">
                 <div class="card-body d-flex flex-column">
                     ${window.PelerPanel.isAuthenticated ? `
                     <div class="admin-controls">
@@ -204,8 +204,8 @@ function createCardHtml(card, searchQuery = '') {
  * 创建表格行HTML
  */
 function createTableRowHtml(card, searchQuery = '') {
-    const highlightedName = highlightSearchTerm(card.name, searchQuery);
-    const highlightedDesc = highlightSearchTerm(card.description, searchQuery);
+    const highlightedName = highlightSearchTerm(card.name, searchQuery, card.matches && card.matches.name);
+    const highlightedDesc = highlightSearchTerm(card.description, searchQuery, card.matches && card.matches.description);
 
     return `
         <tr data-card-id="${card.id}">
@@ -225,7 +225,7 @@ function createTableRowHtml(card, searchQuery = '') {
             </td>
             <td>
                 <div class="btn-group btn-group-sm">
-                    <button class="btn btn-outline-primary" onclick="openService('${card.url}')" title="访问">
+                    <button class="btn btn-outline-primary" onclick="openService('${card.url}', '${card.id}')" title="访问">
                         <i class="bi bi-box-arrow-up-right"></i>
                     </button>
                     ${window.PelerPanel.isAuthenticated ? `
@@ -241,10 +241,22 @@ function createTableRowHtml(card, searchQuery = '') {
 
 /**
  * 高亮搜索词
+ * 服务端返回了匹配位置 ranges（[[起始, 结束), ...]）时按位置高亮，否则按正则匹配
  */
-function highlightSearchTerm(text, searchQuery) {
+function highlightSearchTerm(text, searchQuery, ranges) {
     if (!searchQuery || !text) return text;
 
+    if (Array.isArray(ranges)) {
+        let result = '';
+        let last = 0;
+        ranges.forEach(function(range) {
+            result += text.slice(last, range[0]) +
+                `<span class="search-highlight">${text.slice(range[0], range[1])}</span>`;
+            last = range[1];
+        });
+        return result + text.slice(last);
+    }
+
     const regex = new RegExp(`(${escapeRegExp(searchQuery)})`, 'gi');
     return text.replace(regex, '<span class="search-highlight">$1</span>');
 }
@@ -483,10 +495,14 @@ function initializeComponents() {
 }
 
 /**
- * 打开服务链接
+ * 打开服务链接，并记录一次访问（用于按使用频率排序）
+ * 访问记录接口需要管理员认证，未登录时不发送
  */
-function openService(url) {
+function openService(url, cardId) {
     window.open(url, '_blank', 'noopener,noreferrer');
+    if (cardId && window.PelerPanel.isAuthenticated && navigator.sendBeacon) {
+        navigator.sendBeacon(`/api/cards/${encodeURIComponent(cardId)}/visit`);
+    }
 }
 
 /**